@@ -3,8 +3,19 @@ import json
 import uuid
 import random
 from typing import List, Dict, Any
-from pyairtable import Api
-from datetime import datetime, timedelta
+from components.export_panel import render_export_panel
+from components.feature_matrix import render_feature_matrix
+from components.metrics_panel import render_metrics_panel
+from services.airtable import get_airtable_table
+from services.cache import get_cache, invalidate_host_events
+from services.cloning import clone_event
+from services.events import Event, EventTimeIndex
+from services.loader import start_rerun
+from services.metrics import set_page
+from services.mirror import mirror_records, mirror_version
+from services.pagination import RecordPager, chunked
+from services.profiler import profiled_page, span
+from datetime import datetime, timedelta, timezone
 import urllib.parse
 
 # Page configuration
@@ -18,103 +29,85 @@ st.set_page_config(
 if 'event_data' not in st.session_state:
     st.session_state.event_data = {}
 
-# Airtable configuration
-AIRTABLE_CONFIG = {
-    "base_id": "applJyRTlJLvUEDJs",
-    "api_key": "patJHZQyID8nmSaxh.1bcf08f100bd723fd85d67eff8534a19f951b75883d0e0ae4cc49743a9fb3131"
+# Fields rendered by render_event_card; the long description is never shown on the dashboard
+DASHBOARD_FIELDS = [
+    'name', 'type', 'host_id', 'location_name', 'detailed_address',
+    'start_date', 'end_date', 'capacity', 'is_visible', 'id'
+]
+
+# Server-side time windows matching categorize_events' current / upcoming / past split
+EVENT_WINDOW_FORMULAS = {
+    'current': "AND(NOT(IS_AFTER({start_date}, NOW())), NOT(IS_BEFORE({end_date}, NOW())))",
+    'upcoming': "IS_AFTER({start_date}, NOW())",
+    'past': "IS_BEFORE({end_date}, NOW())"
 }
 
-def get_airtable_api():
-    """Get Airtable API instance"""
-    return Api(AIRTABLE_CONFIG["api_key"])
+# Number of event cards rendered per section before "load more"
+EVENT_PAGE_SIZE = 10
+
+def get_event_index(host_id):
+    """
+    Time index over all of a host's mirrored events, rebuilt only when the mirror changes.
+    Returns None when the mirror is disabled or not yet populated.
+    """
+    version = mirror_version()
+    if version is None:
+        return None
+    
+    def build():
+        records = mirror_records("events", host_id)
+        return None if records is None else EventTimeIndex([Event.from_record(r) for r in records])
+    
+    return get_cache("event_index").get_or_load((str(host_id), version), build)
+
+def create_event_pager(host_id, window):
+    """
+    Pager over a host's events in a time window ('current', 'upcoming' or 'past'), newest end_date first.
+    Served from the local mirror when enabled, otherwise Airtable filters, projects and pages server-side.
+    """
+    index = get_event_index(host_id)
+    if index is not None:
+        current_events, upcoming_events, past_events = categorize_events(index)
+        events = {'current': current_events, 'upcoming': upcoming_events, 'past': past_events}[window]
+        return RecordPager(chunked(events, EVENT_PAGE_SIZE))
+    
+    table = get_airtable_table("events")
+    pages = table.iterate(
+        formula=f"AND({{host_id}} = {host_id}, {EVENT_WINDOW_FORMULAS[window]})",
+        fields=DASHBOARD_FIELDS,
+        sort=['-end_date'],
+        page_size=EVENT_PAGE_SIZE
+    )
+    return RecordPager(pages, transform=Event.from_record)
 
-def get_airtable_table(table_name):
-    """Get Airtable table instance"""
-    api = get_airtable_api()
-    return api.table(AIRTABLE_CONFIG["base_id"], table_name)
+def get_event_pager(host_id, window):
+    """Shared pager for a host's time window (cached across sessions, see services/cache.py)"""
+    # The mirror version is part of the key so background syncs are picked up without waiting for the TTL
+    return get_cache("events").get_or_load(
+        (str(host_id), window, mirror_version()),
+        lambda: create_event_pager(host_id, window)
+    )
 
-def get_host_events(host_id):
-    """Get all events for a specific host"""
+def get_host_events(host_id, window, count):
+    """Get the first `count` events of a host's time window and whether more exist"""
     try:
-        table = get_airtable_table("events")
-        records = table.all(formula=f"{{host_id}} = {host_id}")
-        
-        events = []
-        for record in records:
-            fields = record.get('fields', {})
-            events.append({
-                'id': record['id'],
-                'name': fields.get('name', ''),
-                'description': fields.get('description', ''),
-                'type': fields.get('type', ''),
-                'host_id': fields.get('host_id', ''),
-                'location_name': fields.get('location_name', ''),
-                'detailed_address': fields.get('detailed_address', ''),
-                'start_date': fields.get('start_date', ''),
-                'end_date': fields.get('end_date', ''),
-                'capacity': fields.get('capacity', 0),
-                'is_visible': fields.get('is_visible', False),
-                'ID': fields.get('id', '')
-            })
-        
-        return events
+        return get_event_pager(host_id, window).page(count)
     except Exception as e:
         st.error(f"Etkinlikler yüklenirken hata oluştu: {e}")
-        return []
+        return [], False
 
 def categorize_events(events):
-    """Categorize events into current, upcoming, and past"""
-    current_timestamp = datetime.now()
-    
-    current_events = []
-    upcoming_events = []
-    past_events = []
+    """Categorize events (a list or a prebuilt EventTimeIndex) into current, upcoming, and past"""
+    current_timestamp = datetime.now(timezone.utc)
+    index = events if isinstance(events, EventTimeIndex) else EventTimeIndex(events)
     
-    for event in events:
-        try:
-            # Parse start_date and end_date
-            start_date_str = event['start_date']
-            end_date_str = event['end_date']
-            
-            # Handle different date formats and timezone issues
-            if isinstance(start_date_str, str):
-                # Remove timezone info if present and parse
-                start_date_str_clean = start_date_str.replace('Z', '').replace('+00:00', '')
-                end_date_str_clean = end_date_str.replace('Z', '').replace('+00:00', '')
-                
-                # Parse dates without timezone info
-                start_date = datetime.fromisoformat(start_date_str_clean)
-                end_date = datetime.fromisoformat(end_date_str_clean)
-            else:
-                # If already datetime objects, use them directly
-                start_date = start_date_str
-                end_date = end_date_str
-            
-            # Ensure all dates are timezone-naive for comparison
-            if start_date.tzinfo is not None:
-                start_date = start_date.replace(tzinfo=None)
-            if end_date.tzinfo is not None:
-                end_date = end_date.replace(tzinfo=None)
-            if current_timestamp.tzinfo is not None:
-                current_timestamp = current_timestamp.replace(tzinfo=None)
-            
-            # Categorize events
-            if start_date <= current_timestamp <= end_date:
-                current_events.append(event)
-            elif start_date > current_timestamp:
-                upcoming_events.append(event)
-            elif end_date < current_timestamp:
-                past_events.append(event)
-                
-        except Exception as e:
-            st.warning(f"Tarih ayrıştırma hatası: {e}")
-            # Add to upcoming events as fallback
-            upcoming_events.append(event)
+    for event in index.undated:
+        st.warning(f"Tarih ayrıştırma hatası: {event.name} ({event.start_date} - {event.end_date})")
     
-    # Sort by end_date descending
-    current_events.sort(key=lambda x: x['end_date'], reverse=True)
-    upcoming_events.sort(key=lambda x: x['end_date'], reverse=True)
-    past_events.sort(key=lambda x: x['end_date'], reverse=True)
+    current_events = index.current(current_timestamp)
+    # Events with unparseable dates are shown as upcoming, as before
+    upcoming_events = index.upcoming(current_timestamp) + index.undated
+    past_events = index.past(current_timestamp)
     
     return current_events, upcoming_events, past_events
 
@@ -126,58 +119,139 @@ def render_event_card(event, event_type):
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            st.markdown(f"### {event['name']}")
-            st.markdown(f"**Tür:** {event['type']}")
-            st.markdown(f"**Mekan:** {event['location_name']}")
-            st.markdown(f"**Kapasite:** {event['capacity']} kişi")
-            
-            try:
-                # Handle date display with proper timezone handling
-                start_date_str = event['start_date']
-                end_date_str = event['end_date']
-                
-                if isinstance(start_date_str, str):
-                    start_date_str_clean = start_date_str.replace('Z', '').replace('+00:00', '')
-                    end_date_str_clean = end_date_str.replace('Z', '').replace('+00:00', '')
-                    
-                    start_date = datetime.fromisoformat(start_date_str_clean)
-                    end_date = datetime.fromisoformat(end_date_str_clean)
-                else:
-                    start_date = start_date_str
-                    end_date = end_date_str
-                
-                st.markdown(f"**Başlangıç:** {start_date.strftime('%d/%m/%Y %H:%M')}")
-                st.markdown(f"**Bitiş:** {end_date.strftime('%d/%m/%Y %H:%M')}")
-            except Exception as e:
-                st.markdown(f"**Başlangıç:** {event['start_date']}")
-                st.markdown(f"**Bitiş:** {event['end_date']}")
+            st.markdown(f"### {event.name}")
+            st.markdown(f"**Tür:** {event.type}")
+            st.markdown(f"**Mekan:** {event.location_name}")
+            st.markdown(f"**Kapasite:** {event.capacity} kişi")
+            st.markdown(f"**Başlangıç:** {event.format_start()}")
+            st.markdown(f"**Bitiş:** {event.format_end()}")
+            st.markdown(f"**Adres:** {event.detailed_address}")
             
-            st.markdown(f"**Adres:** {event['detailed_address']}")
-            
-            if event['is_visible']:
+            if event.is_visible:
                 st.success("✅ Uygulamada görünür")
             else:
                 st.warning("⚠️ Uygulamada gizli")
         
         with col2:
-            st.markdown(f"**Event ID:** {event['ID']}")
-            st.markdown(f"**Host ID:** {event['host_id']}")
+            st.markdown(f"**Event ID:** {event.ID}")
+            st.markdown(f"**Host ID:** {event.host_id}")
             
             # Action buttons
-            if st.button("⚙️ Özellikler", key=f"features_{event['id']}"):
+            if st.button("⚙️ Özellikler", key=f"features_{event.id}"):
                 # Store event_id in session state and navigate to feature management
-                st.session_state.event_id = event['ID']
+                st.session_state.event_id = event.ID
                 st.switch_page("pages/feature_management.py")
+            
+            clone_key = f"clone_open_{event.id}"
+            if st.button("📄 Kopyala", key=f"clone_{event.id}"):
+                st.session_state[clone_key] = not st.session_state.get(clone_key, False)
+        
+        if st.session_state.get(clone_key, False):
+            render_clone_form(event)
+
+def render_clone_form(event):
+    """Name and start of the copy; features and registration form are copied as they are"""
+    with st.form(key=f"clone_form_{event.id}"):
+        st.markdown(f"**📄 {event.name} etkinliğini kopyala**")
+        name = st.text_input("Yeni etkinlik adı", value=f"{event.name} (Kopya)")
+        col1, col2 = st.columns(2)
+        default_start = event.start or datetime.now(timezone.utc)
+        with col1:
+            start_date = st.date_input("Başlangıç tarihi", value=default_start.date())
+        with col2:
+            start_time = st.time_input("Başlangıç saati", value=default_start.time().replace(tzinfo=None))
+        submitted = st.form_submit_button("📄 Kopyayı Oluştur", type="primary")
+    
+    if submitted:
+        try:
+            with st.spinner("Etkinlik, özellikler ve kayıt formu kopyalanıyor..."):
+                created, features, questions = clone_event(
+                    event.id,
+                    name=name,
+                    start=datetime.combine(start_date, start_time)
+                )
+        except Exception as e:
+            st.error(f"Etkinlik kopyalanırken hata oluştu: {str(e)}")
+            return
+        st.session_state[f"clone_open_{event.id}"] = False
+        st.session_state.clone_message = (
+            f"✅ \"{name}\" oluşturuldu: {features} özellik ve {questions} form sorusu kopyalandı."
+        )
+        st.rerun()
+
+def render_event_table(events, event_type):
+    """Render events as one compact table instead of a card per event"""
+    st.dataframe(
+        [
+            {
+                'Event ID': event.ID,
+                'Ad': event.name,
+                'Tür': event.type,
+                'Mekan': event.location_name,
+                'Başlangıç': event.format_start(),
+                'Bitiş': event.format_end(),
+                'Kapasite': event.capacity,
+                'Görünür': event.is_visible
+            }
+            for event in events
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        selected = st.selectbox(
+            "Etkinlik",
+            options=range(len(events)),
+            format_func=lambda i: f"{events[i].ID} - {events[i].name}",
+            key=f"compact_select_{event_type}",
+            label_visibility="collapsed"
+        )
+    
+    with col2:
+        if st.button("⚙️ Özellikler", key=f"compact_features_{event_type}", use_container_width=True):
+            st.session_state.event_id = events[selected].ID
+            st.switch_page("pages/feature_management.py")
+
+def get_visible_count(host_id, window):
+    """Number of events currently shown in a section (grows by EVENT_PAGE_SIZE on "load more")"""
+    return st.session_state.get(f"visible_events_{window}_{host_id}", EVENT_PAGE_SIZE)
+
+def render_event_list(events, has_more, host_id, window, empty_message, compact):
+    """Render one dashboard section page by page"""
+    if not events:
+        st.info(empty_message)
+        return
+    
+    if compact:
+        render_event_table(events, window)
+    else:
+        for event in events:
+            render_event_card(event, window)
+    
+    if has_more and st.button("⬇️ Daha Fazla Yükle", key=f"load_more_{window}"):
+        st.session_state[f"visible_events_{window}_{host_id}"] = get_visible_count(host_id, window) + EVENT_PAGE_SIZE
+        st.rerun()
+
+def format_event_count(events, has_more):
+    """Metric value for a section that may not be fully loaded"""
+    return f"{len(events)}+" if has_more else len(events)
 
 def clear_session_state():
     """Clear session state when returning to main page"""
-    keys_to_clear = ['event_id', 'feature_key', 'questions', 'question_counter', 'show_preview', 'selected_features', 'event_created', 'redirect_to_form']
+    keys_to_clear = ['event_id', 'feature_key', 'questions', 'question_counter', 'show_preview', 'selected_features', 'event_created', 'redirect_to_form', 'has_loaded_form', 'restored_draft', 'draft_baseline', 'series_created']
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
     # Note: We don't clear 'host_id' as it should persist from the main page
 
+@profiled_page("dashboard")
 def main():
+    start_rerun()
+    set_page("dashboard")
+    render_metrics_panel()
     st.title("🎉 Event Management Dashboard")
     st.markdown("Etkinliklerinizi yönetin ve yeni etkinlikler oluşturun.")
     
@@ -200,6 +274,11 @@ def main():
     
     # Update session state with current host_id
     st.session_state.current_host_id = host_id
+    render_export_panel(host_id)
+    
+    clone_message = st.session_state.pop('clone_message', None)
+    if clone_message:
+        st.success(clone_message)
     
     # Create Event Section
     st.header("🚀 Yeni Etkinlik Oluştur")
@@ -212,39 +291,47 @@ def main():
     
     st.markdown("---")
     
-    # Load events for the host
-    events = get_host_events(host_id)
+    # Card or compact table layout
+    compact = st.sidebar.toggle(
+        "📋 Kompakt görünüm",
+        key="compact_event_view",
+        help="Etkinlikleri kartlar yerine tek bir tabloda gösterin"
+    )
     
-    if not events:
+    # Load the visible page of each section; past events are loaded only on demand
+    show_past_key = f"show_past_events_{host_id}"
+    show_past = st.session_state.get(show_past_key, False)
+    
+    with span("load events"):
+        current_events, has_more_current = get_host_events(host_id, 'current', get_visible_count(host_id, 'current'))
+        upcoming_events, has_more_upcoming = get_host_events(host_id, 'upcoming', get_visible_count(host_id, 'upcoming'))
+        if show_past:
+            past_events, has_more_past = get_host_events(host_id, 'past', get_visible_count(host_id, 'past'))
+        else:
+            past_events, has_more_past = [], False
+    
+    if not current_events and not upcoming_events and not show_past and not get_host_events(host_id, 'past', 1)[0]:
         st.info("Bu Host ID için henüz etkinlik bulunmuyor. Yeni bir etkinlik oluşturun!")
         return
     
-    # Categorize events
-    current_events, upcoming_events, past_events = categorize_events(events)
-    
     # Current Events Section
-    st.header("🎯 Güncel Etkinlikler")
-    if current_events:
-        for event in current_events:
-            render_event_card(event, "current")
-    else:
-        st.info("Şu anda aktif etkinlik bulunmuyor.")
+    with span("current events"):
+        st.header("🎯 Güncel Etkinlikler")
+        render_event_list(current_events, has_more_current, host_id, 'current', "Şu anda aktif etkinlik bulunmuyor.", compact)
     
     # Upcoming Events Section
-    st.header("📅 Yaklaşan Etkinlikler")
-    if upcoming_events:
-        for event in upcoming_events:
-            render_event_card(event, "upcoming")
-    else:
-        st.info("Yaklaşan etkinlik bulunmuyor.")
+    with span("upcoming events"):
+        st.header("📅 Yaklaşan Etkinlikler")
+        render_event_list(upcoming_events, has_more_upcoming, host_id, 'upcoming', "Yaklaşan etkinlik bulunmuyor.", compact)
     
     # Past Events Section
-    st.header("📚 Geçmiş Etkinlikler")
-    if past_events:
-        for event in past_events:
-            render_event_card(event, "past")
-    else:
-        st.info("Geçmiş etkinlik bulunmuyor.")
+    with span("past events"):
+        st.header("📚 Geçmiş Etkinlikler")
+        if show_past:
+            render_event_list(past_events, has_more_past, host_id, 'past', "Geçmiş etkinlik bulunmuyor.", compact)
+        elif st.button("📂 Geçmiş Etkinlikleri Göster", key="show_past_events"):
+            st.session_state[show_past_key] = True
+            st.rerun()
     
     # Summary
     st.markdown("---")
@@ -253,19 +340,36 @@ def main():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Güncel Etkinlikler", len(current_events))
+        st.metric("Güncel Etkinlikler", format_event_count(current_events, has_more_current))
     
     with col2:
-        st.metric("Yaklaşan Etkinlikler", len(upcoming_events))
+        st.metric("Yaklaşan Etkinlikler", format_event_count(upcoming_events, has_more_upcoming))
     
     with col3:
-        st.metric("Geçmiş Etkinlikler", len(past_events))
+        st.metric("Geçmiş Etkinlikler", format_event_count(past_events, has_more_past) if show_past else "—")
+    
+    # Feature status of every event of the host
+    st.markdown("---")
+    with span("feature matrix"):
+        st.header("🧩 Özellik Durumları")
+        render_feature_matrix(host_id, "home")
     
     # Refresh button
     st.markdown("---")
     
     if st.button("🔄 Sayfayı Yenile", type="secondary", use_container_width=True):
+        invalidate_host_events(host_id)
         st.rerun()
+    
+    # Everything above is already on screen; pull the next page of each
+    # section now so "load more" is answered from memory
+    with span("prefetch"):
+        for window, has_more in (('current', has_more_current), ('upcoming', has_more_upcoming), ('past', has_more_past)):
+            if has_more:
+                try:
+                    get_event_pager(host_id, window).prefetch(get_visible_count(host_id, window) + EVENT_PAGE_SIZE)
+                except Exception:
+                    pass
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1 @@
+"""Local Airtable stand-in and request-count benchmarks for the app's page flows."""
@@ -0,0 +1,355 @@
+"""
+In-memory stand-in for the Airtable REST API.
+
+Implements the subset of https://api.airtable.com/v0 the app uses: list
+(GET with query params and POST .../listRecords) with filterByFormula,
+sort, fields, pageSize/maxRecords and offset pagination; get; single and
+batch create/update; single and batch delete. It can enforce Airtable's
+per-base rate limit (429 RATE_LIMIT_REACHED) and inject failures.
+
+Use FakeAirtable.handle() in-process, or FakeAirtableServer to serve it
+over HTTP and point the app at it with AIRTABLE_ENDPOINT_URL:
+
+    python -m benchmarks.fake_airtable --port 8787 --seed
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from benchmarks.formula import FormulaError, matches
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 10
+# Airtable allows 5 requests per second per base
+AIRTABLE_RATE_LIMIT = 5
+# Autonumber fields filled in on create, per table
+DEFAULT_AUTONUMBER = {"events": "id"}
+
+Response = Tuple[int, Dict[str, Any]]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _error(status: int, error_type: str, message: str) -> Response:
+    return status, {"error": {"type": error_type, "message": message}}
+
+
+def _sort_key(value: Any):
+    # None sorts first; mixed types fall back to string comparison
+    if value is None:
+        return (0, "")
+    if isinstance(value, bool):
+        return (1, int(value))
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+class FakeAirtable:
+    """Thread-safe in-memory bases with a request log."""
+
+    def __init__(self, rate_limit: Optional[float] = None, autonumber: Optional[Dict[str, str]] = None):
+        self.rate_limit = rate_limit
+        self.autonumber = DEFAULT_AUTONUMBER if autonumber is None else autonumber
+        self.requests: List[Dict[str, Any]] = []
+        self._tables: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._ids = itertools.count(1)
+        self._numbers: Dict[Tuple[str, str], int] = {}
+        self._recent: Dict[str, deque] = {}
+        self._failures: deque = deque()
+        self._lock = threading.RLock()
+
+    # ---- data access for seeding and assertions ----
+    def _table(self, base_id: str, table: str) -> Dict[str, Dict[str, Any]]:
+        return self._tables.setdefault((base_id, table), {})
+
+    def insert(self, base_id: str, table: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a record directly, without logging a request."""
+        with self._lock:
+            record_id = f"rec{next(self._ids):014d}"
+            fields = dict(fields)
+            number_field = self.autonumber.get(table)
+            if number_field and number_field not in fields:
+                key = (base_id, table)
+                self._numbers[key] = self._numbers.get(key, 0) + 1
+                fields[number_field] = self._numbers[key]
+            now = _now_iso()
+            record = {"id": record_id, "createdTime": now, "fields": fields, "modified_time": now}
+            self._table(base_id, table)[record_id] = record
+            return self._public(record)
+
+    def records(self, base_id: str, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._public(r) for r in self._table(base_id, table).values()]
+
+    def reset_log(self) -> None:
+        with self._lock:
+            self.requests.clear()
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """Answer the next `count` requests with `status` (e.g. 429 or 503) instead of handling them."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    @staticmethod
+    def _public(record: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        values = record["fields"]
+        if fields:
+            values = {k: v for k, v in values.items() if k in fields}
+        return {"id": record["id"], "createdTime": record["createdTime"], "fields": dict(values)}
+
+    # ---- request entry point ----
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: Optional[Dict[str, Any]]) -> Response:
+        """Route one API call. `path` is the URL path, `query` a parse_qs() dict."""
+        started = time.perf_counter()
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if len(parts) < 3 or parts[0] != "v0":
+            status, payload = _error(404, "NOT_FOUND", f"Unknown path {path}")
+            self._log(method, None, "unknown", status, started, 0)
+            return status, payload
+
+        base_id, table, rest = parts[1], parts[2], parts[3:]
+        op, count = self._operation(method, rest, query, body)
+        status, payload = self._check_limits(base_id)
+        if status is None:
+            try:
+                with self._lock:
+                    status, payload = self._dispatch(method, base_id, table, rest, query, body or {})
+            except FormulaError as e:
+                status, payload = _error(422, "INVALID_FILTER_BY_FORMULA", str(e))
+            except (KeyError, TypeError, ValueError) as e:
+                status, payload = _error(422, "INVALID_REQUEST_UNKNOWN", str(e))
+        self._log(method, table, op, status, started, count)
+        return status, payload
+
+    @staticmethod
+    def _operation(method: str, rest: List[str], query: Dict[str, List[str]], body: Optional[Dict[str, Any]]):
+        method = method.upper()
+        if (method == "GET" and not rest) or rest == ["listRecords"]:
+            return "list", 0
+        if method == "GET":
+            return "get", 1
+        records = (body or {}).get("records")
+        if method == "POST":
+            return ("batch_create", len(records)) if records is not None else ("create", 1)
+        if method in ("PATCH", "PUT"):
+            return ("batch_update", len(records or [])) if not rest else ("update", 1)
+        if method == "DELETE":
+            return ("batch_delete", len(query.get("records[]", []))) if not rest else ("delete", 1)
+        return method.lower(), 0
+
+    def _check_limits(self, base_id: str):
+        with self._lock:
+            if self._failures:
+                status = self._failures.popleft()
+                if status == 429:
+                    return 429, {"errors": [{"error": "RATE_LIMIT_REACHED", "message": "Rate limit exceeded."}]}
+                return _error(status, "SERVER_ERROR", "Injected failure")
+            if self.rate_limit:
+                window = self._recent.setdefault(base_id, deque())
+                now = time.monotonic()
+                while window and now - window[0] >= 1.0:
+                    window.popleft()
+                if len(window) >= self.rate_limit:
+                    return 429, {"errors": [{"error": "RATE_LIMIT_REACHED", "message": "Rate limit exceeded."}]}
+                window.append(now)
+        return None, None
+
+    def _log(self, method: str, table: Optional[str], op: str, status: int, started: float, count: int) -> None:
+        with self._lock:
+            self.requests.append({
+                "method": method.upper(),
+                "table": table,
+                "op": op,
+                "records": count,
+                "status": status,
+                "seconds": time.perf_counter() - started,
+            })
+
+    def _dispatch(self, method, base_id, table, rest, query, body) -> Response:
+        method = method.upper()
+        records = self._table(base_id, table)
+        if method == "GET" and not rest:
+            return self._list(records, self._query_options(query))
+        if method == "POST" and rest == ["listRecords"]:
+            return self._list(records, self._body_options(body))
+        if method == "GET" and len(rest) == 1:
+            if rest[0] not in records:
+                return _error(404, "MODEL_ID_NOT_FOUND", f"Record {rest[0]} not found")
+            return 200, self._public(records[rest[0]])
+        if method == "POST" and not rest:
+            if "records" in body:
+                if len(body["records"]) > MAX_BATCH_SIZE:
+                    return _error(422, "INVALID_RECORDS", f"At most {MAX_BATCH_SIZE} records per request")
+                return 200, {"records": [self.insert(base_id, table, r.get("fields", {})) for r in body["records"]]}
+            return 200, self.insert(base_id, table, body.get("fields", {}))
+        if method in ("PATCH", "PUT"):
+            replace = method == "PUT"
+            if rest:
+                return self._update(records, [{"id": rest[0], "fields": body.get("fields", {})}], replace, single=True)
+            if body.get("performUpsert"):
+                return _error(422, "INVALID_REQUEST_UNKNOWN", "performUpsert is not supported by the fake")
+            if len(body.get("records", [])) > MAX_BATCH_SIZE:
+                return _error(422, "INVALID_RECORDS", f"At most {MAX_BATCH_SIZE} records per request")
+            return self._update(records, body.get("records", []), replace, single=False)
+        if method == "DELETE":
+            ids = rest[:1] if rest else query.get("records[]", [])
+            if len(ids) > MAX_BATCH_SIZE:
+                return _error(422, "INVALID_RECORDS", f"At most {MAX_BATCH_SIZE} records per request")
+            missing = [i for i in ids if i not in records]
+            if missing:
+                return _error(404, "MODEL_ID_NOT_FOUND", f"Record {missing[0]} not found")
+            for record_id in ids:
+                del records[record_id]
+            deleted = [{"id": i, "deleted": True} for i in ids]
+            return 200, deleted[0] if rest else {"records": deleted}
+        return _error(404, "NOT_FOUND", f"Unsupported {method} {'/'.join(rest)}")
+
+    # ---- list ----
+    @staticmethod
+    def _query_options(query: Dict[str, List[str]]) -> Dict[str, Any]:
+        first = lambda key: query[key][0] if key in query else None
+        sort = []
+        for index in itertools.count():
+            field = first(f"sort[{index}][field]")
+            if field is None:
+                break
+            sort.append({"field": field, "direction": first(f"sort[{index}][direction]") or "asc"})
+        return {
+            "filterByFormula": first("filterByFormula"),
+            "fields": query.get("fields[]"),
+            "sort": sort,
+            "pageSize": first("pageSize"),
+            "maxRecords": first("maxRecords"),
+            "offset": first("offset"),
+        }
+
+    @staticmethod
+    def _body_options(body: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: body.get(key) for key in ("filterByFormula", "fields", "sort", "pageSize", "maxRecords", "offset")}
+
+    def _list(self, records: Dict[str, Dict[str, Any]], options: Dict[str, Any]) -> Response:
+        now = datetime.now(timezone.utc)
+        rows = [r for r in records.values() if matches(options["filterByFormula"], r, now)]
+        # Stable sorts applied last-key-first give multi-key ordering
+        for spec in reversed(options["sort"] or []):
+            rows.sort(key=lambda r: _sort_key(r["fields"].get(spec["field"])), reverse=spec.get("direction") == "desc")
+        if options["maxRecords"]:
+            rows = rows[:int(options["maxRecords"])]
+
+        page_size = min(int(options["pageSize"] or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        start = int(options["offset"] or 0)
+        page = rows[start:start + page_size]
+        payload = {"records": [self._public(r, options["fields"]) for r in page]}
+        if start + page_size < len(rows):
+            # Airtable offsets are opaque strings; the position is enough here
+            payload["offset"] = str(start + page_size)
+        return 200, payload
+
+    def _update(self, records, updates: List[Dict[str, Any]], replace: bool, single: bool) -> Response:
+        missing = [u["id"] for u in updates if u["id"] not in records]
+        if missing:
+            return _error(404, "MODEL_ID_NOT_FOUND", f"Record {missing[0]} not found")
+        updated = []
+        for u in updates:
+            record = records[u["id"]]
+            if replace:
+                record["fields"] = dict(u.get("fields", {}))
+            else:
+                record["fields"].update(u.get("fields", {}))
+            record["modified_time"] = _now_iso()
+            updated.append(self._public(record))
+        return 200, updated[0] if single else {"records": updated}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeAirtable
+
+    def _respond(self):
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            status, payload = _error(401, "AUTHENTICATION_REQUIRED", "Authentication required")
+        else:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            status, payload = self.fake.handle(self.command, url.path, parse_qs(url.query), body)
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAirtableServer:
+    """Serve a FakeAirtable over HTTP on 127.0.0.1 (port 0 picks a free port)."""
+
+    def __init__(self, fake: Optional[FakeAirtable] = None, port: int = 0):
+        self.fake = fake or FakeAirtable()
+        handler = type("Handler", (_Handler,), {"fake": self.fake})
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> "FakeAirtableServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-airtable", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    from benchmarks.seed import FAKE_BASE_ID, seed_host
+
+    parser = argparse.ArgumentParser(description="Run a local Airtable stand-in.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--seed", action="store_true", help="Load demo events for host 1000")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help=f"Requests per second per base before answering 429 (Airtable: {AIRTABLE_RATE_LIMIT})")
+    args = parser.parse_args()
+
+    fake = FakeAirtable(rate_limit=args.rate_limit)
+    if args.seed:
+        seed_host(fake, 1000)
+    server = FakeAirtableServer(fake, port=args.port)
+    print(f"Fake Airtable listening on {server.url}")
+    print(f"  AIRTABLE_ENDPOINT_URL={server.url} AIRTABLE_BASE_ID={FAKE_BASE_ID} AIRTABLE_API_KEY=fake streamlit run app.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
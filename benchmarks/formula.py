@@ -0,0 +1,195 @@
+"""
+Evaluator for the subset of Airtable formulas the app sends.
+
+Supports field references, string/number literals, comparisons, `&`,
+AND/OR/NOT, NOW(), RECORD_ID(), LAST_MODIFIED_TIME(), IS_AFTER/IS_BEFORE
+and TRUE()/FALSE(). Anything else raises FormulaError, which the fake
+server reports the way Airtable does (422 INVALID_FILTER_BY_FORMULA).
+"""
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+TOKEN = re.compile(
+    r"\s*(?:(\{[^}]*\})"                            # {field}
+    r"|('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"    # 'string' / "string"
+    r"|(\d+(?:\.\d+)?)"                             # number
+    r"|(<=|>=|!=|[=<>(),&])"                        # operator / punctuation
+    r"|([A-Za-z_][A-Za-z_0-9]*))"                   # function name
+)
+
+COMPARISONS = ("=", "!=", "<", ">", "<=", ">=")
+
+
+class FormulaError(ValueError):
+    """The formula uses syntax or a function the evaluator does not support."""
+
+
+def tokenize(source: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    source = source.strip()
+    pos = 0
+    while pos < len(source):
+        match = TOKEN.match(source, pos)
+        if not match or match.end() == pos:
+            raise FormulaError(f"Unexpected input at {source[pos:]!r}")
+        pos = match.end()
+        field, string, number, op, name = match.groups()
+        if field is not None:
+            tokens.append(("field", field[1:-1]))
+        elif string is not None:
+            tokens.append(("str", string[1:-1]))
+        elif number is not None:
+            tokens.append(("num", float(number) if "." in number else int(number)))
+        elif op is not None:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("name", name))
+    return tokens
+
+
+@lru_cache(maxsize=512)
+def compile_formula(source: str) -> tuple:
+    """Parse a formula into a nested tuple tree (cached; the app repeats the same formulas)."""
+    tokens = tokenize(source)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take():
+        nonlocal pos
+        if pos >= len(tokens):
+            raise FormulaError("Unexpected end of formula")
+        pos += 1
+        return tokens[pos - 1]
+
+    def expect(value):
+        if take() != ("op", value):
+            raise FormulaError(f"Expected {value!r}")
+
+    def expression():
+        left = concat()
+        while peek()[0] == "op" and peek()[1] in COMPARISONS:
+            op = take()[1]
+            left = ("cmp", op, left, concat())
+        return left
+
+    def concat():
+        left = atom()
+        while peek() == ("op", "&"):
+            take()
+            left = ("cat", left, atom())
+        return left
+
+    def atom():
+        kind, value = take()
+        if kind in ("str", "num"):
+            return ("lit", value)
+        if kind == "field":
+            return ("field", value)
+        if (kind, value) == ("op", "("):
+            inner = expression()
+            expect(")")
+            return inner
+        if kind == "name" and peek() == ("op", "("):
+            take()
+            args = []
+            if peek() != ("op", ")"):
+                args.append(expression())
+                while peek() == ("op", ","):
+                    take()
+                    args.append(expression())
+            expect(")")
+            return ("call", value.upper(), tuple(args))
+        raise FormulaError(f"Unexpected token {value!r}")
+
+    tree = expression()
+    if pos != len(tokens):
+        raise FormulaError(f"Trailing input after position {pos}")
+    return tree
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _compare(op: str, a: Any, b: Any) -> bool:
+    if isinstance(a, (int, float)) or isinstance(b, (int, float)):
+        try:
+            a, b = float(a), float(b)
+        except (TypeError, ValueError):
+            a, b = str(a), str(b)
+    else:
+        a = "" if a is None else a
+        b = "" if b is None else b
+        if type(a) is not type(b):
+            a, b = str(a), str(b)
+    if op == "=":
+        return a == b
+    if op == "!=":
+        return a != b
+    if op == "<":
+        return a < b
+    if op == ">":
+        return a > b
+    if op == "<=":
+        return a <= b
+    return a >= b
+
+
+def evaluate(tree: tuple, record: Dict[str, Any], now: Optional[datetime] = None) -> Any:
+    """Evaluate a compiled formula against a stored record ({id, fields, modified_time})."""
+    now = now or datetime.now(timezone.utc)
+
+    def ev(node):
+        kind = node[0]
+        if kind == "lit":
+            return node[1]
+        if kind == "field":
+            return record["fields"].get(node[1])
+        if kind == "cat":
+            left, right = ev(node[1]), ev(node[2])
+            return f"{'' if left is None else left}{'' if right is None else right}"
+        if kind == "cmp":
+            return _compare(node[1], ev(node[2]), ev(node[3]))
+
+        name, args = node[1], node[2]
+        if name == "AND":
+            return all(ev(a) for a in args)
+        if name == "OR":
+            return any(ev(a) for a in args)
+        if name == "NOT":
+            return not ev(args[0])
+        if name in ("TRUE", "FALSE"):
+            return name == "TRUE"
+        if name == "NOW":
+            return now
+        if name == "RECORD_ID":
+            return record["id"]
+        if name == "LAST_MODIFIED_TIME":
+            return record.get("modified_time")
+        if name in ("IS_AFTER", "IS_BEFORE"):
+            a, b = parse_datetime(ev(args[0])), parse_datetime(ev(args[1]))
+            if a is None or b is None:
+                return False
+            return a > b if name == "IS_AFTER" else a < b
+        raise FormulaError(f"Unsupported function {name}()")
+
+    return ev(tree)
+
+
+def matches(formula: Optional[str], record: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """True when the record passes filterByFormula (an empty formula matches everything)."""
+    if not formula:
+        return True
+    return bool(evaluate(compile_formula(formula), record, now))
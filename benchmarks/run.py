@@ -0,0 +1,325 @@
+"""
+Airtable request counts and wall time for each page flow.
+
+Every flow runs in a fresh Python process against its own FakeAirtableServer
+(so st.cache_resource, the TTL caches and the outbox start cold), drives the
+page with Streamlit's AppTest and records, per step, how many API calls
+the step caused (including write-behind calls drained from the outbox).
+Counts are compared with benchmarks/budgets.json; any step that needs more
+requests than its budget fails the run.
+
+    python -m benchmarks.run                    # all flows, check budgets
+    python -m benchmarks.run --flow dashboard   # one flow
+    python -m benchmarks.run --update-budgets   # accept the current counts
+    python -m benchmarks.run --json results.json
+
+Run from the repository root.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_PATH = Path(__file__).resolve().parent / "budgets.json"
+HOST_ID = 1000
+# The first seeded event (autonumber id 1) has the registration form feature
+EVENT_ID = 1
+STEP_TIMEOUT = 30
+READ_OPS = ("list", "get")
+
+
+# ---- flows: each step is (name, action(ctx)); ctx["at"] holds the AppTest ----
+def _app(path: str, **session) -> Callable[[Dict[str, Any]], None]:
+    def open_page(ctx):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(str(ROOT / path), default_timeout=STEP_TIMEOUT)
+        for key, value in session.items():
+            at.session_state[key] = value
+        ctx["at"] = at.run()
+    return open_page
+
+
+def _rerun(ctx):
+    ctx["at"].run()
+
+
+def _click(label: str = None, key: str = None) -> Callable[[Dict[str, Any]], None]:
+    def click(ctx):
+        at = ctx["at"]
+        if key is not None:
+            at.button(key=key).click().run()
+        else:
+            [b for b in at.button if b.label == label][0].click().run()
+    return click
+
+
+def _toggle_registration_form(ctx):
+    at = ctx["at"]
+    at.checkbox(key="registration_form_active_checkbox").set_value(False)
+    [b for b in at.button if b.label == "Uygula"][0].click().run()
+
+
+def _fill_event_form(ctx):
+    at = ctx["at"]
+    inputs = {t.label: t for t in at.text_input}
+    inputs["Etkinlik Adı *"].input("Benchmark Etkinliği")
+    inputs["Mekan Adı *"].input("İstanbul Kongre Merkezi")
+    inputs["Detaylı Adres *"].input("Harbiye Mah. Darülbedai Cad. No:3 Şişli/İstanbul")
+    at.text_area[0].input("Benchmark açıklaması")
+    at.selectbox[0].select("Konferans, Zirve & Seminer")
+    _click("🚀 Etkinliği Kaydet")(ctx)
+
+
+def _fill_weekly_series(ctx):
+    at = ctx["at"]
+    at.checkbox(key="is_recurring").check().run()
+    at.number_input(key="recurrence_count").set_value(20)
+    _fill_event_form(ctx)
+
+
+def _edit_series(ctx):
+    at = ctx["at"]
+    [t for t in at.text_input if t.label == "Mekan Adı"][0].input("Yeni Mekan")
+    [b for b in at.button if b.label.startswith("💾")][0].click().run()
+
+
+def _click_first(prefix: str) -> Callable[[Dict[str, Any]], None]:
+    def click(ctx):
+        [b for b in ctx["at"].button if b.label.startswith(prefix)][0].click().run()
+    return click
+
+
+def _open_clone_form(ctx):
+    """Open the clone form on EVENT_ID's card, the seeded event with feature and form rows to copy"""
+    from benchmarks.seed import FAKE_BASE_ID
+
+    record = next(r for r in ctx["fake"].records(FAKE_BASE_ID, "events") if r["fields"].get("id") == EVENT_ID)
+    _click(key=f"clone_{record['id']}")(ctx)
+
+
+def _save_template(ctx):
+    at = ctx["at"]
+    [t for t in at.text_input if t.label == "Şablon adı"][0].input("Benchmark Şablonu")
+    _click_first("💾 Mevcut Formu")(ctx)
+
+
+def _apply_template_to_all(ctx):
+    at = ctx["at"]
+    targets = [m for m in at.multiselect if m.label == "Etkinlikler"][0]
+    for option in targets.options:
+        targets.select(option)
+    _click_first("🚀 Seçili Etkinliklere")(ctx)
+
+
+FLOWS: Dict[str, List[Tuple[str, Callable[[Dict[str, Any]], None]]]] = {
+    "dashboard": [
+        ("first load", _app("app.py")),
+        ("rerun", _rerun),
+        ("show past events", _click(key="show_past_events")),
+        ("load more past", _click(key="load_more_past")),
+        ("compact view", lambda ctx: ctx["at"].toggle(key="compact_event_view").set_value(True).run()),
+        ("feature matrix", _click(key="home_feature_matrix_button")),
+        ("refresh", _click("🔄 Sayfayı Yenile")),
+    ],
+    "feature_management": [
+        ("first load", _app("pages/feature_management.py", event_id=EVENT_ID, current_host_id=HOST_ID)),
+        ("rerun", _rerun),
+        ("apply toggle", _toggle_registration_form),
+        ("rerun after toggle", _rerun),
+    ],
+    "form_builder": [
+        ("load existing form", _app("pages/form_builder.py", event_id=EVENT_ID, current_host_id=HOST_ID)),
+        ("rerun", _rerun),
+        ("add question", _click("➕ Yeni Soru Ekle")),
+        ("apply form", _click("✅ Formu Uygula")),
+        ("apply unchanged form", _click("✅ Formu Uygula")),
+    ],
+    "form_templates": [
+        ("load existing form", _app("pages/form_builder.py", event_id=EVENT_ID, current_host_id=HOST_ID)),
+        ("open templates", lambda ctx: ctx["at"].toggle(key="show_templates").set_value(True).run()),
+        ("save template", _save_template),
+        ("apply to every event", _apply_template_to_all),
+        ("rerun", _rerun),
+    ],
+    "event_creation": [
+        ("open", _app("pages/event_creation.py", host_id=HOST_ID)),
+        ("save event", _fill_event_form),
+    ],
+    "event_clone": [
+        ("first load", _app("app.py")),
+        ("open clone form", _open_clone_form),
+        ("clone event", _click_first("📄 Kopyayı Oluştur")),
+    ],
+    "event_series": [
+        ("open", _app("pages/event_creation.py", host_id=HOST_ID)),
+        ("save 20 weekly events", _fill_weekly_series),
+        ("series manager", _app("pages/event_creation.py", host_id=HOST_ID, event_creation_mode="Tekrarlayan seriler")),
+        ("load series", _click(key="load_series")),
+        ("edit whole series", _edit_series),
+    ],
+}
+
+
+# ---- child process: one flow against a fresh fake ----
+def _configure_environment(endpoint_url: str, workdir: str) -> None:
+    from benchmarks.seed import FAKE_BASE_ID
+
+    os.environ.update({
+        "AIRTABLE_ENDPOINT_URL": endpoint_url,
+        "AIRTABLE_BASE_ID": FAKE_BASE_ID,
+        "AIRTABLE_API_KEY": "fake",
+        # Count requests, don't wait on the token bucket
+        "AIRTABLE_RATE_LIMIT": "1000",
+        "AIRTABLE_RATE_BURST": "1000",
+        "AIRTABLE_OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite3"),
+        "HOST_APP_DRAFTS_PATH": os.path.join(workdir, "drafts.sqlite3"),
+    })
+    os.environ.pop("AIRTABLE_MIRROR_PATH", None)
+
+
+def _drain_outbox(timeout: float = STEP_TIMEOUT) -> None:
+    """Send everything the step queued so its write-behind calls count towards it."""
+    from services.outbox import STATUS_IN_PROGRESS, STATUS_PENDING, get_outbox
+
+    outbox = get_outbox()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        counts = outbox.counts()
+        if not counts.get(STATUS_PENDING) and not counts.get(STATUS_IN_PROGRESS):
+            return
+        outbox.flush()
+        time.sleep(0.05)
+    raise TimeoutError("Outbox did not drain")
+
+
+def run_flow(name: str) -> List[Dict[str, Any]]:
+    from benchmarks.fake_airtable import FakeAirtableServer
+    from benchmarks.seed import seed_host
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, FakeAirtableServer() as server:
+        _configure_environment(server.url, workdir)
+        seed_host(server.fake, HOST_ID)
+        sys.path.insert(0, str(ROOT))
+        ctx: Dict[str, Any] = {"fake": server.fake}
+        for step, action in FLOWS[name]:
+            server.fake.reset_log()
+            started = time.perf_counter()
+            error = None
+            try:
+                action(ctx)
+                if ctx["at"].exception:
+                    error = ctx["at"].exception[0].message
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            seconds = time.perf_counter() - started
+            _drain_outbox()
+            calls = list(server.fake.requests)
+            results.append({
+                "flow": name,
+                "step": step,
+                "requests": len(calls),
+                "reads": sum(1 for c in calls if c["op"] in READ_OPS),
+                "writes": sum(1 for c in calls if c["op"] not in READ_OPS),
+                "calls": dict(Counter(f"{c['table']}.{c['op']}" for c in calls)),
+                "seconds": round(seconds, 4),
+                "error": error,
+            })
+            if error:
+                break
+    return results
+
+
+def _run_in_subprocess(name: str) -> List[Dict[str, Any]]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as output:
+        path = output.name
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--child", name, "--child-output", path],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            raise RuntimeError(f"Benchmark flow {name!r} crashed")
+        with open(path) as f:
+            return json.load(f)
+    finally:
+        os.unlink(path)
+
+
+# ---- parent: collect, report, compare ----
+def load_budgets() -> Dict[str, Dict[str, int]]:
+    if BUDGETS_PATH.exists():
+        return json.loads(BUDGETS_PATH.read_text())
+    return {}
+
+
+def check(results: List[Dict[str, Any]], budgets: Dict[str, Dict[str, int]]) -> List[str]:
+    problems = []
+    for r in results:
+        if r["error"]:
+            problems.append(f"{r['flow']} / {r['step']}: {r['error']}")
+            continue
+        budget = budgets.get(r["flow"], {}).get(r["step"])
+        if budget is not None and r["requests"] > budget:
+            problems.append(f"{r['flow']} / {r['step']}: {r['requests']} requests (budget {budget}) {r['calls']}")
+    return problems
+
+
+def report(results: List[Dict[str, Any]], budgets: Dict[str, Dict[str, int]]) -> None:
+    print(f"{'flow':<20} {'step':<22} {'req':>4} {'budget':>6} {'read':>5} {'write':>5} {'ms':>8}")
+    for r in results:
+        budget = budgets.get(r["flow"], {}).get(r["step"], "-")
+        print(f"{r['flow']:<20} {r['step']:<22} {r['requests']:>4} {budget:>6} "
+              f"{r['reads']:>5} {r['writes']:>5} {r['seconds'] * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Airtable request-count benchmarks for the app's page flows.")
+    parser.add_argument("--flow", choices=sorted(FLOWS), action="append", help="Run only these flows")
+    parser.add_argument("--json", help="Also write the raw results to this file")
+    parser.add_argument("--update-budgets", action="store_true", help="Store the measured counts as the new budgets")
+    parser.add_argument("--child", choices=sorted(FLOWS), help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        with open(args.child_output, "w") as f:
+            json.dump(run_flow(args.child), f)
+        return
+
+    results = []
+    for name in args.flow or FLOWS:
+        results.extend(_run_in_subprocess(name))
+
+    budgets = load_budgets()
+    report(results, budgets)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    if args.update_budgets:
+        for r in results:
+            if not r["error"]:
+                budgets.setdefault(r["flow"], {})[r["step"]] = r["requests"]
+        BUDGETS_PATH.write_text(json.dumps(budgets, indent=2, ensure_ascii=False) + "\n")
+        print(f"Budgets written to {BUDGETS_PATH}")
+        return
+
+    problems = check(results, budgets)
+    if problems:
+        print("\nRequest budget exceeded:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
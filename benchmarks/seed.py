@@ -0,0 +1,50 @@
+"""Deterministic demo data for the fake Airtable base."""
+import json
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_airtable import FakeAirtable
+
+FAKE_BASE_ID = "appFAKEBASE000000"
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def seed_host(fake: FakeAirtable, host_id: int, current: int = 2, upcoming: int = 12, past: int = 25,
+              base_id: str = FAKE_BASE_ID) -> None:
+    """
+    Give `host_id` current, upcoming and past events. The first event gets
+    an active registration form feature with three questions so the
+    feature and form pages have something to load.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    windows = (
+        [(now - timedelta(hours=2 + i), now + timedelta(hours=2 + i)) for i in range(current)]
+        + [(now + timedelta(days=1 + i), now + timedelta(days=1 + i, hours=3)) for i in range(upcoming)]
+        + [(now - timedelta(days=10 + i), now - timedelta(days=10 + i) + timedelta(hours=3)) for i in range(past)]
+    )
+    events = []
+    for number, (start, end) in enumerate(windows, start=1):
+        events.append(fake.insert(base_id, "events", {
+            "name": f"Demo Etkinlik {number}",
+            "description": "Benchmark verisi",
+            "type": "Konferans, Zirve & Seminer",
+            "host_id": host_id,
+            "location_name": "İstanbul Kongre Merkezi",
+            "detailed_address": "Harbiye Mah. Darülbedai Cad. No:3 Şişli/İstanbul",
+            "start_date": _iso(start),
+            "end_date": _iso(end),
+            "capacity": 50,
+            "is_visible": True,
+        }))
+
+    first_id = events[0]["fields"]["id"]
+    fake.insert(base_id, "event_features", {"event_id": first_id, "feature_id": 1, "is_active": True})
+    questions = [
+        {"name": "Adınız", "type": "text", "is_required": True},
+        {"name": "Katılım türü", "type": "single_choice", "possible_answers": json.dumps(["Yüz yüze", "Online"])},
+        {"name": "İlgi alanları", "type": "multiple_choice", "possible_answers": json.dumps(["AI", "Web", "Mobil"])},
+    ]
+    for rank, question in enumerate(questions):
+        fake.insert(base_id, "registration_form", {"event_id": first_id, "rank": rank, **question})
@@ -0,0 +1 @@
+"""Streamlit UI pieces shared by more than one page."""
@@ -0,0 +1,81 @@
+import streamlit as st
+
+from services.imports import (
+    IMPORT_COLUMNS, IMPORT_WORKERS, ImportCheckpoint, parse_import_file, prepare_import, run_import
+)
+
+
+def render_event_import(host_id):
+    """Upload a CSV/JSON file of events, review per-row errors, then create the valid rows in batches"""
+    st.header("📥 Toplu Etkinlik İçe Aktarma")
+    st.markdown(
+        "CSV veya JSON dosyasındaki her satır bir etkinliktir. Sütunlar: "
+        + ", ".join(f"`{c}`" for c in IMPORT_COLUMNS)
+        + ". Tarihler `2025-05-01 10:00` veya `01/05/2025 10:00` biçiminde olabilir; "
+        "`is_visible` boş bırakılırsa etkinlik görünür olur."
+    )
+
+    uploaded = st.file_uploader("CSV veya JSON dosyası", type=["csv", "json"], key="event_import_file")
+    if uploaded is None:
+        return
+
+    data = uploaded.getvalue()
+    try:
+        rows = parse_import_file(uploaded.name, data)
+    except ValueError as e:
+        st.error(f"Dosya okunamadı: {str(e)}")
+        return
+
+    plan = prepare_import(rows, host_id)
+    checkpoint = ImportCheckpoint.for_file(host_id, data)
+    remaining = checkpoint.remaining(plan.valid)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Satır", plan.total)
+    with col2:
+        st.metric("Geçerli", len(plan.valid))
+    with col3:
+        st.metric("Hatalı", len(plan.errors))
+
+    if plan.errors:
+        st.error(f"{len(plan.errors)} satır hatalı ve aktarılmayacak:")
+        st.dataframe(
+            [{'Satır': number, 'Hata': "; ".join(errors)} for number, errors in plan.errors.items()],
+            use_container_width=True,
+            hide_index=True
+        )
+
+    if len(remaining) < len(plan.valid):
+        st.info(
+            f"Bu dosyadan daha önce {len(plan.valid) - len(remaining)} etkinlik aktarıldı; "
+            f"yalnızca kalan {len(remaining)} etkinlik gönderilecek."
+        )
+
+    if not remaining:
+        if plan.valid:
+            st.success("✅ Bu dosyadaki tüm geçerli etkinlikler aktarıldı.")
+        return
+
+    if st.button(f"🚀 {len(remaining)} Etkinliği İçe Aktar", type="primary", use_container_width=True, key="run_event_import"):
+        progress = st.progress(0.0, text="Etkinlikler gönderiliyor...")
+        try:
+            result = run_import(
+                plan.valid,
+                host_id,
+                checkpoint,
+                workers=IMPORT_WORKERS,
+                progress=lambda done, total: progress.progress(done / total, text=f"{done} / {total} etkinlik gönderildi")
+            )
+        except Exception as e:
+            st.error(f"❌ İçe aktarım sırasında hata oluştu: {str(e)}. Aynı dosyayla tekrar deneyebilirsiniz; oluşturulanlar tekrar gönderilmez.")
+            return
+        if result.created:
+            st.success(f"✅ {len(result.created)} etkinlik oluşturuldu.")
+        if result.errors:
+            st.error(f"❌ {len(result.errors)} etkinlik oluşturulamadı. Aynı dosyayla tekrar deneyebilirsiniz; oluşturulanlar tekrar gönderilmez.")
+            st.dataframe(
+                [{'Satır': number, 'Hata': error} for number, error in sorted(result.errors.items())],
+                use_container_width=True,
+                hide_index=True
+            )
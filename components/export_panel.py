@@ -0,0 +1,42 @@
+import streamlit as st
+
+from services.export import SINKS, export_host_zip
+
+FORMAT_LABELS = {"csv": "CSV", "jsonl": "JSON Lines", "parquet": "Parquet"}
+
+
+def render_export_panel(host_id):
+    """Sidebar export of the host's events, features and forms as a zip (built only on request)"""
+    with st.sidebar.expander("📤 Dışa Aktar", expanded=False):
+        fmt = st.selectbox(
+            "Biçim",
+            options=list(SINKS),
+            format_func=lambda f: FORMAT_LABELS[f],
+            key="export_format"
+        )
+        ready_key = f"export_zip_{host_id}_{fmt}"
+
+        if st.button("📦 Dışa Aktarımı Hazırla", key="prepare_export", use_container_width=True):
+            st.session_state.pop(ready_key, None)
+            status = st.empty()
+            try:
+                with st.spinner("Kayıtlar Airtable'dan alınıyor..."):
+                    st.session_state[ready_key] = export_host_zip(
+                        host_id,
+                        fmt,
+                        progress=lambda table, rows: status.caption(f"{table}: {rows} kayıt")
+                    )
+                status.empty()
+            except Exception as e:
+                st.error(f"Dışa aktarım başarısız: {str(e)}")
+
+        data = st.session_state.get(ready_key)
+        if data:
+            st.download_button(
+                "⬇️ Zip Dosyasını İndir",
+                data=data,
+                file_name=f"host_{host_id}_{fmt}.zip",
+                mime="application/zip",
+                key="download_export",
+                use_container_width=True
+            )
@@ -0,0 +1,37 @@
+import streamlit as st
+
+from services.features import FEATURES, get_feature_matrix, get_host_event_names
+from services.mirror import normalize_key
+
+STATUS_LABELS = {True: "✅ Aktif", False: "⏹️ Pasif", None: "—"}
+
+
+def render_feature_matrix(host_id, key_prefix):
+    """Events × features status table for a host, loaded on demand"""
+    show_key = f"{key_prefix}_show_feature_matrix_{host_id}"
+    
+    if not st.session_state.get(show_key, False):
+        if st.button("🧩 Özellik Matrisini Göster", key=f"{key_prefix}_feature_matrix_button"):
+            st.session_state[show_key] = True
+            st.rerun()
+        return
+    
+    try:
+        events = get_host_event_names(host_id)
+        matrix = get_feature_matrix(host_id)
+    except Exception as e:
+        st.error(f"Özellik matrisi yüklenirken hata oluştu: {str(e)}")
+        return
+    
+    if not events:
+        st.info("Bu Host ID için henüz etkinlik bulunmuyor.")
+        return
+    
+    rows = []
+    for event_id, name in events:
+        row = {'Event ID': event_id, 'Etkinlik': name}
+        for feature_key, feature_info in FEATURES.items():
+            row[feature_info['name']] = STATUS_LABELS[matrix.get((normalize_key(event_id), feature_key))]
+        rows.append(row)
+    
+    st.dataframe(rows, use_container_width=True, hide_index=True)
@@ -0,0 +1,120 @@
+import streamlit as st
+
+from services.drafts import draft_key, get_draft_store
+from services.features import get_host_event_names
+from services.templates import apply_template, delete_template, get_templates, save_template
+
+
+def load_into_builder(template):
+    """Append the template's questions to the builder (saved with ✅ Formu Uygula, like any edit)"""
+    questions = st.session_state.questions
+    first_rank = int(max(q['rank'] for q in questions)) + 1 if questions else 0
+    new = template.builder_questions(st.session_state.question_counter, first_rank)
+    st.session_state.questions = questions + new
+    st.session_state.question_counter += len(new)
+
+
+def render_template_panel(host_id, event_id, save_unsaved_form):
+    """
+    Sidebar template library: save the current form, load a template, or apply
+    one to many events. save_unsaved_form(event_id) queues the builder's
+    unsaved edits, so applying to the open event does not lose them.
+    """
+    if not st.sidebar.toggle("📚 Form Şablonları", key="show_templates"):
+        return
+    if host_id is None:
+        st.sidebar.info("Şablonlar için ana sayfadan bir Host ID seçin.")
+        return
+
+    with st.sidebar:
+        message = st.session_state.pop("template_message", None)
+        if message:
+            st.success(message)
+
+        with st.form(key="save_template_form", clear_on_submit=True):
+            name = st.text_input("Şablon adı")
+            submitted = st.form_submit_button("💾 Mevcut Formu Şablon Olarak Kaydet", use_container_width=True)
+        if submitted:
+            questions = [q for q in st.session_state.questions if q['question'].strip()]
+            if not name.strip():
+                st.error("Lütfen şablon için bir ad girin!")
+            elif not questions:
+                st.error("Şablona kaydedilecek soru bulunamadı!")
+            else:
+                try:
+                    save_template(host_id, name.strip(), questions)
+                    st.session_state.template_message = f"✅ '{name.strip()}' şablonu kaydedildi."
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Şablon kaydedilirken hata oluştu: {str(e)}")
+
+        try:
+            templates = get_templates(host_id)
+        except Exception as e:
+            st.error(f"Şablonlar yüklenirken hata oluştu: {str(e)}")
+            return
+        if not templates:
+            st.info("Henüz kayıtlı şablon yok.")
+            return
+
+        by_id = {t.id: t for t in templates}
+        template = by_id[st.selectbox(
+            "Şablon",
+            options=list(by_id),
+            format_func=lambda tid: f"{by_id[tid].name} · {len(by_id[tid].questions)} soru",
+            key="template_select"
+        )]
+        for position, (question, type_label, is_required, _) in enumerate(template.questions, start=1):
+            st.caption(f"{position}. {question}{' *' if is_required else ''} ({type_label})")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📥 Forma Ekle", key="load_template", use_container_width=True):
+                load_into_builder(template)
+                st.rerun()
+        with col2:
+            if st.button("🗑️ Sil", key="delete_template", use_container_width=True):
+                try:
+                    delete_template(host_id, template.id)
+                    st.session_state.template_message = f"🗑️ '{template.name}' şablonu silindi."
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Şablon silinirken hata oluştu: {str(e)}")
+
+        st.markdown("---")
+        events = dict(get_host_event_names(host_id))
+        with st.form(key="apply_template_form"):
+            targets = st.multiselect(
+                "Etkinlikler",
+                options=list(events),
+                format_func=lambda eid: f"{events[eid]} (ID: {eid})",
+            )
+            replace = st.radio(
+                "Mevcut sorular",
+                options=[False, True],
+                format_func=lambda r: "Silinip şablonla değiştirilsin" if r else "Korunsun, şablon sona eklensin",
+                help="Açık formdaki kaydedilmemiş değişiklikler şablondan önce kaydedilir."
+            )
+            apply = st.form_submit_button("🚀 Seçili Etkinliklere Uygula", type="primary", use_container_width=True)
+        if apply:
+            if not targets:
+                st.error("Lütfen en az bir etkinlik seçin!")
+                return
+            current = str(event_id) in {str(t) for t in targets}
+            try:
+                # The open form's edits are saved first; apply_template sends them before its own writes
+                saved = current and save_unsaved_form(event_id)
+                with st.spinner("Sorular Airtable'a yazılıyor..."):
+                    result = apply_template(template, targets, replace=replace)
+            except Exception as e:
+                st.error(f"Şablon uygulanırken hata oluştu: {str(e)}")
+                return
+            if current:
+                # Show this event's new form on the next run instead of the old draft
+                get_draft_store().discard(draft_key(host_id, event_id))
+                st.session_state.has_loaded_form = False
+            st.session_state.template_message = (
+                f"✅ {result['events']} etkinliğe {result['created']} soru eklendi."
+                + (" Bu formdaki kaydedilmemiş değişiklikler önce kaydedildi." if saved else "")
+            )
+            st.rerun()
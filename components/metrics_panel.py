@@ -0,0 +1,50 @@
+import os
+
+import streamlit as st
+
+from services.metrics import REGISTRY
+from services.scheduler import scheduler_stats
+
+DEBUG_ENV = os.getenv("AIRTABLE_DEBUG") == "1"
+
+
+def debug_enabled():
+    """Hidden panels show with AIRTABLE_DEBUG=1 or ?debug=1 (remembered for the session)"""
+    try:
+        requested = st.query_params.get("debug") == "1"
+    except AttributeError:
+        # Streamlit < 1.30
+        requested = st.experimental_get_query_params().get("debug", [""])[0] == "1"
+    if requested:
+        st.session_state["_debug_panel"] = True
+    return DEBUG_ENV or st.session_state.get("_debug_panel", False)
+
+
+def render_metrics_panel():
+    """Sidebar table of Airtable calls per page/table/operation, plus the Prometheus export"""
+    if not debug_enabled():
+        return
+
+    with st.sidebar.expander("🛠️ Airtable Metrikleri", expanded=False):
+        rows = REGISTRY.summary()
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Henüz Airtable isteği yapılmadı.")
+
+        for base, stats in scheduler_stats().items():
+            st.caption(
+                f"{base}: {stats['requests']} istek, {stats['retries']} tekrar, "
+                f"{stats['rate_limited']} × 429, kuyruk {stats['queue_depth']} (en fazla {stats['max_queue_depth']})"
+            )
+
+        st.download_button(
+            "⬇️ Prometheus metriklerini indir",
+            data=REGISTRY.render_prometheus(),
+            file_name="airtable_metrics.prom",
+            mime="text/plain",
+            key="download_airtable_metrics"
+        )
+
+        if st.button("⏱️ Render Profili", key="open_render_profile"):
+            st.switch_page("pages/render_profile.py")
@@ -0,0 +1,25 @@
+import streamlit as st
+
+from services.outbox import STATUS_DONE, STATUS_FAILED, get_outbox
+
+
+def render_outbox_status(kind, key):
+    """Show where the latest queued write for (kind, key) stands, with a retry button on failure"""
+    op = get_outbox().latest(kind, key)
+    if op is None:
+        return
+    
+    if op['status'] == STATUS_DONE:
+        st.caption("✅ Tüm değişiklikler Airtable'a kaydedildi.")
+    elif op['status'] == STATUS_FAILED:
+        st.error(f"❌ Değişiklikler Airtable'a kaydedilemedi: {op['last_error']}")
+        if st.button("🔁 Tekrar Dene", key=f"outbox_retry_{kind}_{key}"):
+            get_outbox().retry(op['id'])
+            st.rerun()
+    else:
+        message = "⏳ Değişiklikler Airtable'a gönderiliyor..."
+        if op['attempts']:
+            message += f" ({op['attempts']}. deneme başarısız: {op['last_error']})"
+        st.info(message)
+        if st.button("🔄 Durumu Yenile", key=f"outbox_refresh_{kind}_{key}"):
+            st.rerun()
@@ -0,0 +1,186 @@
+from datetime import timedelta
+
+import streamlit as st
+
+from services.events import EVENT_TYPES, parse_event_datetime
+from services.series import (
+    FREQUENCIES, MAX_OCCURRENCES, SERIES_FIELDS, WEEKDAYS,
+    cancel_series, expand_occurrences, load_host_series, select_occurrences, shift_series, update_series
+)
+
+INTERVAL_LABELS = {"Günlük": "Kaç günde bir", "Haftalık": "Kaç haftada bir", "Aylık": "Kaç ayda bir"}
+
+
+def render_recurrence_options(start, end):
+    """Recurrence inputs for the creation form; returns the (start, end) of every occurrence"""
+    col1, col2 = st.columns(2)
+    with col1:
+        frequency = st.selectbox("Tekrar sıklığı", options=list(FREQUENCIES), index=1, key="recurrence_frequency")
+    with col2:
+        interval = st.number_input(
+            INTERVAL_LABELS[frequency],
+            min_value=1,
+            max_value=52,
+            value=1,
+            key="recurrence_interval"
+        )
+
+    weekdays = None
+    if frequency == "Haftalık":
+        days = st.multiselect(
+            "Günler",
+            options=WEEKDAYS,
+            default=[WEEKDAYS[start.weekday()]],
+            key="recurrence_weekdays"
+        )
+        weekdays = [WEEKDAYS.index(d) for d in days]
+
+    col3, col4 = st.columns(2)
+    with col3:
+        ends_by = st.radio("Bitiş", options=["Tekrar sayısı", "Tarih"], horizontal=True, key="recurrence_ends_by")
+    with col4:
+        if ends_by == "Tekrar sayısı":
+            count, until = st.number_input(
+                "Etkinlik sayısı",
+                min_value=2,
+                max_value=MAX_OCCURRENCES,
+                value=10,
+                key="recurrence_count"
+            ), None
+        else:
+            count, until = None, st.date_input(
+                "Son tarih",
+                value=(start + timedelta(weeks=12)).date(),
+                min_value=start.date(),
+                key="recurrence_until"
+            )
+
+    candidates = expand_occurrences(start, end, FREQUENCIES[frequency], interval, count, until, weekdays)
+    excluded = st.multiselect(
+        "Hariç tutulacak tarihler",
+        options=[s.date() for s, _ in candidates],
+        format_func=lambda d: d.strftime('%d/%m/%Y'),
+        key="recurrence_exclude",
+        help="Tatil gibi etkinlik yapılmayacak günler"
+    )
+    excluded = set(excluded)
+    occurrences = [(s, e) for s, e in candidates if s.date() not in excluded]
+
+    if occurrences:
+        st.caption(
+            f"🔁 {len(occurrences)} etkinlik: {occurrences[0][0].strftime('%d/%m/%Y %H:%M')} – "
+            f"{occurrences[-1][0].strftime('%d/%m/%Y %H:%M')}"
+        )
+    if len(candidates) >= MAX_OCCURRENCES:
+        st.warning(f"Bir seride en fazla {MAX_OCCURRENCES} etkinlik oluşturulabilir.")
+    return occurrences
+
+
+def format_start(record):
+    start = parse_event_datetime(record['fields'].get('start_date'))
+    return start.strftime('%d/%m/%Y %H:%M') if start else str(record['fields'].get('start_date', ''))
+
+
+def reload_series(host_id, message):
+    """Show the result after a bulk change, with the series read again"""
+    st.session_state.pop(f"host_series_{host_id}", None)
+    try:
+        st.session_state[f"host_series_{host_id}"] = load_host_series(host_id)
+    except Exception:
+        pass
+    st.session_state.series_message = message
+    st.rerun()
+
+
+def render_series_manager(host_id):
+    """Edit or cancel a whole series (or one occurrence and the ones after it) in bulk"""
+    st.header("🔁 Tekrarlayan Etkinlik Serileri")
+    cache_key = f"host_series_{host_id}"
+    message = st.session_state.pop("series_message", None)
+    if message:
+        st.success(message)
+
+    if cache_key not in st.session_state:
+        if st.button("📂 Serileri Yükle", key="load_series"):
+            try:
+                st.session_state[cache_key] = load_host_series(host_id)
+            except Exception as e:
+                st.error(f"Seriler yüklenirken hata oluştu: {str(e)}")
+                return
+            st.rerun()
+        return
+
+    series = st.session_state[cache_key]
+    if not series:
+        st.info("Bu Host ID için tekrarlayan etkinlik serisi bulunmuyor.")
+        return
+
+    series_id = st.selectbox(
+        "Seri",
+        options=list(series),
+        format_func=lambda sid: f"{series[sid][0]['fields'].get('name', '')} · {len(series[sid])} etkinlik · {format_start(series[sid][0])}",
+        key="series_select"
+    )
+    members = series[series_id]
+
+    scope = st.selectbox(
+        "Uygulanacak etkinlikler",
+        options=[None] + [r['id'] for r in members],
+        format_func=lambda rid: "Tüm seri" if rid is None else f"{format_start(next(r for r in members if r['id'] == rid))} ve sonrakiler",
+        key="series_scope"
+    )
+    selected = select_occurrences(members, scope)
+    current = selected[0]['fields'] if selected else {}
+    # Values the form starts with; only fields the user moves away from these are sent
+    initial = {
+        'name': current.get('name', ''),
+        'type': current.get('type', ''),
+        'description': current.get('description', ''),
+        'location_name': current.get('location_name', ''),
+        'detailed_address': current.get('detailed_address', ''),
+        'capacity': int(current.get('capacity') or 1),
+        'is_visible': bool(current.get('is_visible', False)),
+    }
+    # A type outside EVENT_TYPES (older rows) stays selectable, so it is not replaced silently
+    type_options = EVENT_TYPES if initial['type'] in EVENT_TYPES else [initial['type']] + EVENT_TYPES
+
+    with st.form(key=f"series_form_{series_id}_{scope}"):
+        values = {
+            'name': st.text_input("Etkinlik Adı", value=initial['name']),
+            'type': st.selectbox("Etkinlik Türü", options=type_options, index=type_options.index(initial['type'])),
+            'description': st.text_area("Etkinlik Açıklaması", value=initial['description']),
+            'location_name': st.text_input("Mekan Adı", value=initial['location_name']),
+            'detailed_address': st.text_input("Detaylı Adres", value=initial['detailed_address']),
+            'capacity': st.number_input("Beklenen Katılım Miktarı", min_value=1, value=initial['capacity']),
+            'is_visible': st.checkbox("Uygulamada Görünür", value=initial['is_visible']),
+        }
+        shift_minutes = st.number_input(
+            "Saatleri kaydır (dakika)",
+            min_value=-24 * 60,
+            max_value=24 * 60,
+            value=0,
+            step=15,
+            help="Örn. 60: seçili etkinliklerin hepsi bir saat ileri alınır"
+        )
+        submitted = st.form_submit_button(f"💾 {len(selected)} Etkinliğe Uygula", type="primary")
+
+    if submitted:
+        # Only fields edited here are sent, so per-occurrence differences elsewhere survive
+        changes = {k: v for k, v in values.items() if k in SERIES_FIELDS and v != initial[k]}
+        try:
+            updated = update_series(host_id, selected, changes) if changes else []
+            shifted = shift_series(host_id, selected, timedelta(minutes=shift_minutes)) if shift_minutes else []
+        except Exception as e:
+            st.error(f"Seri güncellenirken hata oluştu: {str(e)}")
+            return
+        reload_series(host_id, f"✅ {len({r['id'] for r in updated + shifted})} etkinlik güncellendi.")
+
+    st.markdown("---")
+    confirm = st.checkbox(f"{len(selected)} etkinliği iptal etmek istediğimi onaylıyorum", key=f"series_cancel_confirm_{series_id}")
+    if st.button("🗑️ Seçili Etkinlikleri İptal Et", disabled=not confirm, key="series_cancel"):
+        try:
+            removed = cancel_series(host_id, selected)
+        except Exception as e:
+            st.error(f"Etkinlikler silinirken hata oluştu: {str(e)}")
+            return
+        reload_series(host_id, f"🗑️ {removed} etkinlik iptal edildi.")
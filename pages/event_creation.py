@@ -2,7 +2,16 @@ import streamlit as st
 import json
 import uuid
 from typing import List, Dict, Any
-from pyairtable import Api
+from components.event_import import render_event_import
+from components.series_editor import render_recurrence_options, render_series_manager
+from components.metrics_panel import render_metrics_panel
+from services.airtable import get_airtable_table
+from services.cache import invalidate_host_events
+from services.events import EVENT_TYPES, event_to_record, get_id_column_value, validate_event_data
+from services.metrics import set_page
+from services.mirror import mirror_written
+from services.series import create_series
+from services.profiler import profiled_page, span
 from datetime import datetime, timedelta
 
 # Page configuration
@@ -16,154 +25,68 @@ st.set_page_config(
 if 'event_data' not in st.session_state:
     st.session_state.event_data = {}
 
-# Airtable configuration
-AIRTABLE_CONFIG = {
-    "base_id": "applJyRTlJLvUEDJs",
-    "api_key": "patJHZQyID8nmSaxh.1bcf08f100bd723fd85d67eff8534a19f951b75883d0e0ae4cc49743a9fb3131"
-}
+def get_event_id_by_record_id(record_id):
+    """Single targeted lookup of a record's ID column by its Airtable record id"""
+    table = get_airtable_table("events")
+    record = table.get(record_id)
+    return get_id_column_value(record.get('fields', {}))
 
-def get_airtable_api():
-    """Get Airtable API instance"""
-    return Api(AIRTABLE_CONFIG["api_key"])
-
-def get_airtable_table(table_name):
-    """Get Airtable table instance"""
-    api = get_airtable_api()
-    return api.table(AIRTABLE_CONFIG["base_id"], table_name)
-
-def get_record_by_host_id(host_id):
-    """Get record by host_id to retrieve the ID column value"""
+def save_series(event_data, occurrences):
+    """Create every occurrence of a recurring event in batched requests; returns the first event's ID"""
     try:
-        table = get_airtable_table("events")
-        # Search for records with the specific host_id
-        # Try different formula syntax
-        try:
-            records = table.all(formula=f"{{host_id}} = '{host_id}'")
-        except:
-            # Fallback: get all records and filter
-            records = table.all()
-            records = [r for r in records if r.get('fields', {}).get('host_id') == host_id]
-        
-        if records and len(records) > 0:
-            # Get the most recent record (last created)
-            latest_record = records[-1]
-            fields = latest_record.get('fields', {})
-            
-            # Look for ID column in fields
-            if 'ID' in fields:
-                return fields['ID']
-            elif 'id' in fields:
-                return fields['id']
-            elif 'Id' in fields:
-                return fields['Id']
-            else:
-                return None
-        
-        return None
+        series_id, created = create_series(event_data, occurrences)
     except Exception as e:
-        st.error(f"ID Column Value alınırken hata oluştu: {e}")
+        st.error(f"❌ Etkinlik serisi kaydedilirken hata oluştu: {e}")
         return None
-
-
+    
+    st.session_state.series_created = len(created)
+    # The series manager's loaded list no longer includes every series
+    st.session_state.pop(f"host_series_{event_data['host_id']}", None)
+    record_id = get_id_column_value(created[0].get('fields', {})) if created else None
+    if record_id is None and created:
+        try:
+            record_id = get_event_id_by_record_id(created[0]['id'])
+        except Exception as e:
+            st.error(f"❌ Record ID alınırken hata: {e}")
+    return record_id
 
 def save_event(event_data):
-    """Save event data to Airtable"""
+    """Save event data to Airtable and return the new event's ID column value"""
     try:
         table = get_airtable_table("events")  # Assuming you have an events table
         
-        record_data = {
-            "name": event_data['name'],
-            "description": event_data['description'],
-            "type": event_data['type'],
-            "host_id": event_data['host_id'],
-            "location_name": event_data['location_name'],
-            "detailed_address": event_data['detailed_address'],
-            "start_date": event_data['start_date'].isoformat(),
-            "end_date": event_data['end_date'].isoformat(),
-            "capacity": event_data['capacity'],
-            "is_visible": event_data['is_visible']
-        }
-        
-        # Create the record
+        record_data = event_to_record(event_data)
+        
+        # Create the record; Airtable returns the created record including computed fields
         response = table.create(record_data)
         
-        if response:
-            st.success("✅ Etkinlik başarıyla kaydedildi!")
-            
-            # Handle different response structures
-            record_id = None
-            
-            # If response is a dict, it might contain the record directly
-            if isinstance(response, dict):
-                # Check if it has a 'fields' field with ID column
-                if 'fields' in response:
-                    fields = response['fields']
-                    # Look for ID column in fields
-                    if 'ID' in fields:
-                        record_id = fields['ID']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-                    elif 'id' in fields:
-                        record_id = fields['id']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-                    elif 'Id' in fields:
-                        record_id = fields['Id']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-                # Check if it has a 'records' field
-                elif 'records' in response and len(response['records']) > 0:
-                    record = response['records'][0]
-                    if isinstance(record, dict) and 'fields' in record:
-                        fields = record['fields']
-                        if 'ID' in fields:
-                            record_id = fields['ID']
-                            st.success(f"📋 ID Column Value (from response): {record_id}")
-                            return record_id
-                        elif 'id' in fields:
-                            record_id = fields['id']
-                            st.success(f"📋 ID Column Value (from response): {record_id}")
-                            return record_id
-                        elif 'Id' in fields:
-                            record_id = fields['Id']
-                            st.success(f"📋 ID Column Value (from response): {record_id}")
-                            return record_id
-            
-            # If response is a list
-            elif isinstance(response, list) and len(response) > 0:
-                record = response[0]
-                if isinstance(record, dict) and 'fields' in record:
-                    fields = record['fields']
-                    if 'ID' in fields:
-                        record_id = fields['ID']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-                    elif 'id' in fields:
-                        record_id = fields['id']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-                    elif 'Id' in fields:
-                        record_id = fields['Id']
-                        st.success(f"📋 ID Column Value (from response): {record_id}")
-                        return record_id
-            
-            # If we can't get ID from response, try to read it from the database
-            if not record_id:
-                st.info("🔄 Record ID alınıyor...")
-                try:
-                    record_id = get_record_by_host_id(event_data['host_id'])
-                    
-                    if record_id:
-                        st.success(f"📋 ID Column Value (from database): {record_id}")
-                        return record_id
-                    else:
-                        st.error("❌ ID Column Value alınamadı")
-                        return None
-                except Exception as e:
-                    st.error(f"❌ Record ID alınırken hata: {e}")
-                    return None
-        
-        st.error("❌ Kayıt oluşturulamadı")
+        if not response or 'id' not in response:
+            st.error("❌ Kayıt oluşturulamadı")
+            return None
+        
+        st.success("✅ Etkinlik başarıyla kaydedildi!")
+        # The host's cached event list no longer matches Airtable
+        mirror_written("events", [response])
+        invalidate_host_events(event_data['host_id'])
+        
+        record_id = get_id_column_value(response.get('fields', {}))
+        if record_id is not None:
+            st.success(f"📋 ID Column Value (from response): {record_id}")
+            return record_id
+        
+        # Computed fields missing from the response: read back exactly this record
+        st.info("🔄 Record ID alınıyor...")
+        try:
+            record_id = get_event_id_by_record_id(response['id'])
+        except Exception as e:
+            st.error(f"❌ Record ID alınırken hata: {e}")
+            return None
+        
+        if record_id is not None:
+            st.success(f"📋 ID Column Value (from database): {record_id}")
+            return record_id
+        
+        st.error("❌ ID Column Value alınamadı")
         return None
         
     except Exception as e:
@@ -171,44 +94,10 @@ def save_event(event_data):
         st.error(f"❌ Hata detayı: {type(e).__name__}")
         return None
 
-def validate_event_data(event_data):
-    """Validate event data"""
-    errors = []
-    
-    if not event_data.get('name'):
-        errors.append("Etkinlik adı zorunludur")
-    
-    if not event_data.get('description'):
-        errors.append("Etkinlik açıklaması zorunludur")
-    
-    if not event_data.get('type'):
-        errors.append("Etkinlik türü zorunludur")
-    
-    if not event_data.get('location_name'):
-        errors.append("Mekan adı zorunludur")
-    
-    if not event_data.get('detailed_address'):
-        errors.append("Detaylı adres zorunludur")
-    
-    if not event_data.get('start_date'):
-        errors.append("Başlangıç tarihi zorunludur")
-    
-    if not event_data.get('end_date'):
-        errors.append("Bitiş tarihi zorunludur")
-    
-    if event_data.get('start_date') and event_data.get('end_date'):
-        if event_data['start_date'] >= event_data['end_date']:
-            errors.append("Bitiş tarihi başlangıç tarihinden sonra olmalıdır")
-    
-    if not event_data.get('capacity') or event_data['capacity'] <= 0:
-        errors.append("Beklenen Katılım Miktarı 0'dan büyük olmalıdır")
-    
-    if 'is_visible' not in event_data:
-        errors.append("Uygulama içerisinde etkinliğinizin gözükmesini ister misiniz seçeneği zorunludur")
-    
-    return errors
-
+@profiled_page("event_creation")
 def main():
+    set_page("event_creation")
+    render_metrics_panel()
     st.title("🎉 Etkinlik Kayıt Formu")
     st.markdown("Etkinliğinizi kaydetmek için aşağıdaki formu doldurun.")
     
@@ -219,6 +108,8 @@ def main():
     # Check if we have a successful event creation
     if 'event_created' in st.session_state and st.session_state.event_created:
         st.success("✅ Etkinlik başarıyla kaydedildi!")
+        if st.session_state.get('series_created'):
+            st.success(f"🔁 Seride {st.session_state.series_created} etkinlik oluşturuldu. Özellikler ilk etkinlik için düzenlenecek.")
         st.info(f"📋 Record ID: {st.session_state.event_id}")
         
         st.markdown("---")
@@ -252,8 +143,23 @@ def main():
     
     st.info(f"**Host ID:** {host_id} (Ana sayfadan alındı)")
     
+    mode = st.radio(
+        "Oluşturma şekli",
+        options=["Tek etkinlik", "Toplu içe aktarma (CSV/JSON)", "Tekrarlayan seriler"],
+        horizontal=True,
+        key="event_creation_mode"
+    )
+    if mode == "Toplu içe aktarma (CSV/JSON)":
+        with span("event import"):
+            render_event_import(host_id)
+        return
+    if mode == "Tekrarlayan seriler":
+        with span("series manager"):
+            render_series_manager(host_id)
+        return
+    
     # Form sections
-    with st.container():
+    with span("event form"), st.container():
         st.header("📝 Etkinlik Bilgileri")
         
         # Event name and description
@@ -269,23 +175,7 @@ def main():
         with col2:
             event_type = st.selectbox(
                 "Etkinlik Türü *",
-                options=[
-                    "",
-                    "Konferans, Zirve & Seminer",
-                    "Kongre, Fuar & Sergi",
-                    "Kurumsal & İş Etkinlikleri",
-                    "Atölye, Eğitim & Networking",
-                    "Teknoloji Etkinlikleri & Hackathon",
-                    "Festival, Panayır & Kutlama",
-                    "Konser, Müzik & Sahne Sanatları",
-                    "Spor, Espor & Yarışmalar",
-                    "Sağlık, Wellness & Hayır Etkinlikleri",
-                    "Yiyecek, İçecek & Gastronomi",
-                    "Gece Hayatı & Parti",
-                    "Seyahat, Tur & Gezi",
-                    "Aile, Çocuk & Topluluk Etkinlikleri",
-                    "Sanal & Hibrit Etkinlikler"
-                ],
+                options=[""] + EVENT_TYPES,
                 help="Etkinliğinizin türünü seçin"
             )
         
@@ -363,6 +253,11 @@ def main():
         start_datetime = datetime.combine(start_date, start_time)
         end_datetime = datetime.combine(end_date, end_time)
         
+        # Recurrence: the dates above are the first occurrence
+        occurrences = None
+        if st.checkbox("🔁 Tekrarlayan etkinlik", key="is_recurring", help="Aynı etkinliği belirli aralıklarla tekrarlayın"):
+            occurrences = render_recurrence_options(start_datetime, end_datetime)
+        
         st.markdown("---")
         
         # Host information
@@ -432,12 +327,15 @@ def main():
             # Validate data
             errors = validate_event_data(event_data)
             
+            if occurrences is not None and not occurrences:
+                errors.append("Tekrar ayarları hiçbir etkinlik tarihi üretmiyor")
+            
             if errors:
                 st.error("Lütfen aşağıdaki hataları düzeltin:")
                 for error in errors:
                     st.error(f"• {error}")
             else:
-                record_id = save_event(event_data)
+                record_id = save_series(event_data, occurrences) if occurrences else save_event(event_data)
                 if record_id:
                     # Clear form and session state
                     st.session_state.event_data = {}
@@ -2,7 +2,17 @@ import streamlit as st
 import json
 import uuid
 from typing import List, Dict, Any
-from pyairtable import Api
+from components.feature_matrix import render_feature_matrix
+from services.airtable import get_airtable_table
+from services.cache import get_cache
+from services.features import FEATURES
+from services.loader import get_loader, start_rerun
+from services.metrics import set_page
+from services.mirror import normalize_key
+from services.outbox import STATUS_IN_PROGRESS, STATUS_PENDING, get_outbox
+from services.profiler import profiled_page, span
+from components.metrics_panel import render_metrics_panel
+from components.outbox_status import render_outbox_status
 from datetime import datetime
 import urllib.parse
 
@@ -21,45 +31,6 @@ if 'event_id' not in st.session_state:
 if 'redirect_url' not in st.session_state:
     st.session_state.redirect_url = None
 
-# Airtable configuration
-AIRTABLE_CONFIG = {
-    "base_id": "applJyRTlJLvUEDJs",
-    "api_key": "patJHZQyID8nmSaxh.1bcf08f100bd723fd85d67eff8534a19f951b75883d0e0ae4cc49743a9fb3131"
-}
-
-# Feature definitions
-FEATURES = {
-    "registration_form": {
-        "name": "Kayıt Formu",
-        "description": "Etkinliğiniz için özelleştirilebilir kayıt formu oluşturun. Katılımcıların bilgilerini toplayın ve yönetin.",
-        "category": "before_event",
-        # Explicit mapping to Airtable's feature_id for clarity
-        "feature_id": 1
-    }
-    # Future features can be added here:
-    # "live_polling": {
-    #     "name": "Canlı Anket",
-    #     "description": "Etkinlik sırasında katılımcılarla canlı anket yapın.",
-    #     "category": "during_event",
-    #     "feature_id": 2
-    # },
-    # "feedback_survey": {
-    #     "name": "Geri Bildirim Anketi",
-    #     "description": "Etkinlik sonrası katılımcılardan geri bildirim toplayın.",
-    #     "category": "after_event",
-    #     "feature_id": 3
-    # }
-}
-
-def get_airtable_api():
-    """Get Airtable API instance"""
-    return Api(AIRTABLE_CONFIG["api_key"])
-
-def get_airtable_table(table_name):
-    """Get Airtable table instance"""
-    api = get_airtable_api()
-    return api.table(AIRTABLE_CONFIG["base_id"], table_name)
-
 # --- NEW HELPERS for (event_id, feature_id=1) flow ---
 
 def get_event_feature_record(event_id: Any, feature_id: int):
@@ -67,43 +38,53 @@ def get_event_feature_record(event_id: Any, feature_id: int):
     Fetch a single record from 'event_features' for given event_id and feature_id.
     Returns dict {'record': {...}, 'is_active': bool} if found, else None.
     """
-    try:
-        table = get_airtable_table("event_features")
-        # Airtable formula: assume event_id stored as text; quote it.
-        # If your event_id field in Airtable is numeric, Airtable will still match string-literal to number.
-        formula = f"AND({{event_id}}='{str(event_id)}', {{feature_id}}={feature_id})"
-        records = table.all(formula=formula, max_records=1)
-        if records:
-            rec = records[0]
+    def fetch():
+        # Shares one event_features query per rerun with load_event_features (see services/loader.py)
+        records = get_loader("event_features", "event_id").load(event_id)
+        matches = [r for r in records if normalize_key(r['fields'].get('feature_id')) == normalize_key(feature_id)]
+        if matches:
+            rec = matches[0]
             is_active = bool(rec['fields'].get('is_active', False))
             return {"record": rec, "is_active": is_active}
         return None
+
+    try:
+        return get_cache("event_features").get_or_load((str(event_id), int(feature_id)), fetch)
     except Exception as e:
         st.error(f"Özellik durumu alınırken hata oluştu: {str(e)}")
         return None
 
-def update_event_feature_is_active(record_id: str, is_active: bool) -> bool:
-    """Update 'is_active' on the given record_id in Airtable. Returns True on success."""
+def update_event_feature_is_active(record_id: str, is_active: bool, event_id: Any, feature_id: int) -> bool:
+    """Queue an 'is_active' update for the given record_id (written by the outbox worker). Returns True on success."""
     try:
-        table = get_airtable_table("event_features")
-        table.update(record_id, {"is_active": is_active})
+        get_outbox().enqueue("feature_active", f"{event_id}:{feature_id}", {
+            "record_id": record_id,
+            "is_active": is_active,
+            "event_id": str(event_id),
+            "feature_id": int(feature_id)
+        })
         return True
     except Exception as e:
         st.error(f"Özellik güncellenirken hata oluştu: {str(e)}")
         return False
 
+def pending_feature_state(event_id: Any, feature_id: int, stored: bool) -> bool:
+    """Value of a toggle still waiting in the outbox, so the UI shows it before Airtable has it."""
+    op = get_outbox().latest("feature_active", f"{event_id}:{feature_id}")
+    if op and op["status"] in (STATUS_PENDING, STATUS_IN_PROGRESS):
+        return bool(op["payload"]["is_active"])
+    return stored
+
 def is_feature_active(event_id: Any, feature_id: int) -> bool:
     """Convenience: check if a feature is active for summary section."""
     data = get_event_feature_record(event_id, feature_id)
-    return bool(data and data.get("is_active", False))
+    return pending_feature_state(event_id, feature_id, bool(data and data.get("is_active", False)))
 
 # --- Existing function kept (used for other parts) ---
 def load_event_features(event_id):
     """Load existing features for an event (legacy path; uses feature_key/enabled if present)."""
     try:
-        table = get_airtable_table("event_features")
-        # Kept as-is for minimal change; quoting event_id for safety
-        records = table.all(formula=f"{{event_id}} = '{str(event_id)}'")
+        records = get_loader("event_features", "event_id").load(event_id)
         features = {}
         for record in records:
             feature_key = record['fields'].get('feature_key', '')
@@ -162,7 +143,7 @@ def render_feature_section(title, features, category, event_id):
                         st.info("ℹ️ Bu özellik henüz yapılandırılmamış")
                     else:
                         # Show toggle UI using a form to require explicit 'Apply'
-                        current_active = ef["is_active"]
+                        current_active = pending_feature_state(event_id, feature_id, ef["is_active"])
                         rec_id = ef["record"]["id"]
 
                         with st.form(key=f"{feature_key}_activation_form"):
@@ -173,7 +154,7 @@ def render_feature_section(title, features, category, event_id):
                             )
                             applied = st.form_submit_button("Uygula")
                             if applied:
-                                if update_event_feature_is_active(rec_id, new_active):
+                                if update_event_feature_is_active(rec_id, new_active, event_id, feature_id):
                                     # Immediate feedback
                                     if new_active:
                                         st.success("✅ Kayıt Formu etkinleştirildi.")
@@ -186,6 +167,7 @@ def render_feature_section(title, features, category, event_id):
                             st.success("✅ Bu özellik etkinliğiniz için aktif")
                         else:
                             st.info("ℹ️ Bu özellik şu anda devre dışı")
+                        render_outbox_status("feature_active", f"{event_id}:{feature_id}")
                 else:
                     # Legacy path for other features (if any are added later)
                     existing_features = load_event_features(event_id)
@@ -194,7 +176,11 @@ def render_feature_section(title, features, category, event_id):
                     else:
                         st.info("ℹ️ Bu özellik henüz yapılandırılmamış")
 
+@profiled_page("feature_management")
 def main():
+    start_rerun()
+    set_page("feature_management")
+    render_metrics_panel()
     st.title("⚙️ Etkinlik Özellikleri Yönetimi")
     st.markdown("Etkinliğiniz için hangi özellikleri yapılandırmak istediğinizi seçin.")
     
@@ -233,7 +219,8 @@ def main():
     st.info(f"**Etkinlik ID:** {event_id}")
     
     # Load existing features (legacy usage)
-    existing_features = load_event_features(event_id)
+    with span("load features"):
+        existing_features = load_event_features(event_id)
     
     # Update session state with existing features (legacy usage)
     for feature_key, feature_data in existing_features.items():
@@ -241,37 +228,47 @@ def main():
     
     st.markdown("---")
     
-    # Before Event Features
-    before_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'before_event'}
-    render_feature_section("Etkinlik Öncesi Özellikler", before_event_features, "before_event", event_id)
+    with span("feature sections"):
+        # Before Event Features
+        before_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'before_event'}
+        render_feature_section("Etkinlik Öncesi Özellikler", before_event_features, "before_event", event_id)
     
-    # During Event Features
-    during_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'during_event'}
-    render_feature_section("Etkinlik Sırası Özellikler", during_event_features, "during_event", event_id)
+        # During Event Features
+        during_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'during_event'}
+        render_feature_section("Etkinlik Sırası Özellikler", during_event_features, "during_event", event_id)
     
-    # After Event Features
-    after_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'after_event'}
-    render_feature_section("Etkinlik Sonrası Özellikler", after_event_features, "after_event", event_id)
+        # After Event Features
+        after_event_features = {k: v for k, v in FEATURES.items() if v['category'] == 'after_event'}
+        render_feature_section("Etkinlik Sonrası Özellikler", after_event_features, "after_event", event_id)
     
     # Summary
     st.markdown("---")
-    st.header("📊 Özet")
+    with span("summary"):
+        st.header("📊 Özet")
+    
+        # Legacy summary list, plus explicit check for registration_form is_active
+        active_features = [k for k, v in existing_features.items() if v['enabled']]
+        # Ensure registration_form reflects the new is_active field if a record exists
+        reg = FEATURES.get("registration_form")
+        if reg and is_feature_active(event_id, reg.get("feature_id", 1)):
+            if "registration_form" not in active_features:
+                active_features.append("registration_form")
     
-    # Legacy summary list, plus explicit check for registration_form is_active
-    active_features = [k for k, v in existing_features.items() if v['enabled']]
-    # Ensure registration_form reflects the new is_active field if a record exists
-    reg = FEATURES.get("registration_form")
-    if reg and is_feature_active(event_id, reg.get("feature_id", 1)):
-        if "registration_form" not in active_features:
-            active_features.append("registration_form")
+        if active_features:
+            st.success(f"**{len(active_features)}** özellik aktif:")
+            for feature_key in active_features:
+                if feature_key in FEATURES:
+                    st.markdown(f"• {FEATURES[feature_key]['name']}")
+        else:
+            st.warning("Henüz hiç özellik aktif edilmedi.")
     
-    if active_features:
-        st.success(f"**{len(active_features)}** özellik aktif:")
-        for feature_key in active_features:
-            if feature_key in FEATURES:
-                st.markdown(f"• {FEATURES[feature_key]['name']}")
-    else:
-        st.warning("Henüz hiç özellik aktif edilmedi.")
+    # Feature status across all of the host's events
+    host_id = st.session_state.get('current_host_id')
+    if host_id is not None:
+        st.markdown("---")
+        with span("feature matrix"):
+            st.header("🧩 Tüm Etkinliklerde Özellik Durumları")
+            render_feature_matrix(host_id, "features")
     
     # Refresh button
     st.markdown("---")
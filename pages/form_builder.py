@@ -2,7 +2,17 @@ import streamlit as st
 import json
 import uuid
 from typing import List, Dict, Any
-from pyairtable import Api
+from services.airtable import get_airtable_table
+from services.drafts import draft_key, get_draft_store
+from services.forms import CHOICE_TYPES, DATA_TYPES, needs_rebalance, rank_between, rebalance_ranks, record_to_question
+from services.metrics import set_page
+from services.mirror import mirror_records
+from services.outbox import get_outbox
+from services.profiler import profiled_page, span
+from components.form_templates import render_template_panel
+from components.metrics_panel import render_metrics_panel
+from components.outbox_status import render_outbox_status
+from streamlit.errors import StreamlitAPIException
 from datetime import datetime
 
 # Page configuration
@@ -24,67 +34,48 @@ if 'event_id' not in st.session_state:
 if 'has_loaded_form' not in st.session_state:
     st.session_state.has_loaded_form = False  # load guard
 
-# Airtable configuration
-AIRTABLE_CONFIG = {
-    "base_id": "applJyRTlJLvUEDJs",
-    "api_key": "patJHZQyID8nmSaxh.1bcf08f100bd723fd85d67eff8534a19f951b75883d0e0ae4cc49743a9fb3131"
-}
-
-# Data type options in Turkish
-DATA_TYPES = {
-    "Yazı": "text",
-    "Sayı": "number",
-    "Virgüllü sayı": "float",
-    "Tarih": "date",
-    "Saat ve tarih": "datetime",
-    "Doğru yanlış": "boolean",
-    "Çoktan seçmeli": "single_choice",
-    "Çoktan seçmeli çoklu cevap": "multiple_choice"
-}
-# Reverse map for loading existing rows
-DATA_TYPES_REVERSE = {v: k for k, v in DATA_TYPES.items()}
-
-def get_airtable_api():
-    return Api(AIRTABLE_CONFIG["api_key"])
-
-def get_airtable_table(table_name="registration_form"):
-    api = get_airtable_api()
-    return api.table(AIRTABLE_CONFIG["base_id"], table_name)
-
-def get_event_features_table():
-    api = get_airtable_api()
-    return api.table(AIRTABLE_CONFIG["base_id"], "event_features")
+def get_form_table():
+    return get_airtable_table("registration_form")
 
 def add_question():
     qid = f"question_{st.session_state.question_counter}"
+    last_rank = st.session_state.questions[-1]['rank'] if st.session_state.questions else None
     st.session_state.questions.append({
         'id': qid,
+        'uid': uuid.uuid4().hex,
+        'record_id': None,
         'question': '',
         'type': 'Yazı',
         'is_required': False,
         'options': [],
-        'rank': len(st.session_state.questions)
+        'rank': rank_between(last_rank, None)
     })
     st.session_state.question_counter += 1
 
 def remove_question(question_id):
+    # The remaining ranks keep their order, so nothing else is rewritten
     st.session_state.questions = [q for q in st.session_state.questions if q['id'] != question_id]
-    for i, q in enumerate(st.session_state.questions):
-        q['rank'] = i
+
+def place_question(index):
+    """Give the question at index a rank between its current neighbours (one row changes)"""
+    questions = st.session_state.questions
+    before = questions[index - 1]['rank'] if index > 0 else None
+    after = questions[index + 1]['rank'] if index < len(questions) - 1 else None
+    questions[index]['rank'] = rank_between(before, after)
+    if needs_rebalance(questions):
+        rebalance_ranks(questions)
 
 def move_question_up(index):
     if index > 0:
         st.session_state.questions[index], st.session_state.questions[index-1] = \
             st.session_state.questions[index-1], st.session_state.questions[index]
-        for i, q in enumerate(st.session_state.questions):
-            q['rank'] = i
+        place_question(index - 1)
 
 def move_question_down(index):
     if index < len(st.session_state.questions) - 1:
         st.session_state.questions[index], st.session_state.questions[index+1] = \
             st.session_state.questions[index+1], st.session_state.questions[index]
-        for i, q in enumerate(st.session_state.questions):
-            q['rank'] = i
+        place_question(index + 1)
 
 def add_option(question_id):
     for q in st.session_state.questions:
@@ -98,17 +89,66 @@ def remove_option(question_id, option_index):
             q['options'].pop(option_index)
             break
 
+# -------- LOCAL DRAFTS (autosaved, restored before loading from Airtable) ----------
+def current_draft_key(event_id):
+    # current_host_id is set by the dashboard; host_id only on the event creation path
+    host_id = st.session_state.get('current_host_id', st.session_state.get('host_id'))
+    return draft_key(host_id, event_id)
+
+def form_snapshot():
+    return json.dumps(st.session_state.questions, sort_keys=True)
+
+def autosave_draft(event_id):
+    """Schedule a debounced local write of the current questions; no Airtable calls"""
+    if form_snapshot() == st.session_state.get('draft_baseline'):
+        # Same as what was loaded from / sent to Airtable
+        return
+    get_draft_store().schedule(
+        current_draft_key(event_id),
+        st.session_state.questions,
+        st.session_state.question_counter
+    )
+
+def restore_draft(event_id):
+    """Restore an unsaved local draft once per page entry, instead of loading from Airtable"""
+    if st.session_state.has_loaded_form:
+        return False
+    draft = get_draft_store().load(current_draft_key(event_id))
+    if not draft or not draft['questions']:
+        return False
+    st.session_state.questions = draft['questions']
+    st.session_state.question_counter = max(draft['question_counter'], len(draft['questions']))
+    st.session_state.has_loaded_form = True
+    st.session_state.restored_draft = True
+    return True
+
+def render_draft_notice(event_id):
+    if not st.session_state.get('restored_draft'):
+        return
+    cmsg, cdiscard = st.columns([4, 1])
+    with cmsg:
+        st.info("Kaydedilmemiş taslağınız geri yüklendi. Airtable'a göndermek için \"Formu Uygula\"ya tıklayın.")
+    with cdiscard:
+        if st.button("🗑️ Taslağı At", key="discard_draft", use_container_width=True):
+            get_draft_store().discard(current_draft_key(event_id))
+            st.session_state.restored_draft = False
+            st.session_state.has_loaded_form = False
+            st.rerun()
+
 # -------- LOAD EXISTING FORM (ordered by rank asc) ----------
 def load_existing_form(event_id):
     """Always attempt to load once per page entry; populates builder if rows exist."""
     if st.session_state.has_loaded_form:
         return
     try:
-        table = get_airtable_table()
         event_id_int = int(event_id)
-        existing = table.all(formula=f"{{event_id}} = {event_id_int}")
+        existing = mirror_records("registration_form", event_id_int)
+        if existing is None:
+            table = get_form_table()
+            existing = table.all(formula=f"{{event_id}} = {event_id_int}")
         if not existing:
             st.session_state.has_loaded_form = True
+            st.session_state.draft_baseline = form_snapshot()
             return
 
         # sort by 'rank' (default 0 if missing)
@@ -118,43 +158,39 @@ def load_existing_form(event_id):
         st.session_state.question_counter = 0
 
         for rec in existing_sorted:
-            f = rec.get('fields', {})
             qid = f"question_{st.session_state.question_counter}"
-
-            # type mapping
-            saved_type_code = f.get('type', 'text')
-            saved_type_label = DATA_TYPES_REVERSE.get(saved_type_code, 'Yazı')
-
-            # possible answers
-            options_raw = f.get('possible_answers')
-            if isinstance(options_raw, list):
-                options_list = options_raw
-            elif isinstance(options_raw, str):
-                try:
-                    parsed = json.loads(options_raw)
-                    options_list = parsed if isinstance(parsed, list) else []
-                except Exception:
-                    options_list = []
-            else:
-                options_list = []
-
-            st.session_state.questions.append({
-                'id': qid,
-                'question': f.get('name', ''),
-                'type': saved_type_label,
-                'is_required': bool(f.get('is_required', False)),
-                'options': options_list,
-                'rank': int(f.get('rank', len(st.session_state.questions)))
-            })
+            st.session_state.questions.append(record_to_question(rec, qid, len(st.session_state.questions)))
             st.session_state.question_counter += 1
+        # Legacy rows may share a rank; renumber once so midpoints work
+        if needs_rebalance(st.session_state.questions):
+            rebalance_ranks(st.session_state.questions)
 
         st.session_state.has_loaded_form = True
+        st.session_state.draft_baseline = form_snapshot()
         st.info("Mevcut kayıt formu yüklendi. Düzenleyebilirsiniz.")
     except Exception as e:
         st.warning(f"Mevcut form yüklenemedi: {str(e)}")
         st.session_state.has_loaded_form = True  # avoid loops
 
-# -------- SAVE: DELETE ALL THEN CREATE FRESH ----------
+# -------- SAVE: QUEUE IN THE OUTBOX, WRITTEN IN THE BACKGROUND ----------
+def queue_form_save(event_id_int):
+    # The worker diffs this snapshot against Airtable and sends batched writes (see services/outbox.py)
+    get_outbox().enqueue("form_save", str(event_id_int), {
+        "event_id": event_id_int,
+        "questions": [dict(q) for q in st.session_state.questions]
+    })
+    # Airtable is now the source of truth again
+    get_draft_store().discard(current_draft_key(event_id_int))
+    st.session_state.draft_baseline = form_snapshot()
+    st.session_state.restored_draft = False
+
+def save_unsaved_form(event_id):
+    """Queue the builder's edits if they differ from what was loaded or saved; returns whether it did"""
+    if not st.session_state.questions or form_snapshot() == st.session_state.get('draft_baseline'):
+        return False
+    queue_form_save(int(event_id))
+    return True
+
 def save_form():
     if not st.session_state.questions:
         st.error("Lütfen en az bir soru ekleyin!")
@@ -168,55 +204,12 @@ def save_form():
         return
 
     try:
-        table = get_airtable_table()
-
-        # 1) delete all existing rows for this event_id
-        try:
-            to_delete = table.all(formula=f"{{event_id}} = {event_id_int}")
-            ids = [r['id'] for r in to_delete]
-            if ids:
-                # batch_delete if available, else fallback to loop
-                try:
-                    table.batch_delete(ids)
-                except Exception:
-                    for rid in ids:
-                        table.delete(rid)
-        except Exception as e_del:
-            st.warning(f"Eski form silinirken uyarı: {str(e_del)}")
-
-        # 2) create fresh rows from the builder (respect rank)
-        questions_sorted = sorted(st.session_state.questions, key=lambda q: q['rank'])
-        for q in questions_sorted:
-            record_data = {
-                "event_id": event_id_int,
-                "name": q['question'],
-                "type": DATA_TYPES[q['type']],
-                "is_required": q['is_required'],
-                "rank": q['rank']
-            }
-            if q['type'] in ['Çoktan seçmeli', 'Çoktan seçmeli çoklu cevap']:
-                record_data["possible_answers"] = json.dumps(q['options'])
-
-            try:
-                table.create(record_data)
-            except Exception as e_new:
-                st.error(f"Oluşturma hatası (soru: {q['question']}): {str(e_new)}")
-
-        st.success(f"Form başarıyla kaydedildi! Event ID: {event_id_int}")
-
-        # Keep event_features toggled ON for this event
-        try:
-            ef_table = get_event_features_table()
-            records = ef_table.all(formula=f"AND({{event_id}} = {event_id_int}, {{feature_id}} = 1)")
-            if records:
-                ef_table.update(records[0]['id'], {"is_active": True})
-            else:
-                ef_table.create({"event_id": event_id_int, "feature_id": 1, "is_active": True})
-        except Exception as e:
-            st.warning(f"Event features güncelleme uyarısı: {str(e)}")
+        queue_form_save(event_id_int)
+
+        st.success(f"Form kaydedildi! Event ID: {event_id_int}")
 
         st.session_state.show_preview = False
-        st.info("Değişiklikleriniz kaydedildi.")
+        st.info("Değişiklikleriniz arka planda Airtable'a gönderiliyor.")
         col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("🏠 Ana Sayfaya Dön", type="primary", use_container_width=True, key="nav_to_home_form"):
@@ -246,7 +239,7 @@ def render_question_preview(question):
         st.text_input("Cevap", value=datetime.now().strftime("%Y-%m-%d %H:%M"), key=f"preview_{question['id']}", disabled=True)
     elif question['type'] == 'Doğru yanlış':
         st.radio("Cevap", ["Evet", "Hayır"], key=f"preview_{question['id']}", disabled=True)
-    elif question['type'] in ['Çoktan seçmeli', 'Çoktan seçmeli çoklu cevap']:
+    elif question['type'] in CHOICE_TYPES:
         if question['options']:
             if question['type'] == 'Çoktan seçmeli':
                 st.radio("Cevap", question['options'], key=f"preview_{question['id']}", disabled=True)
@@ -255,8 +248,78 @@ def render_question_preview(question):
         else:
             st.info("Seçenek ekleyin")
 
+# Each question editor is a fragment: typing in it or adding/removing an
+# option reruns only that question. Delete and move change the list, so
+# they still rerun the whole page.
+question_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+def rerun_question():
+    """Rerun just the current question editor (whole page on Streamlit versions without fragment scope)"""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        # No scope argument, or not inside a fragment rerun
+        st.rerun()
+
+@question_fragment
+def render_question_editor(i, q):
+    before = json.dumps(q, sort_keys=True)
+    with st.container():
+        st.markdown("---")
+        ctrl = st.container()
+        with ctrl:
+            c1, c2, c3 = st.columns([2,1,1])
+            with c1:
+                if st.button("🗑️ Sil", key=f"delete_{q['id']}"):
+                    remove_question(q['id'])
+                    st.rerun()
+            with c2:
+                if st.button("⬆️", key=f"up_{q['id']}"):
+                    move_question_up(i)
+                    st.rerun()
+            with c3:
+                if st.button("⬇️", key=f"down_{q['id']}"):
+                    move_question_down(i)
+                    st.rerun()
+
+        q['question'] = st.text_input("Soru:", value=q['question'], key=f"question_text_{q['id']}")
+
+        with st.container():
+            ctype, creq = st.columns(2)
+            with ctype:
+                q['type'] = st.selectbox(
+                    "Veri Tipi:",
+                    options=list(DATA_TYPES.keys()),
+                    index=list(DATA_TYPES.keys()).index(q['type']),
+                    key=f"type_{q['id']}"
+                )
+            with creq:
+                q['is_required'] = st.checkbox("Zorunlu alan", value=q['is_required'], key=f"required_{q['id']}")
+
+        if q['type'] in CHOICE_TYPES:
+            st.markdown("**Seçenekler:**")
+            for j, opt in enumerate(q['options']):
+                with st.container():
+                    co, cr = st.columns([4,1])
+                    with co:
+                        q['options'][j] = st.text_input(f"Seçenek {j+1}:", value=opt, key=f"option_{q['id']}_{j}")
+                    with cr:
+                        if st.button("❌", key=f"remove_option_{q['id']}_{j}"):
+                            remove_option(q['id'], j)
+                            rerun_question()
+            if st.button("➕ Seçenek Ekle", key=f"add_option_{q['id']}"):
+                add_option(q['id'])
+                rerun_question()
+
+    # Fragment reruns skip main(), so edits made here are autosaved here too
+    if json.dumps(q, sort_keys=True) != before:
+        autosave_draft(st.session_state.event_id)
+
 # ---------------- MAIN ----------------
+@profiled_page("form_builder")
 def main():
+    set_page("form_builder")
+    render_metrics_panel()
     st.title("📝 Form Builder Dashboard")
     st.markdown("Kayıt formu oluşturmak / düzenlemek için aşağıdaki araçları kullanın.")
 
@@ -276,64 +339,29 @@ def main():
     if feature_key:
         st.info(f"Özellik: {feature_key}")
 
-    # Load existing schema (once per entry)
-    load_existing_form(event_id)
+    # Load existing schema (once per entry); an unsaved local draft wins over Airtable
+    with span("load form"):
+        restore_draft(event_id)
+        load_existing_form(event_id)
+    render_draft_notice(event_id)
+    render_template_panel(
+        st.session_state.get('current_host_id', st.session_state.get('host_id')),
+        event_id,
+        save_unsaved_form
+    )
 
     st.header("Form Oluşturucu")
 
     if not st.session_state.questions:
         st.info("Mevcut form bulunamadı. Yeni bir soru ekleyebilirsiniz.")
 
-    for i, q in enumerate(st.session_state.questions):
-        with st.container():
-            st.markdown("---")
-            ctrl = st.container()
-            with ctrl:
-                c1, c2, c3 = st.columns([2,1,1])
-                with c1:
-                    if st.button("🗑️ Sil", key=f"delete_{q['id']}"):
-                        remove_question(q['id'])
-                        st.rerun()
-                with c2:
-                    if st.button("⬆️", key=f"up_{q['id']}"):
-                        move_question_up(i)
-                        st.rerun()
-                with c3:
-                    if st.button("⬇️", key=f"down_{q['id']}"):
-                        move_question_down(i)
-                        st.rerun()
-
-            q['question'] = st.text_input("Soru:", value=q['question'], key=f"question_text_{q['id']}")
-
-            with st.container():
-                ctype, creq = st.columns(2)
-                with ctype:
-                    q['type'] = st.selectbox(
-                        "Veri Tipi:",
-                        options=list(DATA_TYPES.keys()),
-                        index=list(DATA_TYPES.keys()).index(q['type']),
-                        key=f"type_{q['id']}"
-                    )
-                with creq:
-                    q['is_required'] = st.checkbox("Zorunlu alan", value=q['is_required'], key=f"required_{q['id']}")
-
-            if q['type'] in ['Çoktan seçmeli', 'Çoktan seçmeli çoklu cevap']:
-                st.markdown("**Seçenekler:**")
-                for j, opt in enumerate(q['options']):
-                    with st.container():
-                        co, cr = st.columns([4,1])
-                        with co:
-                            q['options'][j] = st.text_input(f"Seçenek {j+1}:", value=opt, key=f"option_{q['id']}_{j}")
-                        with cr:
-                            if st.button("❌", key=f"remove_option_{q['id']}_{j}"):
-                                remove_option(q['id'], j)
-                                st.rerun()
-                if st.button("➕ Seçenek Ekle", key=f"add_option_{q['id']}"):
-                    add_option(q['id'])
-                    st.rerun()
+    with span("question editors"):
+        for i, q in enumerate(st.session_state.questions):
+            render_question_editor(i, q)
 
     if st.button("➕ Yeni Soru Ekle", type="primary", use_container_width=True):
         add_question()
+        st.rerun()
 
     st.markdown("---")
     if st.session_state.questions:
@@ -344,15 +372,18 @@ def main():
         with capply:
             if st.button("✅ Formu Uygula", type="primary", use_container_width=True):
                 save_form()
+    render_outbox_status("form_save", str(event_id))
+    autosave_draft(event_id)
 
     if st.session_state.show_preview and st.session_state.questions:
-        st.markdown("---")
-        st.header("Form Önizleme")
-        for q in sorted(st.session_state.questions, key=lambda x: x['rank']):
+        with span("preview"):
             st.markdown("---")
-            req = " *" if q['is_required'] else ""
-            st.markdown(f"**Soru {q['rank'] + 1}{req}**")
-            render_question_preview(q)
+            st.header("Form Önizleme")
+            for position, q in enumerate(sorted(st.session_state.questions, key=lambda x: x['rank']), start=1):
+                st.markdown("---")
+                req = " *" if q['is_required'] else ""
+                st.markdown(f"**Soru {position}{req}**")
+                render_question_preview(q)
 
 if __name__ == "__main__":
     main()
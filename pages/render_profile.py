@@ -0,0 +1,128 @@
+import streamlit as st
+from components.metrics_panel import render_metrics_panel
+from services.profiler import TRACE_PATH, profiling_enabled, read_traces
+
+# Page configuration
+st.set_page_config(
+    page_title="Render Profile",
+    page_icon="⏱️",
+    layout="wide"
+)
+
+RECENT_RERUNS = 50
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize_pages(traces):
+    """One row per page: rerun count and total/Airtable time and element counts"""
+    by_page = {}
+    for trace in traces:
+        by_page.setdefault(trace['page'], []).append(trace)
+    rows = []
+    for page, page_traces in sorted(by_page.items()):
+        totals = [t['total_ms'] for t in page_traces]
+        rows.append({
+            'Sayfa': page,
+            'Çalıştırma': len(page_traces),
+            'Ortalama ms': round(sum(totals) / len(totals), 1),
+            'p95 ms': percentile(totals, 0.95),
+            'Ort. Airtable ms': round(sum(t['airtable_ms'] for t in page_traces) / len(page_traces), 1),
+            'Ort. Eleman': round(sum(t['elements'] for t in page_traces) / len(page_traces), 1),
+        })
+    return rows
+
+def summarize_spans(traces):
+    """Average duration, Airtable time and elements of each span name across reruns"""
+    by_span = {}
+    for trace in traces:
+        for span in trace['spans']:
+            if 'duration_ms' in span:
+                by_span.setdefault(span['name'], []).append(span)
+    rows = []
+    for name, spans in by_span.items():
+        rows.append({
+            'Bölüm': name,
+            'Adet': len(spans),
+            'Ortalama ms': round(sum(s['duration_ms'] for s in spans) / len(spans), 1),
+            'p95 ms': percentile([s['duration_ms'] for s in spans], 0.95),
+            'Ort. Airtable ms': round(sum(s['airtable_ms'] for s in spans) / len(spans), 1),
+            'Ort. Eleman': round(sum(s['elements'] for s in spans) / len(spans), 1),
+        })
+    return sorted(rows, key=lambda r: r['Ortalama ms'], reverse=True)
+
+def main():
+    render_metrics_panel()
+    st.title("⏱️ Render Profili")
+    st.markdown("Her yeniden çalıştırmanın bölüm bazında süreleri, Airtable süresi ve eleman sayıları.")
+
+    if st.sidebar.button("🏠 Ana Sayfaya Dön", key="sidebar_home_profile"):
+        st.switch_page("app.py")
+
+    if not profiling_enabled():
+        st.info("Profil kaydı kapalı. `HOST_APP_PROFILE=1` ile başlatın veya sayfayı `?profile=1` ile açın.")
+
+    traces = read_traces()
+    if not traces:
+        st.warning(f"Henüz kayıt yok ({TRACE_PATH}).")
+        return
+
+    pages = sorted({t['page'] for t in traces})
+    selected_page = st.selectbox("Sayfa", options=["Tümü"] + pages, key="profile_page_filter")
+    if selected_page != "Tümü":
+        traces = [t for t in traces if t['page'] == selected_page]
+
+    st.header("📊 Sayfalar")
+    st.dataframe(summarize_pages(traces), use_container_width=True, hide_index=True)
+
+    st.header("🧱 Bölümler")
+    st.dataframe(summarize_spans(traces), use_container_width=True, hide_index=True)
+
+    st.header("🕒 Son Çalıştırmalar")
+    recent = list(reversed(traces[-RECENT_RERUNS:]))
+    st.dataframe(
+        [{
+            'Zaman': t['at'],
+            'Sayfa': t['page'],
+            'Sonuç': t['outcome'],
+            'Toplam ms': t['total_ms'],
+            'Airtable ms': t['airtable_ms'],
+            'Airtable istek': t['airtable_calls'],
+            'Eleman': t['elements'],
+        } for t in recent],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    index = st.selectbox(
+        "Çalıştırma detayı",
+        options=range(len(recent)),
+        format_func=lambda i: f"{recent[i]['at']} · {recent[i]['page']} · {recent[i]['total_ms']} ms",
+        key="profile_rerun_detail"
+    )
+    spans = recent[index]['spans']
+    if spans:
+        st.dataframe(
+            [{
+                'Bölüm': "  " * s['depth'] + s['name'],
+                'Başlangıç ms': s['start_ms'],
+                'Süre ms': s.get('duration_ms'),
+                'Airtable ms': s.get('airtable_ms'),
+                'Airtable istek': s.get('airtable_calls'),
+                'Eleman': s.get('elements'),
+            } for s in spans],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.bar_chart(
+            [{'Bölüm': s['name'], 'Süre ms': s.get('duration_ms', 0)} for s in spans if s['depth'] == 0],
+            x='Bölüm',
+            y='Süre ms'
+        )
+    else:
+        st.info("Bu çalıştırmada bölüm kaydı yok.")
+
+if __name__ == "__main__":
+    main()
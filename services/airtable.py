@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from typing import Dict
+
+import streamlit as st
+from pyairtable import Api
+from requests.adapters import HTTPAdapter
+
+from services.metrics import describe_request, outcome_of, record_attempt, record_call, start_exporter
+from services.profiler import note_airtable_call
+from services.scheduler import base_key, get_scheduler, priority_for
+
+# Fallback base; override with AIRTABLE_BASE_ID or an [airtable] section in
+# .streamlit/secrets.toml. The API key has no default and must be supplied.
+DEFAULT_AIRTABLE_CONFIG = {
+    "base_id": "applJyRTlJLvUEDJs",
+}
+
+# Point the client at another server, e.g. the local stand-in in benchmarks/fake_airtable.py
+ENDPOINT_URL = os.getenv("AIRTABLE_ENDPOINT_URL", "https://api.airtable.com")
+# Connection pool size shared by every Streamlit session in this process
+POOL_MAXSIZE = int(os.getenv("AIRTABLE_POOL_MAXSIZE", "20"))
+# (connect, read) timeout in seconds
+REQUEST_TIMEOUT = (5, 30)
+
+
+def _read_secrets() -> Dict[str, str]:
+    """Read the [airtable] section from Streamlit secrets, if configured."""
+    try:
+        section = st.secrets.get("airtable", {})
+        return {k: section[k] for k in ("base_id", "api_key") if k in section}
+    except Exception:
+        # No secrets.toml available
+        return {}
+
+
+def get_airtable_config() -> Dict[str, str]:
+    """Resolve Airtable credentials: environment first, then secrets (then the default base id)."""
+    secrets = _read_secrets()
+    api_key = os.getenv("AIRTABLE_API_KEY") or secrets.get("api_key")
+    if not api_key:
+        raise RuntimeError(
+            "Airtable API anahtarı bulunamadı: AIRTABLE_API_KEY ortam değişkenini veya "
+            ".streamlit/secrets.toml içindeki [airtable] api_key değerini ayarlayın."
+        )
+    return {
+        "base_id": os.getenv("AIRTABLE_BASE_ID") or secrets.get("base_id") or DEFAULT_AIRTABLE_CONFIG["base_id"],
+        "api_key": api_key,
+    }
+
+
+class ScheduledApi(Api):
+    """Api whose every HTTP call goes through the per-base RequestScheduler."""
+
+    _local = threading.local()
+
+    def request(self, method, url, fallback=None, options=None, params=None, json=None):
+        call = lambda: super(ScheduledApi, self).request(
+            method, url, fallback=fallback, options=options, params=params, json=json
+        )
+        # Api.request re-enters itself when a long GET is converted to POST;
+        # that inner call must not queue for a second token
+        if getattr(self._local, "active", False):
+            return call()
+
+        table, operation = describe_request(method, str(url), json)
+
+        def scheduled():
+            self._local.active = True
+            started = time.perf_counter()
+            try:
+                result = call()
+            except Exception as e:
+                record_attempt(table, operation, outcome_of(e), time.perf_counter() - started)
+                raise
+            finally:
+                self._local.active = False
+            record_attempt(table, operation, "ok", time.perf_counter() - started)
+            return result
+
+        scheduler = get_scheduler(base_key(str(url)))
+        idempotent = method.upper() in ("GET", "PATCH", "PUT", "DELETE") or str(url).rstrip("/").endswith("listRecords")
+        started = time.perf_counter()
+        try:
+            result = scheduler.submit(scheduled, priority_for(method, str(url)), idempotent=idempotent)
+        except Exception as e:
+            record_call(table, operation, outcome_of(e), time.perf_counter() - started)
+            raise
+        finally:
+            note_airtable_call(time.perf_counter() - started)
+        record_call(table, operation, None, time.perf_counter() - started)
+        return result
+
+
+@st.cache_resource(show_spinner=False)
+def get_airtable_api() -> Api:
+    """
+    Process-wide Airtable API client.
+
+    Cached with st.cache_resource so every session and rerun shares one
+    requests.Session, keeping TLS connections alive between calls. Rate
+    limiting and retries are handled by services/scheduler.py; every call is
+    counted and timed in services/metrics.py.
+    """
+    config = get_airtable_config()
+    api = ScheduledApi(config["api_key"], timeout=REQUEST_TIMEOUT, retry_strategy=None, endpoint_url=ENDPOINT_URL)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=POOL_MAXSIZE,
+    )
+    api.session.mount("https://", adapter)
+    api.session.mount("http://", adapter)
+    start_exporter()
+    return api
+
+
+def get_airtable_table(table_name: str):
+    """Get Airtable table instance backed by the shared client"""
+    return get_airtable_api().table(get_airtable_config()["base_id"], table_name)
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import streamlit as st
+
+# Seconds a cached Airtable read stays fresh; override with AIRTABLE_CACHE_TTL
+DEFAULT_TTL = float(os.getenv("AIRTABLE_CACHE_TTL", "60"))
+# Entries kept per named cache; the oldest go first beyond this
+MAX_ENTRIES = int(os.getenv("AIRTABLE_CACHE_MAX_ENTRIES", "1024"))
+
+
+class TTLCache:
+    """
+    Thread-safe read-through cache with per-key single-flight loading.
+
+    Concurrent misses for the same key wait on one loader call instead of
+    each hitting Airtable. Invalidation bumps a generation counter so a load
+    that started before the write never repopulates the cache with stale rows.
+    Expired entries are swept on insert, and at most max_entries are kept, so
+    keys that are never asked for again (e.g. an old mirror version) do not
+    accumulate.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flights: Dict[Hashable, threading.Lock] = {}
+        self._generation = 0
+        self._next_sweep = 0.0
+
+    def _fresh(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert under self._lock, dropping expired entries at most once per TTL and the oldest over the cap."""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            for expired in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[expired]
+            self._next_sweep = now + self.ttl
+        # Re-inserted keys move to the end, so iteration order is oldest first
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, value)
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() once on a miss."""
+        with self._lock:
+            hit, value = self._fresh(key)
+            if hit:
+                return value
+            flight = self._flights.setdefault(key, threading.Lock())
+
+        with flight:
+            with self._lock:
+                hit, value = self._fresh(key)
+                if hit:
+                    return value
+                generation = self._generation
+            value = loader()
+            with self._lock:
+                if generation == self._generation:
+                    self._store(key, value)
+                self._flights.pop(key, None)
+            return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one key, or every key when key is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: tuple) -> None:
+        """Drop every tuple key that starts with prefix."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if isinstance(k, tuple) and k[:len(prefix)] == prefix]:
+                del self._entries[key]
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache(name: str) -> TTLCache:
+    """Named cache shared by all sessions in this process."""
+    return TTLCache()
+
+
+def invalidate_host_events(host_id) -> None:
+    """Forget every cached event window of a host after one of its events changes."""
+    get_cache("events").invalidate_prefix((str(host_id),))
+
+
+def invalidate_event_feature(event_id, feature_id) -> None:
+    """Forget a cached event_features lookup (and host feature matrices) after the feature is written."""
+    cache = get_cache("event_features")
+    cache.invalidate((str(event_id), int(feature_id)))
+    cache.invalidate_prefix(("matrix",))
+
+
+def invalidate_form(event_id) -> None:
+    """Forget an event's compiled form validator after the form is saved."""
+    get_cache("form_validators").invalidate(str(event_id))
@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.airtable import get_airtable_table
+from services.cache import invalidate_event_feature, invalidate_host_events
+from services.events import get_id_column_value, parse_event_datetime
+from services.forms import parse_rank, question_to_record, record_to_question
+from services.mirror import mirror_deleted, mirror_records, mirror_written
+from services.outbox import BATCH_SIZE, chunks
+
+# Writable events fields copied to the clone (the autonumber and series_id are not)
+EVENT_COPY_FIELDS = (
+    'name', 'description', 'type', 'host_id', 'location_name', 'detailed_address',
+    'start_date', 'end_date', 'capacity', 'is_visible'
+)
+FEATURE_COPY_FIELDS = ('feature_id', 'feature_key', 'enabled', 'is_active')
+
+
+def event_rows(table_name: str, event_id) -> List[Dict[str, Any]]:
+    """All rows of a child table for one event, from the mirror when it is populated"""
+    event_id_int = int(event_id)
+    records = mirror_records(table_name, event_id_int)
+    if records is None:
+        records = get_airtable_table(table_name).all(formula=f"{{event_id}} = {event_id_int}")
+    return records
+
+
+def clone_event(
+    record_id: str,
+    name: Optional[str] = None,
+    start: Optional[datetime] = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Copy an event with its event_features and registration_form rows.
+
+    The source event and its two child tables are read once each; the copy is
+    one create for the event and one batch_create per child table (10 rows
+    per request). With a new start, the end moves by the same amount. If any
+    write fails, the records already copied are deleted again.
+    Returns (new event record, features copied, questions copied).
+    """
+    events = get_airtable_table("events")
+    source = events.get(record_id)
+    source_fields = source.get('fields', {})
+    source_id = get_id_column_value(source_fields)
+    if source_id is None:
+        raise ValueError("Kaynak etkinliğin ID değeri alınamadı")
+
+    fields = {k: source_fields[k] for k in EVENT_COPY_FIELDS if k in source_fields}
+    if name:
+        fields['name'] = name
+    if start is not None:
+        old_start = parse_event_datetime(source_fields.get('start_date'))
+        old_end = parse_event_datetime(source_fields.get('end_date'))
+        new_start = parse_event_datetime(start)
+        fields['start_date'] = new_start.isoformat()
+        if old_start is not None and old_end is not None:
+            fields['end_date'] = (new_start + (old_end - old_start)).isoformat()
+
+    features = event_rows("event_features", source_id)
+    questions = event_rows("registration_form", source_id)
+
+    created = events.create(fields)
+    mirror_written("events", [created])
+    invalidate_host_events(fields.get('host_id'))
+    # Copied rows per table, deleted again if a later write fails
+    copied: Dict[str, List[str]] = {"event_features": [], "registration_form": []}
+    try:
+        new_id = get_id_column_value(created.get('fields', {}))
+        if new_id is None:
+            # Computed fields missing from the response: read back exactly this record
+            new_id = get_id_column_value(events.get(created['id']).get('fields', {}))
+        if new_id is None:
+            raise ValueError("Yeni etkinliğin ID değeri alınamadı")
+
+        feature_rows = [
+            {**{k: r['fields'][k] for k in FEATURE_COPY_FIELDS if k in r.get('fields', {})}, "event_id": new_id}
+            for r in features
+        ]
+        for batch in chunks(feature_rows, BATCH_SIZE):
+            written = get_airtable_table("event_features").batch_create(batch)
+            copied["event_features"].extend(r['id'] for r in written)
+            mirror_written("event_features", written)
+
+        question_rows = []
+        for r in sorted(questions, key=lambda r: parse_rank(r.get('fields', {}).get('rank', 0))):
+            row = question_to_record(record_to_question(r, r['id']), int(new_id))
+            # Omit empty possible_answers on create, as the form builder does
+            question_rows.append({k: v for k, v in row.items() if v is not None})
+        for batch in chunks(question_rows, BATCH_SIZE):
+            written = get_airtable_table("registration_form").batch_create(batch)
+            copied["registration_form"].extend(r['id'] for r in written)
+            mirror_written("registration_form", written)
+    except Exception:
+        rollback_clone(created, copied)
+        raise
+
+    for row in feature_rows:
+        if row.get('feature_id') is not None:
+            invalidate_event_feature(new_id, row['feature_id'])
+    return created, len(feature_rows), len(question_rows)
+
+
+def rollback_clone(created: Dict[str, Any], copied: Dict[str, List[str]]) -> None:
+    """Delete a half-finished copy: its child rows first, then the event"""
+    for table_name, record_ids in copied.items():
+        if record_ids:
+            get_airtable_table(table_name).batch_delete(record_ids)
+            mirror_deleted(table_name, record_ids)
+    get_airtable_table("events").delete(created['id'])
+    mirror_deleted("events", [created['id']])
+    invalidate_host_events(created.get('fields', {}).get('host_id'))
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+DRAFTS_PATH = os.getenv("HOST_APP_DRAFTS_PATH", ".data/drafts.sqlite3")
+# Seconds without further edits before a draft is written
+DRAFT_DEBOUNCE = float(os.getenv("HOST_APP_DRAFT_DEBOUNCE", "2"))
+# Drafts untouched for this long are dropped
+DRAFT_MAX_AGE = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS form_drafts (
+    host_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    questions TEXT NOT NULL,
+    question_counter INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (host_id, event_id)
+);
+"""
+
+DraftKey = Tuple[str, str]
+
+
+def draft_key(host_id: Any, event_id: Any) -> DraftKey:
+    return ("" if host_id is None else str(host_id), str(event_id))
+
+
+class DraftStore:
+    """
+    Local, debounced store for unsaved form builder state.
+
+    schedule() only keeps the latest snapshot in memory; a background thread
+    writes it once the form has been quiet for DRAFT_DEBOUNCE seconds, and
+    skips snapshots identical to what is already stored. Nothing here talks
+    to Airtable.
+    """
+
+    def __init__(self, path: str, debounce: float = DRAFT_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._pending: Dict[DraftKey, Tuple[float, List[Dict[str, Any]], int]] = {}
+        self._digests: Dict[DraftKey, str] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        with self._conn:
+            self._conn.execute("DELETE FROM form_drafts WHERE updated_at < ?", (time.time() - DRAFT_MAX_AGE,))
+
+    def schedule(self, key: DraftKey, questions: List[Dict[str, Any]], question_counter: int) -> None:
+        """Remember the latest state; it is written after DRAFT_DEBOUNCE quiet seconds."""
+        snapshot = json.loads(json.dumps(questions))
+        with self._lock:
+            self._pending[key] = (time.monotonic() + self.debounce, snapshot, question_counter)
+        self._wake.set()
+
+    def load(self, key: DraftKey) -> Optional[Dict[str, Any]]:
+        """Latest draft for the key (pending in memory or stored), or None."""
+        with self._lock:
+            if key in self._pending:
+                _, questions, counter = self._pending[key]
+                return {"questions": json.loads(json.dumps(questions)), "question_counter": counter}
+            row = self._conn.execute(
+                "SELECT questions, question_counter, updated_at FROM form_drafts WHERE host_id = ? AND event_id = ?",
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "questions": json.loads(row["questions"]),
+            "question_counter": row["question_counter"],
+            "updated_at": row["updated_at"],
+        }
+
+    def discard(self, key: DraftKey) -> None:
+        with self._lock, self._conn:
+            self._pending.pop(key, None)
+            self._digests.pop(key, None)
+            self._conn.execute("DELETE FROM form_drafts WHERE host_id = ? AND event_id = ?", key)
+
+    def flush(self, force: bool = False) -> int:
+        """Write pending drafts whose debounce has elapsed (all of them with force). Returns rows written."""
+        now = time.monotonic()
+        written = 0
+        with self._lock:
+            due = [(k, v) for k, v in self._pending.items() if force or v[0] <= now]
+            for key, _ in due:
+                del self._pending[key]
+            for key, (_, questions, counter) in due:
+                payload = json.dumps(questions, sort_keys=True)
+                digest = hashlib.sha1(payload.encode()).hexdigest()
+                if self._digests.get(key) == digest:
+                    continue
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO form_drafts "
+                        "(host_id, event_id, questions, question_counter, digest, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, payload, counter, digest, time.time()),
+                    )
+                self._digests[key] = digest
+                written += 1
+        return written
+
+    def _next_due(self) -> Optional[float]:
+        with self._lock:
+            if not self._pending:
+                return None
+            return max(0.0, min(due for due, _, _ in self._pending.values()) - time.monotonic())
+
+    def start_writer(self) -> None:
+        def writer():
+            while True:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Writing form drafts failed")
+                self._wake.wait(self._next_due())
+                self._wake.clear()
+
+        threading.Thread(target=writer, name="form-drafts", daemon=True).start()
+
+
+@st.cache_resource(show_spinner=False)
+def _create_draft_store(path: str) -> DraftStore:
+    store = DraftStore(path)
+    store.start_writer()
+    return store
+
+
+def get_draft_store() -> DraftStore:
+    """Process-wide draft store with its debounced writer running."""
+    return _create_draft_store(DRAFTS_PATH)
@@ -0,0 +1,220 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Options of the event type selectbox
+EVENT_TYPES = [
+    "Konferans, Zirve & Seminer",
+    "Kongre, Fuar & Sergi",
+    "Kurumsal & İş Etkinlikleri",
+    "Atölye, Eğitim & Networking",
+    "Teknoloji Etkinlikleri & Hackathon",
+    "Festival, Panayır & Kutlama",
+    "Konser, Müzik & Sahne Sanatları",
+    "Spor, Espor & Yarışmalar",
+    "Sağlık, Wellness & Hayır Etkinlikleri",
+    "Yiyecek, İçecek & Gastronomi",
+    "Gece Hayatı & Parti",
+    "Seyahat, Tur & Gezi",
+    "Aile, Çocuk & Topluluk Etkinlikleri",
+    "Sanal & Hibrit Etkinlikler",
+]
+
+
+def parse_event_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse an Airtable date/time value into an aware UTC datetime.
+
+    Airtable returns ISO strings ending in 'Z'; naive values (e.g. a datetime
+    from the creation form) are treated as UTC, matching how they are stored.
+    Returns None for empty or unparseable values.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def get_id_column_value(fields: Dict[str, Any]) -> Any:
+    """Return the ID column value (autonumber) from a record's fields, if present"""
+    for key in ('ID', 'id', 'Id'):
+        if key in fields:
+            return fields[key]
+    return None
+
+
+def validate_event_data(event_data: Dict[str, Any]) -> List[str]:
+    """Validate event data"""
+    errors = []
+
+    if not event_data.get('name'):
+        errors.append("Etkinlik adı zorunludur")
+
+    if not event_data.get('description'):
+        errors.append("Etkinlik açıklaması zorunludur")
+
+    if not event_data.get('type'):
+        errors.append("Etkinlik türü zorunludur")
+
+    if not event_data.get('location_name'):
+        errors.append("Mekan adı zorunludur")
+
+    if not event_data.get('detailed_address'):
+        errors.append("Detaylı adres zorunludur")
+
+    if not event_data.get('start_date'):
+        errors.append("Başlangıç tarihi zorunludur")
+
+    if not event_data.get('end_date'):
+        errors.append("Bitiş tarihi zorunludur")
+
+    if event_data.get('start_date') and event_data.get('end_date'):
+        # Compared as UTC so naive and aware values can be mixed
+        if parse_event_datetime(event_data['start_date']) >= parse_event_datetime(event_data['end_date']):
+            errors.append("Bitiş tarihi başlangıç tarihinden sonra olmalıdır")
+
+    if not event_data.get('capacity') or event_data['capacity'] <= 0:
+        errors.append("Beklenen Katılım Miktarı 0'dan büyük olmalıdır")
+
+    if 'is_visible' not in event_data:
+        errors.append("Uygulama içerisinde etkinliğinizin gözükmesini ister misiniz seçeneği zorunludur")
+
+    return errors
+
+
+def event_to_record(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Airtable fields for validated event data (dates as datetimes)"""
+    return {
+        "name": event_data['name'],
+        "description": event_data['description'],
+        "type": event_data['type'],
+        "host_id": event_data['host_id'],
+        "location_name": event_data['location_name'],
+        "detailed_address": event_data['detailed_address'],
+        "start_date": event_data['start_date'].isoformat(),
+        "end_date": event_data['end_date'].isoformat(),
+        "capacity": event_data['capacity'],
+        "is_visible": event_data['is_visible']
+    }
+
+
+@dataclass(frozen=True)
+class Event:
+    """An events row, built once at load time with its dates already parsed."""
+
+    __slots__ = (
+        'id', 'ID', 'name', 'description', 'type', 'host_id', 'location_name',
+        'detailed_address', 'start_date', 'end_date', 'start', 'end', 'capacity', 'is_visible'
+    )
+
+    id: str
+    ID: Any
+    name: str
+    description: str
+    type: str
+    host_id: Any
+    location_name: str
+    detailed_address: str
+    # Raw Airtable values, shown when the dates cannot be parsed
+    start_date: str
+    end_date: str
+    # Aware UTC datetimes, None if unparseable
+    start: Optional[datetime]
+    end: Optional[datetime]
+    capacity: int
+    is_visible: bool
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Event':
+        """Build an Event from an Airtable events record"""
+        fields = record.get('fields', {})
+        start_date = fields.get('start_date', '')
+        end_date = fields.get('end_date', '')
+        return cls(
+            id=record['id'],
+            ID=fields.get('id', ''),
+            name=fields.get('name', ''),
+            description=fields.get('description', ''),
+            type=fields.get('type', ''),
+            host_id=fields.get('host_id', ''),
+            location_name=fields.get('location_name', ''),
+            detailed_address=fields.get('detailed_address', ''),
+            start_date=start_date,
+            end_date=end_date,
+            start=parse_event_datetime(start_date),
+            end=parse_event_datetime(end_date),
+            capacity=fields.get('capacity', 0),
+            is_visible=fields.get('is_visible', False)
+        )
+
+    @property
+    def has_valid_dates(self) -> bool:
+        return self.start is not None and self.end is not None
+
+    def sort_key(self) -> datetime:
+        """Sort key on the parsed end date; unparseable dates sort as oldest."""
+        return self.end or datetime.min.replace(tzinfo=timezone.utc)
+
+    def format_start(self) -> str:
+        return self.start.strftime('%d/%m/%Y %H:%M') if self.start else str(self.start_date)
+
+    def format_end(self) -> str:
+        return self.end.strftime('%d/%m/%Y %H:%M') if self.end else str(self.end_date)
+
+
+class EventTimeIndex:
+    """
+    Events sorted by start and by end, answering time queries with bisect.
+
+    Built once per data version; "past" and "upcoming" are slices found in
+    O(log n), "current" only scans the smaller of the two candidate slices.
+    Events with unparseable or inverted dates are kept aside in `undated`.
+    """
+
+    def __init__(self, events):
+        dated = [e for e in events if e.has_valid_dates and e.start <= e.end]
+        self.undated = [e for e in events if not (e.has_valid_dates and e.start <= e.end)]
+        self._by_start = sorted(dated, key=lambda e: e.start)
+        self._by_end = sorted(dated, key=lambda e: e.end)
+        self._starts = [e.start for e in self._by_start]
+        self._ends = [e.end for e in self._by_end]
+
+    def __len__(self):
+        return len(self._by_start) + len(self.undated)
+
+    def past(self, now: datetime):
+        """Events that ended before now, latest end first"""
+        return self._by_end[:bisect_left(self._ends, now)][::-1]
+
+    def upcoming(self, now: datetime):
+        """Events starting after now, latest end first"""
+        return sorted(self._by_start[bisect_right(self._starts, now):], key=Event.sort_key, reverse=True)
+
+    def current(self, now: datetime):
+        """Events with start <= now <= end, latest end first"""
+        started = bisect_right(self._starts, now)
+        not_ended = bisect_left(self._ends, now)
+        if started <= len(self._ends) - not_ended:
+            matches = [e for e in self._by_start[:started] if e.end >= now]
+        else:
+            matches = [e for e in self._by_end[not_ended:] if e.start <= now]
+        return sorted(matches, key=Event.sort_key, reverse=True)
+
+    def overlapping(self, range_start: datetime, range_end: datetime):
+        """Events overlapping [range_start, range_end], ordered by start (e.g. for a calendar view)"""
+        return [e for e in self._by_start[:bisect_right(self._starts, range_end)] if e.end >= range_start]
+
+    def counts(self, now: datetime):
+        """(current, upcoming, past) counts without materializing the lists"""
+        past = bisect_left(self._ends, now)
+        upcoming = len(self._starts) - bisect_right(self._starts, now)
+        return len(self._starts) - past - upcoming, upcoming, past
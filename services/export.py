@@ -0,0 +1,228 @@
+"""
+Streaming export of a host's events, event_features and registration_form rows.
+
+Records are pulled page by page with table.iterate() and written to the
+output file as each page arrives, so memory stays at about one page (one
+Parquet row group) whatever the size of the account. Only the host's event
+ids are kept, to select the feature and form rows that belong to it.
+
+Headless use:
+
+    python -m services.export --host 1000 --format parquet --out exports/
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import tempfile
+import zipfile
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from services.airtable import get_airtable_table
+from services.events import get_id_column_value
+from services.loader import MAX_KEYS_PER_QUERY
+from services.metrics import set_page
+from services.scheduler import PRIORITY_BULK, request_priority
+
+EXPORT_TABLES = ("events", "event_features", "registration_form")
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP = 10_000
+
+# Column -> type used for CSV headers and the Parquet schema
+EXPORT_COLUMNS: Dict[str, Dict[str, str]] = {
+    "events": {
+        "record_id": "string", "created_time": "string", "id": "int", "name": "string",
+        "description": "string", "type": "string", "host_id": "int", "location_name": "string",
+        "detailed_address": "string", "start_date": "string", "end_date": "string",
+        "capacity": "int", "is_visible": "bool", "series_id": "string",
+    },
+    "event_features": {
+        "record_id": "string", "created_time": "string", "event_id": "int",
+        "feature_id": "int", "feature_key": "string", "enabled": "bool", "is_active": "bool",
+    },
+    "registration_form": {
+        "record_id": "string", "created_time": "string", "event_id": "int", "name": "string",
+        "type": "string", "is_required": "bool", "rank": "float", "possible_answers": "string",
+    },
+}
+
+
+def flatten_record(table_name: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """One export row: record id, creation time and the record's fields"""
+    fields = record.get('fields', {})
+    row = {"record_id": record.get('id'), "created_time": record.get('createdTime'), **fields}
+    if table_name == "events":
+        # The autonumber column is called ID in some bases
+        row["id"] = get_id_column_value(fields)
+    return row
+
+
+def iter_host_pages(host_id, table_name: str, event_ids: Optional[List[Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Pages of a host's rows: events by host_id, child tables by the host's event ids"""
+    table = get_airtable_table(table_name)
+    if table_name == "events":
+        formulas = [f"{{host_id}} = {int(host_id)}"]
+    else:
+        ids = sorted({str(i) for i in event_ids or [] if i is not None})
+        formulas = [
+            "OR(" + ", ".join(f"{{event_id}}='{i}'" for i in ids[start:start + MAX_KEYS_PER_QUERY]) + ")"
+            for start in range(0, len(ids), MAX_KEYS_PER_QUERY)
+        ]
+    for formula in formulas:
+        pages = table.iterate(formula=formula)
+        while True:
+            # Each page is one request; run it behind interactive reads
+            with request_priority(PRIORITY_BULK):
+                page = next(pages, None)
+            if page is None:
+                break
+            yield [flatten_record(table_name, record) for record in page]
+
+
+class CsvSink:
+    def __init__(self, path: str, columns: Dict[str, str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns), extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlSink:
+    """Every field of every record, one JSON object per line."""
+
+    def __init__(self, path: str, columns: Dict[str, str]):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._file.writelines(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+        if kind == "bool":
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class ParquetSink:
+    """Typed columns from EXPORT_COLUMNS, written in row groups of PARQUET_ROW_GROUP rows."""
+
+    def __init__(self, path: str, columns: Dict[str, str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet dışa aktarımı için pyarrow gerekli: pip install pyarrow")
+        types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(name, types[kind]) for name, kind in columns.items()])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._buffer: List[Dict[str, Any]] = []
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        data = {
+            name: [_coerce(row.get(name), kind) for row in self._buffer]
+            for name, kind in self._columns.items()
+        }
+        self._writer.write_table(self._pa.Table.from_pydict(data, schema=self._schema))
+        self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def export_host(
+    host_id,
+    directory: str,
+    fmt: str = "csv",
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, str]:
+    """
+    Write <table>.<ext> for each of EXPORT_TABLES into directory.
+    progress(table, rows_so_far) is called after every page. Returns {table: path}.
+    """
+    if fmt not in SINKS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    event_ids: List[Any] = []
+    for table_name in EXPORT_TABLES:
+        path = os.path.join(directory, f"{table_name}.{fmt}")
+        sink = SINKS[fmt](path, EXPORT_COLUMNS[table_name])
+        written = 0
+        try:
+            if table_name == "events" or event_ids:
+                for rows in iter_host_pages(host_id, table_name, event_ids):
+                    if table_name == "events":
+                        event_ids.extend(row["id"] for row in rows)
+                    sink.write(rows)
+                    written += len(rows)
+                    if progress:
+                        progress(table_name, written)
+        finally:
+            sink.close()
+        paths[table_name] = path
+    return paths
+
+
+def export_host_zip(host_id, fmt: str = "csv", progress: Optional[Callable[[str, int], None]] = None) -> bytes:
+    """Export into a temporary directory (removed afterwards) and return the files zipped in memory."""
+    buffer = io.BytesIO()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = export_host(host_id, directory, fmt, progress)
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for path in paths.values():
+                archive.write(path, arcname=os.path.basename(path))
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a host's events, event features and registration forms.")
+    parser.add_argument("--host", type=int, required=True, help="Host ID")
+    parser.add_argument("--format", choices=sorted(SINKS), default="csv")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    args = parser.parse_args()
+
+    set_page("export")
+    paths = export_host(
+        args.host,
+        os.path.join(args.out, str(args.host)),
+        args.format,
+        progress=lambda table, rows: print(f"\r{table}: {rows} rows", end="", flush=True)
+    )
+    print()
+    for path in paths.values():
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.airtable import get_airtable_table
+from services.cache import get_cache
+from services.loader import get_loader
+from services.mirror import mirror_records, mirror_version, normalize_key
+
+# Feature definitions
+FEATURES = {
+    "registration_form": {
+        "name": "Kayıt Formu",
+        "description": "Etkinliğiniz için özelleştirilebilir kayıt formu oluşturun. Katılımcıların bilgilerini toplayın ve yönetin.",
+        "category": "before_event",
+        # Explicit mapping to Airtable's feature_id for clarity
+        "feature_id": 1
+    }
+    # Future features can be added here:
+    # "live_polling": {
+    #     "name": "Canlı Anket",
+    #     "description": "Etkinlik sırasında katılımcılarla canlı anket yapın.",
+    #     "category": "during_event",
+    #     "feature_id": 2
+    # },
+    # "feedback_survey": {
+    #     "name": "Geri Bildirim Anketi",
+    #     "description": "Etkinlik sonrası katılımcılardan geri bildirim toplayın.",
+    #     "category": "after_event",
+    #     "feature_id": 3
+    # }
+}
+
+
+def feature_status(records: List[Dict[str, Any]], feature_key: str) -> Optional[bool]:
+    """
+    Status of one feature given an event's event_features records:
+    True/False from is_active (or legacy 'enabled'), None if no record exists.
+    """
+    feature = FEATURES[feature_key]
+    feature_id = normalize_key(feature.get("feature_id"))
+    for record in records:
+        fields = record.get('fields', {})
+        if feature_id is not None and normalize_key(fields.get('feature_id')) == feature_id:
+            return bool(fields.get('is_active', False))
+        if fields.get('feature_key') == feature_key:
+            return bool(fields.get('enabled', False))
+    return None
+
+
+def get_host_event_names(host_id) -> List[Tuple[Any, str]]:
+    """(ID, name) of every event of a host, newest end_date first, with minimal fields."""
+    def fetch():
+        records = mirror_records("events", host_id)
+        if records is None:
+            table = get_airtable_table("events")
+            records = table.all(
+                formula=f"{{host_id}} = {host_id}",
+                fields=['id', 'name', 'end_date'],
+                sort=['-end_date']
+            )
+        else:
+            records = sorted(records, key=lambda r: str(r['fields'].get('end_date', '')), reverse=True)
+        return [(r['fields'].get('id', ''), r['fields'].get('name', '')) for r in records]
+
+    # Lives in the events cache so invalidate_host_events() covers it
+    return get_cache("events").get_or_load((str(host_id), 'names', mirror_version()), fetch)
+
+
+def get_feature_matrix(host_id) -> Dict[Tuple[str, str], Optional[bool]]:
+    """
+    Status of every FEATURES entry for every event of a host, keyed by (event_id, feature_key).
+    All event_features rows are fetched in one batched OR(...) query and indexed in memory.
+    """
+    event_ids = [normalize_key(event_id) for event_id, _ in get_host_event_names(host_id)]
+    event_ids = [event_id for event_id in event_ids if event_id is not None]
+
+    def build():
+        records_by_event = get_loader("event_features", "event_id").load_many(event_ids)
+        return {
+            (event_id, feature_key): feature_status(records, feature_key)
+            for event_id, records in records_by_event.items()
+            for feature_key in FEATURES
+        }
+
+    return get_cache("event_features").get_or_load(("matrix", str(host_id), tuple(event_ids)), build)
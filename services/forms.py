@@ -0,0 +1,120 @@
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+# Data type options in Turkish
+DATA_TYPES = {
+    "Yazı": "text",
+    "Sayı": "number",
+    "Virgüllü sayı": "float",
+    "Tarih": "date",
+    "Saat ve tarih": "datetime",
+    "Doğru yanlış": "boolean",
+    "Çoktan seçmeli": "single_choice",
+    "Çoktan seçmeli çoklu cevap": "multiple_choice"
+}
+# Reverse map for loading existing rows
+DATA_TYPES_REVERSE = {v: k for k, v in DATA_TYPES.items()}
+
+CHOICE_TYPES = ['Çoktan seçmeli', 'Çoktan seçmeli çoklu cevap']
+
+# Ranks are fractional: a moved question takes the midpoint of its new
+# neighbours, so a move or delete changes at most one row. Airtable keeps
+# 8 decimals; once two neighbours are closer than MIN_RANK_GAP the whole
+# form is renumbered (rare, and written with the next save).
+RANK_DECIMALS = 8
+MIN_RANK_GAP = 1e-6
+
+
+def parse_possible_answers(raw: Any) -> List[str]:
+    """possible_answers is stored as a JSON string; tolerate lists and bad JSON."""
+    if isinstance(raw, list):
+        return raw
+    if isinstance(raw, str):
+        try:
+            parsed = json.loads(raw)
+            return parsed if isinstance(parsed, list) else []
+        except Exception:
+            return []
+    return []
+
+
+def parse_rank(value: Any, default: float = 0) -> float:
+    """Stored rank as a number; whole numbers stay ints so unchanged rows compare equal."""
+    try:
+        rank = float(value)
+    except (TypeError, ValueError):
+        rank = float(default)
+    return int(rank) if rank.is_integer() else rank
+
+
+def rank_between(before: Optional[float], after: Optional[float]) -> float:
+    """Rank for a question placed between two neighbours (None = start/end of the form)."""
+    if before is None and after is None:
+        return 0
+    if before is None:
+        return parse_rank(after - 1)
+    if after is None:
+        return parse_rank(before + 1)
+    return parse_rank(round((before + after) / 2, RANK_DECIMALS))
+
+
+def needs_rebalance(questions: List[Dict[str, Any]]) -> bool:
+    """True when neighbouring ranks (in list order) are out of order or too close to split."""
+    ranks = [q['rank'] for q in questions]
+    return any(after - before < MIN_RANK_GAP for before, after in zip(ranks, ranks[1:]))
+
+
+def rebalance_ranks(questions: List[Dict[str, Any]]) -> None:
+    """Renumber ranks 0..n-1 in list order."""
+    for i, q in enumerate(questions):
+        q['rank'] = i
+
+
+def record_to_question(record: Dict[str, Any], qid: str, default_rank: float = 0) -> Dict[str, Any]:
+    """Builder question dict for a registration_form record"""
+    f = record.get('fields', {})
+    return {
+        'id': qid,
+        'uid': uuid.uuid4().hex,
+        'record_id': record.get('id'),
+        'question': f.get('name', ''),
+        'type': DATA_TYPES_REVERSE.get(f.get('type', 'text'), 'Yazı'),
+        'is_required': bool(f.get('is_required', False)),
+        'options': parse_possible_answers(f.get('possible_answers')),
+        'rank': parse_rank(f.get('rank', default_rank), default_rank)
+    }
+
+
+def question_to_record(q: Dict[str, Any], event_id_int: int) -> Dict[str, Any]:
+    """Airtable fields for a builder question; possible_answers is cleared for non-choice types."""
+    return {
+        "event_id": event_id_int,
+        "name": q['question'],
+        "type": DATA_TYPES[q['type']],
+        "is_required": q['is_required'],
+        "rank": q['rank'],
+        "possible_answers": json.dumps(q['options']) if q['type'] in CHOICE_TYPES else None
+    }
+
+
+def diff_form(questions: List[Dict[str, Any]], saved: Dict[str, Optional[Dict[str, Any]]], event_id_int: int):
+    """
+    Compare builder questions with stored rows ({record_id: fields from question_to_record}).
+    Returns (to_create, to_update, to_delete): (question, fields) pairs without a stored
+    record, {id, fields} updates for changed rows, and record ids no longer in the builder.
+    """
+    to_create: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    to_update = []
+    kept = set()
+    for q in sorted(questions, key=lambda q: q['rank']):
+        fields = question_to_record(q, event_id_int)
+        record_id = q.get('record_id')
+        if record_id and record_id in saved:
+            kept.add(record_id)
+            if fields != saved[record_id]:
+                to_update.append({"id": record_id, "fields": fields})
+        else:
+            to_create.append((q, fields))
+    to_delete = [rid for rid in saved if rid not in kept]
+    return to_create, to_update, to_delete
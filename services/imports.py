@@ -0,0 +1,302 @@
+"""
+Bulk event import from CSV or JSON.
+
+Rows are parsed and checked with validate_event_data up front, so every bad
+row is reported before anything is written. Valid rows are sent as 10-record
+batch_create calls from a small worker pool at PRIORITY_BULK: the shared
+scheduler keeps the base under its rate limit, and interactive reads from
+other sessions still go first.
+
+Progress is checkpointed per file (keyed by host and file contents). Running
+the same file again only sends rows that have not been created yet.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from services.airtable import get_airtable_table
+from services.cache import invalidate_host_events
+from services.events import event_to_record, parse_event_datetime, validate_event_data
+from services.metrics import set_page
+from services.mirror import mirror_written
+from services.outbox import BATCH_SIZE, chunks
+from services.scheduler import PRIORITY_BULK, request_priority
+
+# Concurrent batch_create calls; the scheduler still caps requests per second
+IMPORT_WORKERS = int(os.getenv("AIRTABLE_IMPORT_WORKERS", "3"))
+IMPORT_CHECKPOINT_DIR = os.getenv("HOST_APP_IMPORT_DIR", ".data/imports")
+
+IMPORT_COLUMNS = (
+    'name', 'description', 'type', 'location_name', 'detailed_address',
+    'start_date', 'end_date', 'capacity', 'is_visible'
+)
+DATETIME_FORMATS = ('%d/%m/%Y %H:%M', '%d.%m.%Y %H:%M', '%d/%m/%Y', '%d.%m.%Y')
+TRUE_VALUES = {'evet', 'true', '1', 'yes', 'e'}
+FALSE_VALUES = {'hayır', 'hayir', 'false', '0', 'no', 'h'}
+BOOLEAN_VALUES = TRUE_VALUES | FALSE_VALUES
+
+# (row number in the file, event data ready for event_to_record)
+ImportRow = Tuple[int, Dict[str, Any]]
+
+
+def parse_import_file(filename: str, data: bytes) -> List[Dict[str, Any]]:
+    """Rows of an uploaded .json (list of objects, or {"events": [...]}) or .csv file"""
+    text = data.decode('utf-8-sig')
+    if filename.lower().endswith('.json'):
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            parsed = parsed.get('events')
+        if not isinstance(parsed, list):
+            raise ValueError("JSON dosyası bir etkinlik listesi içermelidir")
+        return [row if isinstance(row, dict) else {} for row in parsed]
+
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.DictReader(io.StringIO(text), dialect=dialect))
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    ISO dates, or the dd/mm/yyyy HH:MM format the dashboard shows, as aware
+    UTC datetimes (naive values are UTC, as in parse_event_datetime), so the
+    two forms can be mixed in one row.
+    """
+    if isinstance(value, datetime):
+        return parse_event_datetime(value)
+    text = str(value).strip()
+    try:
+        return parse_event_datetime(datetime.fromisoformat(text.replace('Z', '+00:00')))
+    except ValueError:
+        pass
+    for fmt in DATETIME_FORMATS:
+        try:
+            return parse_event_datetime(datetime.strptime(text, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def row_to_event_data(row: Dict[str, Any], host_id) -> Tuple[Dict[str, Any], List[str]]:
+    """Event data for one file row, and its errors (format errors first, then validate_event_data)"""
+    event_data: Dict[str, Any] = {'host_id': host_id}
+    errors = []
+    for column in ('name', 'description', 'type', 'location_name', 'detailed_address'):
+        value = row.get(column)
+        event_data[column] = str(value).strip() if value is not None else ''
+
+    for column, label in (('start_date', "Başlangıç tarihi"), ('end_date', "Bitiş tarihi")):
+        value = row.get(column)
+        if value in (None, ''):
+            continue
+        parsed = parse_datetime(value)
+        if parsed is None:
+            errors.append(f"{label} okunamadı: {value}")
+        else:
+            event_data[column] = parsed
+
+    capacity = row.get('capacity')
+    if capacity not in (None, ''):
+        try:
+            # Spreadsheets and pandas write whole numbers as 50.0
+            number = float(str(capacity).strip())
+        except ValueError:
+            number = None
+        if number is None or not number.is_integer():
+            errors.append(f"Beklenen Katılım Miktarı tam sayı olmalıdır: {capacity}")
+        else:
+            event_data['capacity'] = int(number)
+
+    visible = row.get('is_visible')
+    if visible in (None, ''):
+        # Same default as the creation form
+        event_data['is_visible'] = True
+    elif isinstance(visible, bool):
+        event_data['is_visible'] = visible
+    elif str(visible).strip().lower() in BOOLEAN_VALUES:
+        event_data['is_visible'] = str(visible).strip().lower() in TRUE_VALUES
+    else:
+        errors.append(f"Görünürlük Evet/Hayır olmalıdır: {visible}")
+
+    row_host = row.get('host_id')
+    if row_host not in (None, '') and str(row_host).strip() != str(host_id):
+        errors.append(f"Satır başka bir host'a ait: {row_host}")
+
+    if errors:
+        # Validation would repeat the unreadable fields as missing
+        return event_data, errors
+    return event_data, validate_event_data(event_data)
+
+
+@dataclass
+class ImportPlan:
+    valid: List[ImportRow] = field(default_factory=list)
+    errors: Dict[int, List[str]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.valid) + len(self.errors)
+
+
+def prepare_import(rows: List[Dict[str, Any]], host_id) -> ImportPlan:
+    """Validate every row; rows are numbered from 1 in file order"""
+    plan = ImportPlan()
+    for number, row in enumerate(rows, start=1):
+        event_data, errors = row_to_event_data(row, host_id)
+        if errors:
+            plan.errors[number] = errors
+        else:
+            plan.valid.append((number, event_data))
+    return plan
+
+
+class ImportCheckpoint:
+    """
+    Which rows of one import file have been created, saved as JSON after every batch.
+
+    Rows are marked pending before their batch is sent. If the process dies
+    while a batch is in flight, or the batch fails without a definite 4xx
+    rejection, resume() looks those rows up in Airtable before anything is
+    resent, so a retry does not create duplicates.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.created: Dict[str, str] = {}
+        self.pending: List[int] = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.created = state.get('created', {})
+            self.pending = state.get('pending', [])
+
+    @classmethod
+    def for_file(cls, host_id, data: bytes) -> 'ImportCheckpoint':
+        digest = hashlib.sha1(f"{host_id}:".encode() + data).hexdigest()[:16]
+        return cls(os.path.join(IMPORT_CHECKPOINT_DIR, f"{digest}.json"))
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'created': self.created, 'pending': self.pending}, f)
+        os.replace(tmp, self.path)
+
+    def mark_pending(self, numbers: List[int]) -> None:
+        with self._lock:
+            self.pending = sorted(set(self.pending) | set(numbers))
+            self._save()
+
+    def mark_done(self, numbers: List[int], record_ids: List[Optional[str]]) -> None:
+        """Clear numbers from pending; record ids are None for a batch that failed"""
+        with self._lock:
+            for number, record_id in zip(numbers, record_ids):
+                if record_id:
+                    self.created[str(number)] = record_id
+            finished = set(numbers)
+            self.pending = [n for n in self.pending if n not in finished]
+            self._save()
+
+    def remaining(self, rows: List[ImportRow]) -> List[ImportRow]:
+        return [(number, data) for number, data in rows if str(number) not in self.created]
+
+    def resume(self, rows: List[ImportRow], host_id) -> None:
+        """Settle rows left pending by an interrupted run by finding them in Airtable"""
+        if not self.pending:
+            return
+        waiting = set(self.pending)
+        pending = [(number, data) for number, data in rows if number in waiting]
+        found: Dict[int, str] = {}
+        if pending:
+            names = sorted({data['name'] for _, data in pending})
+            clauses = ", ".join("{name} = '" + name.replace("\\", "\\\\").replace("'", "\\'") + "'" for name in names)
+            records = get_airtable_table("events").all(formula=f"AND({{host_id}} = {host_id}, OR({clauses}))")
+            existing = {}
+            for record in records:
+                fields = record.get('fields', {})
+                existing[(fields.get('name'), parse_event_datetime(fields.get('start_date')))] = record['id']
+            for number, data in pending:
+                record_id = existing.get((data['name'], parse_event_datetime(data['start_date'])))
+                if record_id:
+                    found[number] = record_id
+        numbers = list(self.pending)
+        self.mark_done(numbers, [found.get(n) for n in numbers])
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+@dataclass
+class ImportResult:
+    created: List[Dict[str, Any]] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+def _write_batch(batch: List[ImportRow], checkpoint: ImportCheckpoint) -> List[Dict[str, Any]]:
+    numbers = [number for number, _ in batch]
+    # Runs on a pool thread: page label and priority are per thread
+    set_page("event_import")
+    checkpoint.mark_pending(numbers)
+    with request_priority(PRIORITY_BULK):
+        try:
+            created = get_airtable_table("events").batch_create([event_to_record(data) for _, data in batch])
+        except requests.exceptions.HTTPError as e:
+            # Only a 4xx rejection is known to create nothing. After a 5xx, a
+            # timeout or a dropped connection Airtable may have committed the
+            # batch, so the rows stay pending for resume() to look up.
+            if e.response is not None and 400 <= e.response.status_code < 500:
+                checkpoint.mark_done(numbers, [None] * len(numbers))
+            raise
+    checkpoint.mark_done(numbers, [record.get('id') for record in created])
+    return created
+
+
+def run_import(
+    rows: List[ImportRow],
+    host_id,
+    checkpoint: ImportCheckpoint,
+    workers: int = IMPORT_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> ImportResult:
+    """
+    Create rows not yet in the checkpoint, BATCH_SIZE per request and up to
+    `workers` requests at once. progress(done, total) is called on the
+    calling thread after each batch.
+    """
+    checkpoint.resume(rows, host_id)
+    remaining = checkpoint.remaining(rows)
+    result = ImportResult()
+    if not remaining:
+        return result
+
+    batches = list(chunks(remaining, BATCH_SIZE))
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="event-import") as pool:
+        futures = {pool.submit(_write_batch, batch, checkpoint): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                result.created.extend(future.result())
+            except Exception as e:
+                for number, _ in batch:
+                    result.errors[number] = str(e)
+            done += len(batch)
+            if progress:
+                progress(done, len(remaining))
+
+    if result.created:
+        mirror_written("events", result.created)
+        invalidate_host_events(host_id)
+    return result
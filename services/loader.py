@@ -0,0 +1,88 @@
+from typing import Any, Dict, Hashable, Iterable, List
+
+import streamlit as st
+
+from services.airtable import get_airtable_table
+from services.mirror import mirror_records, normalize_key
+
+# Keys per OR(...) query; pyairtable moves long GETs into a POST body, so this only bounds formula size
+MAX_KEYS_PER_QUERY = 200
+
+
+class RecordLoader:
+    """
+    Per-rerun batching loader for records of one table looked up by one field.
+
+    Keys registered with prime() are fetched together with the first load()
+    in a single OR(...) formula query, and every result is memoized for the
+    rest of the rerun, so repeated lookups of the same key cost nothing.
+    """
+
+    def __init__(self, table_name: str, key_field: str):
+        self.table_name = table_name
+        self.key_field = key_field
+        self._pending: set = set()
+        self._memo: Dict[Hashable, List[Dict[str, Any]]] = {}
+
+    def prime(self, keys: Iterable[Any]) -> None:
+        """Register keys to be fetched with the next load()."""
+        for key in keys:
+            key = normalize_key(key)
+            if key is not None and key not in self._memo:
+                self._pending.add(key)
+
+    def load(self, key: Any) -> List[Dict[str, Any]]:
+        """Records whose key_field equals key; fetches every pending key in the same query."""
+        key = normalize_key(key)
+        if key not in self._memo:
+            self._pending.add(key)
+            self._fetch_pending()
+        return self._memo.get(key, [])
+
+    def load_many(self, keys: Iterable[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        keys = [normalize_key(k) for k in keys]
+        self.prime(keys)
+        if self._pending:
+            self._fetch_pending()
+        return {k: self._memo.get(k, []) for k in keys}
+
+    def forget(self, key: Any) -> None:
+        """Drop a memoized key after writing to it."""
+        self._memo.pop(normalize_key(key), None)
+
+    def _fetch_pending(self) -> None:
+        keys = sorted(k for k in self._pending if k is not None)
+        self._pending.clear()
+        results = {k: [] for k in keys}
+
+        mirrored = {k: mirror_records(self.table_name, k) for k in keys}
+        remote = [k for k in keys if mirrored[k] is None]
+        for k in keys:
+            if mirrored[k] is not None:
+                results[k] = mirrored[k]
+
+        if remote:
+            table = get_airtable_table(self.table_name)
+            for start in range(0, len(remote), MAX_KEYS_PER_QUERY):
+                chunk = remote[start:start + MAX_KEYS_PER_QUERY]
+                # Quoted values match both text and numeric fields in Airtable
+                clauses = ", ".join(f"{{{self.key_field}}}='{k}'" for k in chunk)
+                for record in table.all(formula=f"OR({clauses})"):
+                    value = normalize_key(record.get('fields', {}).get(self.key_field))
+                    if value in results:
+                        results[value].append(record)
+
+        self._memo.update(results)
+
+
+def start_rerun() -> None:
+    """Discard the previous rerun's loaders; call at the top of a page's main()."""
+    st.session_state["_rerun_loaders"] = {}
+
+
+def get_loader(table_name: str, key_field: str) -> RecordLoader:
+    """Loader for (table_name, key_field) scoped to the current rerun."""
+    loaders = st.session_state.setdefault("_rerun_loaders", {})
+    if (table_name, key_field) not in loaders:
+        loaders[(table_name, key_field)] = RecordLoader(table_name, key_field)
+    return loaders[(table_name, key_field)]
@@ -0,0 +1,278 @@
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from services.scheduler import scheduler_stats
+
+logger = logging.getLogger(__name__)
+
+# Serve Prometheus text on http://127.0.0.1:<port>/metrics when set
+METRICS_PORT = os.getenv("AIRTABLE_METRICS_PORT")
+# Or rewrite this file every AIRTABLE_METRICS_FILE_INTERVAL seconds (node_exporter textfile style)
+METRICS_FILE = os.getenv("AIRTABLE_METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.getenv("AIRTABLE_METRICS_FILE_INTERVAL", "15"))
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "airtable_requests_total": ("counter", "HTTP attempts sent to Airtable, including retries."),
+    "airtable_request_duration_seconds": ("histogram", "Duration of a single HTTP attempt."),
+    "airtable_call_duration_seconds": ("histogram", "Duration of a table operation including queueing and retries."),
+    "airtable_call_errors_total": ("counter", "Table operations that failed after all retries."),
+}
+
+_page = contextvars.ContextVar("airtable_page", default="background")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def set_page(name: str) -> None:
+    """Tag Airtable calls made from this script run (or thread) with a page name."""
+    _page.set(name)
+
+
+@contextmanager
+def page_label(name: str):
+    token = _page.set(name)
+    try:
+        yield
+    finally:
+        _page.reset(token)
+
+
+def current_page() -> str:
+    return _page.get()
+
+
+def describe_request(method: str, url: str, json: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """(table, operation) for an Airtable REST call, e.g. ("events", "list")."""
+    parts = [unquote(p) for p in urlsplit(str(url)).path.strip("/").split("/")]
+    if len(parts) < 3 or parts[0] != "v0" or parts[1] == "meta":
+        return "meta", method.lower()
+    table, rest = parts[2], parts[3:]
+    method = method.upper()
+    if (method == "GET" and not rest) or rest == ["listRecords"]:
+        return table, "list"
+    if method == "GET":
+        return table, "get"
+    batch = json is not None and "records" in json
+    if method == "POST":
+        return table, "batch_create" if batch else "create"
+    if method in ("PATCH", "PUT"):
+        if rest:
+            return table, "update"
+        return table, "upsert" if (json or {}).get("performUpsert") else "batch_update"
+    if method == "DELETE":
+        return table, "delete" if rest else "batch_delete"
+    return table, method.lower()
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms keyed by (metric name, labels)."""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per (page, table, operation) for the debug panel."""
+        rows: Dict[Labels, Dict[str, Any]] = {}
+        with self._lock:
+            for (name, labels), hist in self._histograms.items():
+                if name != "airtable_call_duration_seconds":
+                    continue
+                p95 = hist.quantile(0.95)
+                names = dict(labels)
+                rows[labels] = {
+                    "page": names["page"],
+                    "table": names["table"],
+                    "operation": names["operation"],
+                    "calls": hist.count,
+                    "errors": 0,
+                    "attempts": 0,
+                    "avg_ms": round(hist.sum / hist.count * 1000, 1),
+                    "p95_ms": round(p95 * 1000) if p95 is not None else None,
+                }
+            for (name, labels), value in self._counters.items():
+                base = tuple((k, v) for k, v in labels if k in ("page", "table", "operation"))
+                if base not in rows:
+                    continue
+                if name == "airtable_call_errors_total":
+                    rows[base]["errors"] += int(value)
+                elif name == "airtable_requests_total":
+                    rows[base]["attempts"] += int(value)
+        return sorted(rows.values(), key=lambda r: (r["page"], r["table"], r["operation"]))
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            by_name: Dict[str, List[str]] = {}
+            for (name, labels), value in counters:
+                by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value:g}")
+            for (name, labels), hist in histograms:
+                samples = by_name.setdefault(name, [])
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    samples.append(f"{name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                samples.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {hist.count}")
+                samples.append(f"{name}_sum{_format_labels(labels)} {hist.sum:.6f}")
+                samples.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        for name, samples in by_name.items():
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples]
+
+        # Scheduler state as gauges/counters per base
+        stats = scheduler_stats()
+        for stat, kind in (("requests", "counter"), ("retries", "counter"), ("rate_limited", "counter"),
+                           ("failures", "counter"), ("queue_depth", "gauge"), ("max_queue_depth", "gauge"),
+                           ("wait_seconds", "counter")):
+            name = f"airtable_scheduler_{stat}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {name} RequestScheduler {stat} per base.", f"# TYPE {name} {kind}"]
+            for base, values in sorted(stats.items()):
+                lines.append(f"{name}{_format_labels((('base', base),))} {values.get(stat, 0):g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def record_attempt(table: str, operation: str, outcome: str, seconds: float) -> None:
+    labels = {"page": current_page(), "table": table, "operation": operation}
+    REGISTRY.inc("airtable_requests_total", {**labels, "status": outcome})
+    REGISTRY.observe("airtable_request_duration_seconds", labels, seconds)
+
+
+def record_call(table: str, operation: str, error: Optional[str], seconds: float) -> None:
+    labels = {"page": current_page(), "table": table, "operation": operation}
+    REGISTRY.observe("airtable_call_duration_seconds", labels, seconds)
+    if error:
+        REGISTRY.inc("airtable_call_errors_total", {**labels, "error": error})
+
+
+def outcome_of(error: Optional[BaseException]) -> str:
+    """Label for an attempt: "ok", the HTTP status code, or the exception class."""
+    if error is None:
+        return "ok"
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        return str(response.status_code)
+    return type(error).__name__
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics_file(path: str) -> None:
+    """Write the Prometheus text atomically so scrapers never read half a file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(REGISTRY.render_prometheus())
+    os.replace(tmp, path)
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter() -> None:
+    """Start the /metrics endpoint and/or file writer configured by environment (once per process)."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    if METRICS_PORT:
+        server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), _MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="airtable-metrics-http", daemon=True).start()
+        logger.info("Airtable metrics on http://127.0.0.1:%s/metrics", METRICS_PORT)
+
+    if METRICS_FILE:
+        def writer():
+            while True:
+                try:
+                    write_metrics_file(METRICS_FILE)
+                except Exception:
+                    logger.exception("Writing %s failed", METRICS_FILE)
+                time.sleep(METRICS_FILE_INTERVAL)
+
+        threading.Thread(target=writer, name="airtable-metrics-file", daemon=True).start()
@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import streamlit as st
+
+from services.airtable import get_airtable_table
+from services.metrics import set_page
+from services.scheduler import PRIORITY_BULK, request_priority
+
+logger = logging.getLogger(__name__)
+
+# Set AIRTABLE_MIRROR_PATH to serve reads from a local SQLite copy of the base
+MIRROR_PATH = os.getenv("AIRTABLE_MIRROR_PATH")
+# Seconds between background delta syncs
+SYNC_INTERVAL = float(os.getenv("AIRTABLE_MIRROR_SYNC_INTERVAL", "30"))
+# Every Nth sync also lists record ids to drop rows deleted in Airtable
+RECONCILE_EVERY = int(os.getenv("AIRTABLE_MIRROR_RECONCILE_EVERY", "20"))
+# Overlap subtracted from the watermark to absorb clock skew with Airtable
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+# Mirrored tables and the field their rows are looked up by
+MIRRORED_TABLES = {
+    "events": "host_id",
+    "event_features": "event_id",
+    "registration_form": "event_id",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    table_name TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    lookup_key TEXT,
+    fields TEXT NOT NULL,
+    created_time TEXT,
+    PRIMARY KEY (table_name, record_id)
+);
+CREATE INDEX IF NOT EXISTS records_lookup ON records (table_name, lookup_key);
+CREATE TABLE IF NOT EXISTS watermarks (
+    table_name TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+def normalize_key(value: Any) -> Optional[str]:
+    """Lookup keys are stored as text; 1000, 1000.0 and '1000' all map to '1000'."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class AirtableMirror:
+    """
+    Local SQLite copy of the mirrored tables, kept fresh by delta syncs.
+
+    Each sync pulls only records whose LAST_MODIFIED_TIME() is after the
+    stored watermark. Deletions are not visible to a delta query, so every
+    RECONCILE_EVERY syncs the full id list is fetched and missing rows dropped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._syncs = 0
+        # Bumped on every local change so derived indexes know when to rebuild
+        self.version = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    # ---- reads ----
+    def records(self, table_name: str, key: Any) -> List[Dict[str, Any]]:
+        """Return records of table_name whose lookup field equals key, Airtable-shaped."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_id, fields, created_time FROM records WHERE table_name = ? AND lookup_key = ?",
+                (table_name, normalize_key(key)),
+            ).fetchall()
+        return [{"id": rid, "createdTime": created, "fields": json.loads(fields)} for rid, fields, created in rows]
+
+    def has_synced(self, table_name: str) -> bool:
+        return self._watermark(table_name) is not None
+
+    # ---- writes ----
+    def upsert(self, table_name: str, records: Iterable[Dict[str, Any]]) -> None:
+        """Store full Airtable records (as returned by all/create/update)."""
+        lookup_field = MIRRORED_TABLES[table_name]
+        rows = [
+            (
+                table_name,
+                r["id"],
+                normalize_key(r.get("fields", {}).get(lookup_field)),
+                json.dumps(r.get("fields", {})),
+                r.get("createdTime"),
+            )
+            for r in records
+        ]
+        with self._lock, self._conn:
+            self.version += 1
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (table_name, record_id, lookup_key, fields, created_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, table_name: str, record_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self.version += 1
+            self._conn.executemany(
+                "DELETE FROM records WHERE table_name = ? AND record_id = ?",
+                [(table_name, rid) for rid in record_ids],
+            )
+
+    # ---- sync ----
+    def _watermark(self, table_name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM watermarks WHERE table_name = ?", (table_name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, table_name: str, synced_at: datetime) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (table_name, synced_at) VALUES (?, ?)",
+                (table_name, synced_at.strftime("%Y-%m-%dT%H:%M:%S.000Z")),
+            )
+
+    def sync_table(self, table_name: str) -> int:
+        """Pull records modified since the watermark; full pull on first run. Returns rows pulled."""
+        table = get_airtable_table(table_name)
+        started = datetime.now(timezone.utc) - WATERMARK_OVERLAP
+        watermark = self._watermark(table_name)
+        pulled = 0
+        if watermark is None:
+            pages = table.iterate()
+        else:
+            pages = table.iterate(formula=f"IS_AFTER(LAST_MODIFIED_TIME(), '{watermark}')")
+        for page in pages:
+            self.upsert(table_name, page)
+            pulled += len(page)
+        self._set_watermark(table_name, started)
+        return pulled
+
+    def reconcile_table(self, table_name: str) -> int:
+        """Drop mirrored rows that no longer exist in Airtable. Returns rows removed."""
+        table = get_airtable_table(table_name)
+        remote_ids = set()
+        for page in table.iterate(fields=[MIRRORED_TABLES[table_name]]):
+            remote_ids.update(r["id"] for r in page)
+        with self._lock:
+            local_ids = {
+                rid for (rid,) in self._conn.execute(
+                    "SELECT record_id FROM records WHERE table_name = ?", (table_name,)
+                )
+            }
+        stale = local_ids - remote_ids
+        if stale:
+            self.delete(table_name, stale)
+        return len(stale)
+
+    def sync_all(self) -> None:
+        """Delta-sync every mirrored table, reconciling deletions periodically."""
+        with self._lock:
+            self._syncs += 1
+            reconcile = self._syncs % RECONCILE_EVERY == 0
+        # Background syncs yield to interactive requests in the scheduler
+        with request_priority(PRIORITY_BULK):
+            for table_name in MIRRORED_TABLES:
+                self.sync_table(table_name)
+                if reconcile:
+                    self.reconcile_table(table_name)
+
+    def request_sync(self) -> None:
+        """Ask the background worker to sync now instead of at the next interval."""
+        self._wake.set()
+
+    def start_background_sync(self, interval: float = SYNC_INTERVAL) -> None:
+        def worker():
+            set_page("mirror")
+            while True:
+                try:
+                    self.sync_all()
+                except Exception:
+                    logger.exception("Airtable mirror sync failed")
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        threading.Thread(target=worker, name="airtable-mirror-sync", daemon=True).start()
+
+
+@st.cache_resource(show_spinner=False)
+def _create_mirror(path: str) -> AirtableMirror:
+    mirror = AirtableMirror(path)
+    mirror.start_background_sync()
+    return mirror
+
+
+def get_mirror() -> Optional[AirtableMirror]:
+    """Process-wide mirror, or None when AIRTABLE_MIRROR_PATH is not set."""
+    if not MIRROR_PATH:
+        return None
+    return _create_mirror(MIRROR_PATH)
+
+
+def mirror_records(table_name: str, key: Any) -> Optional[List[Dict[str, Any]]]:
+    """Records for key from the mirror, or None if the mirror is disabled or not yet populated."""
+    mirror = get_mirror()
+    if mirror is None or not mirror.has_synced(table_name):
+        return None
+    return mirror.records(table_name, key)
+
+
+def mirror_version() -> Optional[int]:
+    """Current data version of the mirror, or None when it is disabled."""
+    mirror = get_mirror()
+    return mirror.version if mirror is not None else None
+
+
+def mirror_written(table_name: str, records: Iterable[Dict[str, Any]]) -> None:
+    """Apply records just created/updated through the API so reads see them immediately."""
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.upsert(table_name, [r for r in records if r])
+        mirror.request_sync()
+
+
+def mirror_deleted(table_name: str, record_ids: Iterable[str]) -> None:
+    """Remove records just deleted through the API."""
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.delete(table_name, record_ids)
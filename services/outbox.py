@@ -0,0 +1,326 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+from services.airtable import get_airtable_table
+from services.cache import invalidate_event_feature, invalidate_form
+from services.forms import diff_form, question_to_record, record_to_question
+from services.metrics import set_page
+from services.mirror import mirror_deleted, mirror_written
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PATH = os.getenv("AIRTABLE_OUTBOX_PATH", ".data/outbox.sqlite3")
+# Seconds between worker passes when nothing wakes it up
+FLUSH_INTERVAL = float(os.getenv("AIRTABLE_OUTBOX_FLUSH_INTERVAL", "2"))
+MAX_ATTEMPTS = int(os.getenv("AIRTABLE_OUTBOX_MAX_ATTEMPTS", "8"))
+MAX_RETRY_DELAY = 60.0
+# Records per Airtable batch call
+BATCH_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_key ON outbox (kind, key);
+CREATE TABLE IF NOT EXISTS created_records (
+    uid TEXT PRIMARY KEY,
+    record_id TEXT NOT NULL
+);
+"""
+
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_SUPERSEDED = "superseded"
+
+
+def chunks(items: List[Any], size: int = BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Outbox:
+    """
+    Durable write-behind queue for Airtable writes.
+
+    enqueue() only inserts a row into SQLite, so the Streamlit script thread
+    returns immediately. A background worker drains pending operations in
+    batches, retrying failures with exponential backoff until MAX_ATTEMPTS.
+    A newer operation for the same (kind, key) supersedes a pending older one,
+    so only the latest version of a form is ever written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        # Only one flush at a time, so an operation is never claimed twice or reordered
+        self._flush_lock = threading.Lock()
+        # Notified after every flush; settle() waits on it
+        self._flushed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # Operations interrupted by a restart are retried
+        with self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ? WHERE status = ?", (STATUS_PENDING, STATUS_IN_PROGRESS)
+            )
+        self._handlers: Dict[str, Callable[['Outbox', List[Dict[str, Any]]], None]] = {
+            "form_save": apply_form_saves,
+            "feature_active": apply_feature_updates,
+        }
+
+    # ---- producer side ----
+    def enqueue(self, kind: str, key: str, payload: Dict[str, Any]) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, updated_at = ? WHERE kind = ? AND key = ? AND status = ?",
+                (STATUS_SUPERSEDED, now, kind, key, STATUS_PENDING),
+            )
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (kind, key, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), now, now),
+            )
+        self._wake.set()
+        return cursor.lastrowid
+
+    def latest(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Most recent operation for (kind, key) with its decoded payload, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM outbox WHERE kind = ? AND key = ? AND status != ? ORDER BY id DESC LIMIT 1",
+                (kind, key, STATUS_SUPERSEDED),
+            ).fetchone()
+        if row is None:
+            return None
+        op = dict(row)
+        op["payload"] = json.loads(op["payload"])
+        return op
+
+    def retry(self, op_id: int) -> None:
+        """Put a failed operation back in the queue."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = 0 WHERE id = ? AND status = ?",
+                (STATUS_PENDING, op_id, STATUS_FAILED),
+            )
+        self._wake.set()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # ---- created record ids, so a retried or superseding save never creates twice ----
+    def settle(self, kind: str, keys: List[str], timeout: float = 30.0) -> bool:
+        """
+        Have the worker send the queued operations of kind for these keys now
+        and wait for them, before writing to the same rows directly. Failed
+        operations are superseded, as a retry would write an outdated snapshot
+        over the direct write. Returns False if some are still queued (e.g.
+        backing off after an error) or in flight after timeout.
+        """
+        keys = [str(key) for key in keys]
+        if not keys:
+            return True
+        marks = ", ".join("?" * len(keys))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE outbox SET status = ?, updated_at = ? WHERE kind = ? AND status = ? AND key IN ({marks})",
+                (STATUS_SUPERSEDED, now, kind, STATUS_FAILED, *keys),
+            )
+            self._conn.execute(
+                f"UPDATE outbox SET next_attempt_at = 0 WHERE kind = ? AND status = ? AND key IN ({marks})",
+                (kind, STATUS_PENDING, *keys),
+            )
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        with self._flushed:
+            while True:
+                rows = self._conn.execute(
+                    f"SELECT status, next_attempt_at FROM outbox WHERE kind = ? AND status IN (?, ?) AND key IN ({marks})",
+                    (kind, STATUS_PENDING, STATUS_IN_PROGRESS, *keys),
+                ).fetchall()
+                if not rows:
+                    return True
+                # Operations backing off after an error will not be sent in time
+                waiting = [row for row in rows if row[0] == STATUS_IN_PROGRESS or row[1] <= time.time()]
+                remaining = deadline - time.monotonic()
+                if not waiting or remaining <= 0:
+                    return False
+                self._flushed.wait(min(remaining, 1.0))
+
+    def remember_created(self, uid: str, record_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO created_records (uid, record_id) VALUES (?, ?)", (uid, record_id)
+            )
+
+    def created_record_id(self, uid: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT record_id FROM created_records WHERE uid = ?", (uid,)).fetchone()
+        return row[0] if row else None
+
+    # ---- consumer side ----
+    def _claim(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT * FROM outbox WHERE status = ? AND next_attempt_at <= ? ORDER BY id",
+                (STATUS_PENDING, now),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ?",
+                [(STATUS_IN_PROGRESS, now, row["id"]) for row in rows],
+            )
+        ops = []
+        for row in rows:
+            op = dict(row)
+            op["payload"] = json.loads(op["payload"])
+            ops.append(op)
+        return ops
+
+    def _finish(self, ops: List[Dict[str, Any]], error: Optional[Exception]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            for op in ops:
+                if error is None:
+                    self._conn.execute(
+                        "UPDATE outbox SET status = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                        (STATUS_DONE, now, op["id"]),
+                    )
+                    continue
+                attempts = op["attempts"] + 1
+                status = STATUS_FAILED if attempts >= MAX_ATTEMPTS else STATUS_PENDING
+                delay = min(MAX_RETRY_DELAY, 2 ** attempts)
+                self._conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (status, attempts, str(error), now + delay, now, op["id"]),
+                )
+
+    def flush(self) -> int:
+        """Apply every due operation, one handler call per kind. Returns operations processed."""
+        with self._flush_lock:
+            processed = self._flush()
+        with self._flushed:
+            self._flushed.notify_all()
+        return processed
+
+    def _flush(self) -> int:
+        ops = self._claim()
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for op in ops:
+            by_kind.setdefault(op["kind"], []).append(op)
+        for kind, kind_ops in by_kind.items():
+            try:
+                self._handlers[kind](self, kind_ops)
+            except Exception as e:
+                logger.warning("Outbox %s flush failed: %s", kind, e)
+                self._finish(kind_ops, e)
+            else:
+                self._finish(kind_ops, None)
+        return len(ops)
+
+    def start_worker(self, interval: float = FLUSH_INTERVAL) -> None:
+        def worker():
+            set_page("outbox")
+            while True:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Outbox worker pass failed")
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        threading.Thread(target=worker, name="airtable-outbox", daemon=True).start()
+
+
+def apply_form_saves(outbox: Outbox, ops: List[Dict[str, Any]]) -> None:
+    """Write each event's latest form as a diff against the rows currently in Airtable."""
+    for op in ops:
+        payload = op["payload"]
+        event_id_int = int(payload["event_id"])
+        questions = payload["questions"]
+        table = get_airtable_table("registration_form")
+
+        existing = table.all(formula=f"{{event_id}} = {event_id_int}")
+        saved = {r['id']: question_to_record(record_to_question(r, r['id']), event_id_int) for r in existing}
+        for q in questions:
+            if not q.get('record_id') and q.get('uid'):
+                q['record_id'] = outbox.created_record_id(q['uid'])
+
+        to_create, to_update, to_delete = diff_form(questions, saved, event_id_int)
+
+        if to_delete:
+            table.batch_delete(to_delete)
+            mirror_deleted("registration_form", to_delete)
+        if to_update:
+            mirror_written("registration_form", table.batch_update(to_update))
+        for chunk in chunks(to_create):
+            # Omit empty possible_answers on create
+            created = table.batch_create([{k: v for k, v in fields.items() if v is not None} for _, fields in chunk])
+            for (q, _), record in zip(chunk, created):
+                outbox.remember_created(q['uid'], record['id'])
+            mirror_written("registration_form", created)
+        invalidate_form(event_id_int)
+
+        # Keep event_features toggled ON for this event
+        ef_table = get_airtable_table("event_features")
+        records = ef_table.all(formula=f"AND({{event_id}} = {event_id_int}, {{feature_id}} = 1)")
+        if records and records[0]['fields'].get('is_active'):
+            continue
+        if records:
+            ef_record = ef_table.update(records[0]['id'], {"is_active": True})
+        else:
+            ef_record = ef_table.create({"event_id": event_id_int, "feature_id": 1, "is_active": True})
+        mirror_written("event_features", [ef_record])
+        invalidate_event_feature(event_id_int, 1)
+
+
+def apply_feature_updates(outbox: Outbox, ops: List[Dict[str, Any]]) -> None:
+    """Coalesce queued is_active toggles into batch_update calls (latest value per record wins)."""
+    latest = {}
+    for op in ops:
+        latest[op["payload"]["record_id"]] = op["payload"]
+    table = get_airtable_table("event_features")
+    updates = [{"id": rid, "fields": {"is_active": p["is_active"]}} for rid, p in latest.items()]
+    for chunk in chunks(updates):
+        mirror_written("event_features", table.batch_update(chunk))
+    for p in latest.values():
+        invalidate_event_feature(p["event_id"], p["feature_id"])
+
+
+@st.cache_resource(show_spinner=False)
+def _create_outbox(path: str) -> Outbox:
+    outbox = Outbox(path)
+    outbox.start_worker()
+    return outbox
+
+
+def get_outbox() -> Outbox:
+    """Process-wide outbox with its background worker running."""
+    return _create_outbox(OUTBOX_PATH)
@@ -0,0 +1,52 @@
+import threading
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+
+class RecordPager:
+    """
+    Lazily pulls pages from an iterator (e.g. table.iterate()) and keeps them.
+
+    Only the pages needed to show `count` items are fetched, so the first
+    page renders after a single request while later pages are pulled on
+    "load more". Pagers are shared between sessions through the TTL cache,
+    hence the lock around the underlying iterator.
+    """
+
+    def __init__(self, pages: Iterator[List[Any]], transform: Optional[Callable[[Any], Any]] = None):
+        self._pages = pages
+        self._transform = transform
+        self._lock = threading.Lock()
+        self.items: List[Any] = []
+        self.exhausted = False
+
+    def _fill(self, count: int) -> None:
+        with self._lock:
+            while len(self.items) < count and not self.exhausted:
+                try:
+                    page = next(self._pages)
+                except StopIteration:
+                    self.exhausted = True
+                    break
+                if self._transform is not None:
+                    page = [self._transform(item) for item in page]
+                self.items.extend(page)
+
+    def page(self, count: int) -> Tuple[List[Any], bool]:
+        """Return the first `count` items and whether more items exist."""
+        # One extra item tells us whether a "load more" button is needed
+        self._fill(count + 1)
+        return self.items[:count], len(self.items) > count
+
+    def prefetch(self, count: int) -> None:
+        """Pull pages ahead so the next "load more" is served from memory."""
+        self._fill(count + 1)
+
+    @property
+    def loaded(self) -> int:
+        return len(self.items)
+
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split an in-memory list into pages shaped like table.iterate() output."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -0,0 +1,198 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+# Opt in with HOST_APP_PROFILE=1, or per session with ?profile=1
+PROFILE_ENV = os.getenv("HOST_APP_PROFILE") == "1"
+TRACE_PATH = os.getenv("HOST_APP_TRACE_PATH", ".data/render_traces.jsonl")
+TRACE_MAX_BYTES = int(os.getenv("HOST_APP_TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_BACKUPS = 3
+
+_current = contextvars.ContextVar("render_trace", default=None)
+# Returned by span() when profiling is off, so a disabled span costs one ContextVar lookup
+_NOOP = nullcontext()
+
+_trace_logger: Optional[logging.Logger] = None
+_trace_logger_lock = threading.Lock()
+
+
+class RerunTrace:
+    """Timings, emitted elements and Airtable time for one script run, split into named spans."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.elements = 0
+        self.airtable_calls = 0
+        self.airtable_seconds = 0.0
+        self.spans: List[Dict[str, Any]] = []
+        self._depth = 0
+
+    def note_element(self) -> None:
+        self.elements += 1
+
+    def note_airtable_call(self, seconds: float) -> None:
+        self.airtable_calls += 1
+        self.airtable_seconds += seconds
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        elements, calls, airtable = self.elements, self.airtable_calls, self.airtable_seconds
+        entry = {"name": name, "depth": self._depth, "start_ms": round((started - self.started) * 1000, 2)}
+        # Appended on entry so spans stay in start order when nested
+        self.spans.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry.update({
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "elements": self.elements - elements,
+                "airtable_calls": self.airtable_calls - calls,
+                "airtable_ms": round((self.airtable_seconds - airtable) * 1000, 2),
+            })
+
+    def to_dict(self, outcome: str) -> Dict[str, Any]:
+        return {
+            "at": self.started_at.isoformat(),
+            "page": self.page,
+            "outcome": outcome,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "elements": self.elements,
+            "airtable_calls": self.airtable_calls,
+            "airtable_ms": round(self.airtable_seconds * 1000, 2),
+            "spans": self.spans,
+        }
+
+
+def profiling_enabled() -> bool:
+    """HOST_APP_PROFILE=1, or ?profile=1 (remembered for the session)."""
+    if PROFILE_ENV:
+        return True
+    try:
+        requested = st.query_params.get("profile") == "1"
+    except AttributeError:
+        # Streamlit < 1.30
+        requested = st.experimental_get_query_params().get("profile", [""])[0] == "1"
+    if requested:
+        st.session_state["_profile_reruns"] = True
+    return st.session_state.get("_profile_reruns", False)
+
+
+def span(name: str):
+    """Time a section of the current rerun: `with span("load events"): ...`"""
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return trace.span(name)
+
+
+def note_airtable_call(seconds: float) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.note_airtable_call(seconds)
+
+
+def _count_elements(trace: RerunTrace) -> Callable[[], None]:
+    """
+    Count delta messages (elements and widgets) sent by this script run.
+    Wraps the run context's private enqueue hook; returns a function that
+    undoes it. If the hook is not there, element counts stay at zero.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        original = ctx._enqueue
+    except Exception:
+        return lambda: None
+
+    def enqueue(msg):
+        if msg.WhichOneof("type") == "delta":
+            trace.note_element()
+        original(msg)
+
+    ctx._enqueue = enqueue
+
+    def restore():
+        ctx._enqueue = original
+    return restore
+
+
+def _get_trace_logger() -> logging.Logger:
+    global _trace_logger
+    with _trace_logger_lock:
+        if _trace_logger is None:
+            directory = os.path.dirname(TRACE_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(TRACE_PATH, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            trace_logger = logging.getLogger("host_app.render_traces")
+            trace_logger.setLevel(logging.INFO)
+            trace_logger.propagate = False
+            trace_logger.addHandler(handler)
+            _trace_logger = trace_logger
+        return _trace_logger
+
+
+def write_trace(trace: Dict[str, Any]) -> None:
+    _get_trace_logger().info(json.dumps(trace, ensure_ascii=False))
+
+
+def read_traces() -> List[Dict[str, Any]]:
+    """All traces in the current and rotated files, oldest first."""
+    paths = [f"{TRACE_PATH}.{i}" for i in range(TRACE_BACKUPS, 0, -1)] + [TRACE_PATH]
+    traces = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    traces.append(json.loads(line))
+                except ValueError:
+                    # Partially written last line
+                    continue
+    return traces
+
+
+def profiled_page(page: str):
+    """Decorator for a page's main(): records one trace per rerun when profiling is on."""
+    def decorate(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            if not profiling_enabled():
+                return main(*args, **kwargs)
+
+            trace = RerunTrace(page)
+            token = _current.set(trace)
+            restore = _count_elements(trace)
+            outcome = "ok"
+            try:
+                return main(*args, **kwargs)
+            except BaseException as e:
+                # st.rerun() / st.switch_page() end the run with an exception too
+                outcome = type(e).__name__
+                raise
+            finally:
+                restore()
+                _current.reset(token)
+                try:
+                    write_trace(trace.to_dict(outcome))
+                except OSError:
+                    pass
+        return wrapper
+    return decorate
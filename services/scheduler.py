@@ -0,0 +1,181 @@
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+import requests
+
+# Airtable allows 5 requests per second per base
+RATE_PER_SECOND = float(os.getenv("AIRTABLE_RATE_LIMIT", "5"))
+BURST = int(os.getenv("AIRTABLE_RATE_BURST", "5"))
+MAX_RETRIES = int(os.getenv("AIRTABLE_MAX_RETRIES", "5"))
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+# Airtable asks clients to wait 30 seconds after a 429
+RATE_LIMITED_PAUSE = float(os.getenv("AIRTABLE_RATE_LIMITED_PAUSE", "30"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_WRITE = 1
+PRIORITY_BULK = 2
+
+_priority_override = contextvars.ContextVar("airtable_priority", default=None)
+
+BASE_ID_RE = re.compile(r"/v0/(app[^/?]+)")
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Run Airtable calls in this block at the given priority (e.g. PRIORITY_BULK for imports)."""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def priority_for(method: str, url: str) -> int:
+    """Reads (including POST listRecords fallbacks) are interactive; other calls are writes."""
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    if method.upper() == "GET" or url.rstrip("/").endswith("listRecords"):
+        return PRIORITY_INTERACTIVE
+    return PRIORITY_WRITE
+
+
+def base_key(url: str) -> str:
+    match = BASE_ID_RE.search(url)
+    return match.group(1) if match else "meta"
+
+
+class RequestScheduler:
+    """
+    Token bucket for one Airtable base with a priority queue in front of it.
+
+    Waiting callers are served strictly by (priority, arrival), so an
+    interactive read queued behind a bulk import goes first. Transient
+    failures are retried with jittered exponential backoff; a 429 also
+    pauses the whole bucket for everyone.
+    """
+
+    def __init__(self, rate: float = RATE_PER_SECOND, burst: int = BURST, max_retries: int = MAX_RETRIES):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int) -> None:
+        """Block until this caller is first in line and a token is available."""
+        ticket = (priority, next(self._seq))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self.stats["queue_depth"] = len(self._queue)
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._queue))
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._queue[0] == ticket and now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    heapq.heappop(self._queue)
+                    self.stats["queue_depth"] = len(self._queue)
+                    self.stats["wait_seconds"] += now - started
+                    self._cond.notify_all()
+                    return
+                if now < self._paused_until:
+                    timeout = self._paused_until - now
+                else:
+                    timeout = max((1 - self._tokens) / self.rate, 0.001)
+                self._cond.wait(timeout)
+
+    def pause(self, seconds: float) -> None:
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempt)))
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self.stats[name] += 1
+
+    def submit(self, call: Callable[[], Any], priority: int, idempotent: bool = True) -> Any:
+        """
+        Run call() once a token is granted, retrying transient failures.
+
+        429 responses are always retried (Airtable did not process the call).
+        5xx responses and connection errors are only retried when idempotent,
+        so a create that may have gone through is never sent twice.
+        """
+        attempt = 0
+        while True:
+            self.acquire(priority)
+            self._count("requests")
+            try:
+                return call()
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                retryable = status == 429 or (idempotent and status in RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                if status == 429:
+                    self._count("rate_limited")
+                    self.pause(RATE_LIMITED_PAUSE)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+            self._count("retries")
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(key: str) -> RequestScheduler:
+    """Process-wide scheduler for one base."""
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = RequestScheduler()
+        return _schedulers[key]
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every scheduler's counters, keyed by base id."""
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    result = {}
+    for key, scheduler in schedulers.items():
+        with scheduler._cond:
+            result[key] = dict(scheduler.stats)
+    return result
@@ -0,0 +1,193 @@
+"""
+Recurring event series.
+
+A series is a set of ordinary events rows sharing a `series_id`. The
+occurrences are expanded locally with dateutil.rrule (minus any excluded
+dates) and created together: pyairtable's batch_create sends them 10 per
+request. If one of those requests fails, the occurrences already created
+are deleted again. Edits to shared details or cancellations apply to the whole
+series, or to one occurrence and everything after it, with batch_update and
+batch_delete.
+"""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, rrule
+
+from services.airtable import get_airtable_table
+from services.cache import invalidate_host_events
+from services.events import event_to_record, parse_event_datetime
+from services.mirror import mirror_deleted, mirror_written
+from services.outbox import BATCH_SIZE, chunks
+
+FREQUENCIES = {"Günlük": DAILY, "Haftalık": WEEKLY, "Aylık": MONTHLY}
+WEEKDAYS = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
+# Upper bound on occurrences per series (about four years of weekly events)
+MAX_OCCURRENCES = 200
+
+# Details that a series-level edit may change; dates stay per occurrence
+SERIES_FIELDS = ('name', 'description', 'type', 'location_name', 'detailed_address', 'capacity', 'is_visible')
+
+
+def expand_occurrences(
+    start: datetime,
+    end: datetime,
+    frequency: int,
+    interval: int = 1,
+    count: Optional[int] = None,
+    until: Optional[date] = None,
+    weekdays: Optional[List[int]] = None,
+    exclude: Iterable[date] = (),
+) -> List[Tuple[datetime, datetime]]:
+    """
+    (start, end) of every occurrence. The first is always `start`, even on a
+    weekday outside `weekdays`; each keeps the first event's duration. Monthly
+    series starting on the 29th-31st fall on the last day of shorter months.
+    Dates in `exclude` are skipped. Stops at `count` occurrences, the end of
+    `until`, or MAX_OCCURRENCES, whichever comes first.
+    """
+    limit = min(count, MAX_OCCURRENCES) if count else MAX_OCCURRENCES
+    options = {}
+    if frequency == MONTHLY and start.day > 28:
+        # The start day where the month has it, otherwise the month's last day
+        options = {'bymonthday': (start.day, -1), 'bysetpos': 1}
+    rule = rrule(
+        frequency,
+        dtstart=start,
+        interval=max(1, interval),
+        until=datetime.combine(until, datetime.max.time()) if until else None,
+        byweekday=weekdays or None,
+        **options,
+    )
+    candidates = [start]
+    for occurrence in rule:
+        if len(candidates) >= limit:
+            break
+        if occurrence != start:
+            candidates.append(occurrence)
+    excluded = set(exclude)
+    duration = end - start
+    return [(occurrence, occurrence + duration) for occurrence in candidates if occurrence.date() not in excluded]
+
+
+def create_series(event_data: Dict[str, Any], occurrences: List[Tuple[datetime, datetime]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Create every occurrence in batched requests; returns (series_id, created
+    records in date order). If a batch fails, the occurrences already created
+    are deleted again so a retry does not duplicate them.
+    """
+    series_id = uuid.uuid4().hex[:12]
+    records = []
+    for start, end in occurrences:
+        fields = event_to_record({**event_data, 'start_date': start, 'end_date': end})
+        fields['series_id'] = series_id
+        records.append(fields)
+    table = get_airtable_table("events")
+    created: List[Dict[str, Any]] = []
+    try:
+        for batch in chunks(records, BATCH_SIZE):
+            created.extend(table.batch_create(batch))
+    except Exception as e:
+        mirror_written("events", created)
+        try:
+            rollback_series(series_id, created)
+        except Exception:
+            raise RuntimeError(
+                f"Seri yarıda kaldı: {len(created)} etkinlik oluşturuldu ve geri alınamadı (series_id: {series_id}). "
+                f"İlk hata: {e}"
+            ) from e
+        raise
+    finally:
+        invalidate_host_events(event_data['host_id'])
+    mirror_written("events", created)
+    return series_id, created
+
+
+def rollback_series(series_id: str, created: List[Dict[str, Any]]) -> None:
+    """Delete the rows of a half-created series, including any from a batch whose response was lost"""
+    table = get_airtable_table("events")
+    found = table.all(formula=f"{{series_id}} = '{series_id}'", fields=['series_id'])
+    record_ids = sorted({r['id'] for r in created} | {r['id'] for r in found})
+    if record_ids:
+        table.batch_delete(record_ids)
+        mirror_deleted("events", record_ids)
+
+
+def load_host_series(host_id) -> Dict[str, List[Dict[str, Any]]]:
+    """{series_id: event records ordered by start} for every series of a host (one query)"""
+    records = get_airtable_table("events").all(formula=f"AND({{host_id}} = {int(host_id)}, {{series_id}} != '')")
+    series: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        series_id = record.get('fields', {}).get('series_id')
+        if series_id:
+            series.setdefault(series_id, []).append(record)
+    for members in series.values():
+        members.sort(key=lambda r: parse_event_datetime(r['fields'].get('start_date')) or datetime.min.replace(tzinfo=timezone.utc))
+    return series
+
+
+def select_occurrences(members: List[Dict[str, Any]], from_record_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """The whole series, or the given occurrence and every one starting after it"""
+    if from_record_id is None:
+        return members
+    ids = [r['id'] for r in members]
+    return members[ids.index(from_record_id):] if from_record_id in ids else []
+
+
+def stored_value(fields: Dict[str, Any], key: str) -> Any:
+    """A field as the form shows it: Airtable omits false checkboxes and empty text"""
+    value = fields.get(key)
+    if value is None:
+        if key == 'is_visible':
+            return False
+        if key != 'capacity':
+            return ''
+    return value
+
+
+def update_series(host_id, members: List[Dict[str, Any]], changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Apply shared-detail changes to these occurrences with batch_update; unchanged rows are skipped."""
+    changes = {k: v for k, v in changes.items() if k in SERIES_FIELDS}
+    updates = [
+        {"id": r['id'], "fields": changes}
+        for r in members
+        if any(stored_value(r['fields'], k) != v for k, v in changes.items())
+    ]
+    if not updates:
+        return []
+    updated = get_airtable_table("events").batch_update(updates)
+    mirror_written("events", updated)
+    invalidate_host_events(host_id)
+    return updated
+
+
+def shift_series(host_id, members: List[Dict[str, Any]], delta: timedelta) -> List[Dict[str, Any]]:
+    """Move these occurrences by delta (e.g. a new start time) with batch_update"""
+    updates = []
+    for r in members:
+        start = parse_event_datetime(r['fields'].get('start_date'))
+        end = parse_event_datetime(r['fields'].get('end_date'))
+        if start is None or end is None:
+            continue
+        updates.append({"id": r['id'], "fields": {
+            "start_date": (start + delta).isoformat(),
+            "end_date": (end + delta).isoformat(),
+        }})
+    if not updates:
+        return []
+    updated = get_airtable_table("events").batch_update(updates)
+    mirror_written("events", updated)
+    invalidate_host_events(host_id)
+    return updated
+
+
+def cancel_series(host_id, members: List[Dict[str, Any]]) -> int:
+    """Delete these occurrences with batch_delete; returns how many were removed"""
+    record_ids = [r['id'] for r in members]
+    if not record_ids:
+        return 0
+    get_airtable_table("events").batch_delete(record_ids)
+    mirror_deleted("events", record_ids)
+    invalidate_host_events(host_id)
+    return len(record_ids)
@@ -0,0 +1,198 @@
+"""
+Form templates: named question sets stored once in the form_templates table.
+
+Templates are parsed into immutable FormTemplate objects and kept per host
+in the shared TTL cache, so opening the picker costs nothing after the first
+load. Applying a template to many events first sends any form saves still
+queued for them, then reads their current rows in one batched query and
+creates every new question in 10-record batches. Replaced questions are
+deleted only after all the new ones exist.
+"""
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from services.airtable import get_airtable_table
+from services.cache import get_cache, invalidate_event_feature, invalidate_form
+from services.features import FEATURES
+from services.forms import (
+    CHOICE_TYPES, DATA_TYPES, DATA_TYPES_REVERSE, parse_possible_answers, parse_rank, question_to_record
+)
+from services.loader import RecordLoader
+from services.mirror import mirror_deleted, mirror_written, normalize_key
+from services.outbox import BATCH_SIZE, chunks, get_outbox
+from services.scheduler import PRIORITY_BULK, request_priority
+
+REGISTRATION_FEATURE_ID = FEATURES["registration_form"]["feature_id"]
+
+# (question, type label, is_required, options)
+TemplateQuestion = Tuple[str, str, bool, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class FormTemplate:
+    """A parsed form_templates row."""
+
+    id: str
+    name: str
+    questions: Tuple[TemplateQuestion, ...]
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'FormTemplate':
+        fields = record.get('fields', {})
+        try:
+            raw = json.loads(fields.get('questions') or "[]")
+        except ValueError:
+            raw = []
+        questions = []
+        for q in raw if isinstance(raw, list) else []:
+            if not isinstance(q, dict):
+                continue
+            type_label = DATA_TYPES_REVERSE.get(q.get('type'), 'Yazı')
+            options = tuple(parse_possible_answers(q.get('possible_answers'))) if type_label in CHOICE_TYPES else ()
+            questions.append((q.get('name', ''), type_label, bool(q.get('is_required', False)), options))
+        return cls(id=record['id'], name=fields.get('name', ''), questions=tuple(questions))
+
+    def builder_questions(self, first_counter: int, first_rank: float = 0) -> List[Dict[str, Any]]:
+        """Fresh (unsaved) form builder question dicts, ranked from first_rank"""
+        return [
+            {
+                'id': f"question_{first_counter + i}",
+                'uid': uuid.uuid4().hex,
+                'record_id': None,
+                'question': name,
+                'type': type_label,
+                'is_required': is_required,
+                'options': list(options),
+                'rank': first_rank + i
+            }
+            for i, (name, type_label, is_required, options) in enumerate(self.questions)
+        ]
+
+
+def questions_to_template_json(questions: List[Dict[str, Any]]) -> str:
+    """Stored form of builder questions: the registration_form fields minus event_id and rank"""
+    ordered = sorted(questions, key=lambda q: q['rank'])
+    return json.dumps([
+        {
+            "name": q['question'],
+            "type": DATA_TYPES[q['type']],
+            "is_required": q['is_required'],
+            "possible_answers": q['options'] if q['type'] in CHOICE_TYPES else None
+        }
+        for q in ordered
+    ], ensure_ascii=False)
+
+
+def get_templates(host_id) -> List[FormTemplate]:
+    """A host's templates, parsed once and shared through the TTL cache"""
+    def fetch():
+        records = get_airtable_table("form_templates").all(formula=f"{{host_id}} = {int(host_id)}", sort=['name'])
+        return [FormTemplate.from_record(r) for r in records]
+
+    return get_cache("form_templates").get_or_load(str(host_id), fetch)
+
+
+def save_template(host_id, name: str, questions: List[Dict[str, Any]]) -> FormTemplate:
+    record = get_airtable_table("form_templates").create({
+        "name": name,
+        "host_id": int(host_id),
+        "questions": questions_to_template_json(questions)
+    })
+    get_cache("form_templates").invalidate(str(host_id))
+    return FormTemplate.from_record(record)
+
+
+def delete_template(host_id, template_id: str) -> None:
+    get_airtable_table("form_templates").delete(template_id)
+    get_cache("form_templates").invalidate(str(host_id))
+
+
+def apply_template(template: FormTemplate, event_ids: List[Any], replace: bool = False) -> Dict[str, int]:
+    """
+    Add the template's questions to every event's registration form (after
+    the existing questions, or instead of them with replace=True) and turn
+    the registration form feature on. Returns counts of rows written.
+    """
+    keys = [normalize_key(e) for e in event_ids if normalize_key(e) is not None]
+    # A form save still queued for one of these events would diff its older
+    # snapshot against Airtable afterwards and delete the template's rows
+    if not get_outbox().settle("form_save", keys):
+        raise RuntimeError("Seçili etkinliklerin bekleyen form kayıtları henüz gönderilemedi, lütfen biraz sonra tekrar deneyin.")
+    forms = get_airtable_table("registration_form")
+    with request_priority(PRIORITY_BULK):
+        existing = RecordLoader("registration_form", "event_id").load_many(keys)
+
+        to_delete = []
+        rows = []
+        for key in keys:
+            current = existing.get(key, [])
+            if replace:
+                to_delete.extend(r['id'] for r in current)
+                first_rank = 0
+            else:
+                ranks = [parse_rank(r.get('fields', {}).get('rank', 0)) for r in current]
+                first_rank = int(max(ranks)) + 1 if ranks else 0
+            for i, (name, type_label, is_required, options) in enumerate(template.questions):
+                fields = question_to_record({
+                    'question': name,
+                    'type': type_label,
+                    'is_required': is_required,
+                    'options': list(options),
+                    'rank': first_rank + i
+                }, int(key))
+                # Omit empty possible_answers on create, as the form builder does
+                rows.append({k: v for k, v in fields.items() if v is not None})
+
+        created = create_questions(rows)
+        # Old questions go only once every new one exists, so a failure never leaves an event without a form
+        if to_delete:
+            forms.batch_delete(to_delete)
+            mirror_deleted("registration_form", to_delete)
+        activated = enable_registration_form(keys)
+
+    for key in keys:
+        invalidate_form(key)
+    return {"events": len(keys), "created": len(created), "deleted": len(to_delete), "activated": activated}
+
+
+def create_questions(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """batch_create registration_form rows; if a batch fails, the rows already created are deleted again"""
+    forms = get_airtable_table("registration_form")
+    created: List[Dict[str, Any]] = []
+    try:
+        for batch in chunks(rows, BATCH_SIZE):
+            created.extend(forms.batch_create(batch))
+    except Exception:
+        if created:
+            record_ids = [r['id'] for r in created]
+            forms.batch_delete(record_ids)
+            mirror_deleted("registration_form", record_ids)
+        raise
+    mirror_written("registration_form", created)
+    return created
+
+
+def enable_registration_form(keys: List[str]) -> int:
+    """Turn the registration form feature on for these events in batched writes; returns rows written"""
+    table = get_airtable_table("event_features")
+    existing = RecordLoader("event_features", "event_id").load_many(keys)
+    updates = []
+    creates = []
+    for key in keys:
+        record = next(
+            (r for r in existing.get(key, []) if normalize_key(r['fields'].get('feature_id')) == normalize_key(REGISTRATION_FEATURE_ID)),
+            None
+        )
+        if record is None:
+            creates.append({"event_id": int(key), "feature_id": REGISTRATION_FEATURE_ID, "is_active": True})
+        elif not record['fields'].get('is_active'):
+            updates.append({"id": record['id'], "fields": {"is_active": True}})
+    if updates:
+        mirror_written("event_features", table.batch_update(updates))
+    if creates:
+        mirror_written("event_features", table.batch_create(creates))
+    for key in keys:
+        invalidate_event_feature(key, REGISTRATION_FEATURE_ID)
+    return len(updates) + len(creates)
@@ -0,0 +1,235 @@
+"""
+Validate registrant answers against an event's registration form.
+
+A form's registration_form rows are compiled once into a FormValidator: one
+precomputed check per question and a frozenset per choice question. Compiled
+validators are cached by form version (the question definitions themselves),
+so an edited form gets a new validator and an unchanged one is never rebuilt.
+"""
+import hashlib
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from services.airtable import get_airtable_table
+from services.cache import get_cache
+from services.forms import parse_possible_answers, parse_rank
+from services.mirror import mirror_records
+
+TRUE_VALUES = frozenset(("evet", "true", "1", "yes"))
+FALSE_VALUES = frozenset(("hayır", "hayir", "false", "0", "no"))
+BOOLEAN_VALUES = TRUE_VALUES | FALSE_VALUES
+
+# (name, type code, is_required, options) per question, in rank order
+FormSpec = Tuple[Tuple[str, str, bool, Tuple[str, ...]], ...]
+# A check returns an error message, or None when the value is valid
+Check = Callable[[Any], Optional[str]]
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return not value
+    return False
+
+
+def _check_text(value: Any) -> Optional[str]:
+    return None if isinstance(value, str) else "metin olmalıdır"
+
+
+def _check_number(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "tam sayı olmalıdır"
+    if isinstance(value, int):
+        return None
+    if isinstance(value, float):
+        return None if value.is_integer() else "tam sayı olmalıdır"
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in "+-":
+            text = text[1:]
+        return None if text.isdigit() else "tam sayı olmalıdır"
+    return "tam sayı olmalıdır"
+
+
+def _check_float(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "sayı olmalıdır"
+    if isinstance(value, (int, float)):
+        return None
+    if isinstance(value, str):
+        try:
+            # Turkish forms write decimals with a comma
+            float(value.replace(",", "."))
+            return None
+        except ValueError:
+            pass
+    return "sayı olmalıdır"
+
+
+def _check_date(value: Any) -> Optional[str]:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return None
+    if isinstance(value, str):
+        try:
+            date.fromisoformat(value.strip())
+            return None
+        except ValueError:
+            pass
+    return "tarih olmalıdır (YYYY-AA-GG)"
+
+
+def _check_datetime(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return None
+    if isinstance(value, str):
+        try:
+            datetime.fromisoformat(value.strip())
+            return None
+        except ValueError:
+            pass
+    return "tarih ve saat olmalıdır (YYYY-AA-GG SS:DD)"
+
+
+def _check_boolean(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str) and value.strip().lower() in BOOLEAN_VALUES:
+        return None
+    return "Evet veya Hayır olmalıdır"
+
+
+def _single_choice(options: frozenset) -> Check:
+    def check(value: Any) -> Optional[str]:
+        return None if isinstance(value, str) and value in options else "geçerli bir seçenek olmalıdır"
+    return check
+
+
+def _multiple_choice(options: frozenset) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, str):
+            return None if value in options else "geçerli seçenekler olmalıdır"
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return "seçenek listesi olmalıdır"
+        for item in value:
+            # Non-string items (nested lists, dicts) are not hashable options
+            if not isinstance(item, str) or item not in options:
+                return f"geçersiz seçenek: {item}"
+        return None
+    return check
+
+
+SIMPLE_CHECKS: Dict[str, Check] = {
+    "text": _check_text,
+    "number": _check_number,
+    "float": _check_float,
+    "date": _check_date,
+    "datetime": _check_datetime,
+    "boolean": _check_boolean,
+}
+
+
+class FormValidator:
+    """
+    Compiled checks for one version of a registration form.
+
+    Submissions are dicts keyed by question name. validate() returns a list
+    of error messages (empty when the submission is valid), like
+    validate_event_data() does for events.
+    """
+
+    __slots__ = ("version", "questions", "_rules", "_known")
+
+    def __init__(self, spec: FormSpec):
+        self.version = hashlib.sha1(repr(spec).encode()).hexdigest()
+        self.questions = tuple(name for name, _, _, _ in spec)
+        rules = []
+        for name, type_code, is_required, options in spec:
+            if type_code == "single_choice":
+                check = _single_choice(frozenset(options))
+            elif type_code == "multiple_choice":
+                check = _multiple_choice(frozenset(options))
+            else:
+                check = SIMPLE_CHECKS.get(type_code, _check_text)
+            rules.append((name, is_required, check))
+        self._rules: Tuple[Tuple[str, bool, Check], ...] = tuple(rules)
+        self._known = frozenset(self.questions)
+
+    def validate(self, answers: Mapping[str, Any]) -> List[str]:
+        errors = []
+        for name, is_required, check in self._rules:
+            value = answers.get(name)
+            if _is_empty(value):
+                if is_required:
+                    errors.append(f"{name} zorunludur")
+                continue
+            message = check(value)
+            if message is not None:
+                errors.append(f"{name}: {message}")
+        if not self._known.issuperset(answers):
+            for name in answers:
+                if name not in self._known:
+                    errors.append(f"Bilinmeyen soru: {name}")
+        return errors
+
+    def is_valid(self, answers: Mapping[str, Any]) -> bool:
+        return not self.validate(answers)
+
+    def validate_many(self, submissions: Iterable[Mapping[str, Any]]) -> Dict[int, List[str]]:
+        """Errors of the invalid submissions only, by position in the batch."""
+        validate = self.validate
+        failed = {}
+        for index, answers in enumerate(submissions):
+            errors = validate(answers)
+            if errors:
+                failed[index] = errors
+        return failed
+
+
+def form_spec(records: Iterable[Dict[str, Any]]) -> FormSpec:
+    """Hashable question definitions of registration_form records, in rank order."""
+    rows = sorted(records, key=lambda r: parse_rank(r.get('fields', {}).get('rank', 0)))
+    spec = []
+    for record in rows:
+        f = record.get('fields', {})
+        type_code = f.get('type', 'text')
+        options = tuple(parse_possible_answers(f.get('possible_answers'))) if type_code.endswith("_choice") else ()
+        spec.append((f.get('name', ''), type_code, bool(f.get('is_required', False)), options))
+    return tuple(spec)
+
+
+@lru_cache(maxsize=256)
+def _compile(spec: FormSpec) -> FormValidator:
+    return FormValidator(spec)
+
+
+def compile_form(records: Iterable[Dict[str, Any]]) -> FormValidator:
+    """Validator for these rows; identical question definitions share one compiled validator."""
+    return _compile(form_spec(records))
+
+
+def load_form_records(event_id) -> List[Dict[str, Any]]:
+    event_id_int = int(event_id)
+    records = mirror_records("registration_form", event_id_int)
+    if records is None:
+        records = get_airtable_table("registration_form").all(formula=f"{{event_id}} = {event_id_int}")
+    return records
+
+
+def get_form_validator(event_id) -> FormValidator:
+    """
+    Validator for an event's current form, kept in the shared TTL cache so a
+    burst of submissions costs one Airtable read and one compile.
+    """
+    return get_cache("form_validators").get_or_load(str(event_id), lambda: compile_form(load_form_records(event_id)))
+
+
+def validate_submission(event_id, answers: Mapping[str, Any]) -> List[str]:
+    return get_form_validator(event_id).validate(answers)
+
+
+def validate_submissions(event_id, submissions: Iterable[Mapping[str, Any]]) -> Dict[int, List[str]]:
+    return get_form_validator(event_id).validate_many(submissions)
@@ -0,0 +1,34 @@
+from datetime import date, datetime, timedelta
+
+from dateutil.rrule import MONTHLY, WEEKLY
+
+from services.series import expand_occurrences
+
+
+def starts(occurrences):
+    return [start.date() for start, _ in occurrences]
+
+
+def test_weekly_on_other_weekday_keeps_the_first_date():
+    start = datetime(2026, 1, 5, 10)  # Monday
+    occurrences = expand_occurrences(start, start + timedelta(hours=2), WEEKLY, count=3, weekdays=[2])
+    assert starts(occurrences) == [date(2026, 1, 5), date(2026, 1, 7), date(2026, 1, 14)]
+    assert occurrences[0] == (start, start + timedelta(hours=2))
+
+
+def test_monthly_from_the_31st_uses_the_last_day_of_short_months():
+    start = datetime(2026, 1, 31, 18)
+    occurrences = expand_occurrences(start, start + timedelta(hours=1), MONTHLY, count=4)
+    assert starts(occurrences) == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
+
+
+def test_monthly_from_the_30th_keeps_the_30th_in_long_months():
+    start = datetime(2026, 1, 30, 18)
+    occurrences = expand_occurrences(start, start + timedelta(hours=1), MONTHLY, count=3)
+    assert starts(occurrences) == [date(2026, 1, 30), date(2026, 2, 28), date(2026, 3, 30)]
+
+
+def test_excluded_dates_are_skipped():
+    start = datetime(2026, 1, 5, 10)
+    occurrences = expand_occurrences(start, start + timedelta(hours=2), WEEKLY, count=3, exclude=[date(2026, 1, 12)])
+    assert starts(occurrences) == [date(2026, 1, 5), date(2026, 1, 19)]
@@ -0,0 +1,21 @@
+from services.validation import FormValidator
+
+SPEC = (
+    ("Ad", "text", True, ()),
+    ("Yaş", "number", False, ()),
+    ("Renk", "multiple_choice", False, ("a", "b")),
+)
+
+
+def test_multiple_choice_accepts_known_options():
+    assert FormValidator(SPEC).validate({"Ad": "x", "Renk": ["a", "b"]}) == []
+
+
+def test_multiple_choice_rejects_nested_list_item():
+    errors = FormValidator(SPEC).validate({"Ad": "x", "Yaş": 3.0, "Renk": [["a"]]})
+    assert errors == ["Renk: geçersiz seçenek: ['a']"]
+
+
+def test_multiple_choice_rejects_dict_item():
+    errors = FormValidator(SPEC).validate({"Ad": "x", "Renk": [{"a": 1}]})
+    assert errors == ["Renk: geçersiz seçenek: {'a': 1}"]